@@ -0,0 +1,134 @@
+import heapq
+import threading
+from array import array
+from collections import Counter
+from lib.db.connection import get_connection
+
+# Rows fetched per round trip while loading the snapshot.
+LOAD_CHUNK_SIZE = 50_000
+
+
+class AnalyticsSnapshot:
+    """Columnar in-memory copy of articles for whole-dataset reporting.
+
+    articles.author_id and articles.magazine_id are held in two parallel
+    typed arrays (8 bytes per value; NULL stored as 0), and magazine
+    categories in a dict. Aggregations run as C-level batch operations over
+    those arrays (Counter, set, zip) instead of one SQL query per report.
+    Results are memoized until the next refresh().
+
+    refresh() appends only articles with an id above the last one loaded.
+    Updates and deletes of rows already loaded are only picked up by
+    refresh(full=True).
+    """
+
+    def __init__(self):
+        self.author_ids = array('q')
+        self.magazine_ids = array('q')
+        self.categories = {}
+        self.last_id = 0
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.author_ids)
+
+    def refresh(self, full=False):
+        """Load articles added since the last refresh; returns the number of new rows."""
+        with self._lock:
+            if full:
+                self.author_ids = array('q')
+                self.magazine_ids = array('q')
+                self.last_id = 0
+            conn = get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute("SELECT id, category FROM magazines")
+                self.categories = dict(cursor.fetchall())
+                cursor.execute("""
+                    SELECT id, COALESCE(author_id, 0), COALESCE(magazine_id, 0) FROM articles
+                    WHERE id > ? ORDER BY id
+                """, (self.last_id,))
+                loaded = 0
+                while True:
+                    rows = cursor.fetchmany(LOAD_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    ids, authors, magazines = zip(*rows)
+                    self.author_ids.extend(authors)
+                    self.magazine_ids.extend(magazines)
+                    self.last_id = ids[-1]
+                    loaded += len(rows)
+                cursor.close()
+            except Exception as e:
+                raise Exception(f"Failed to refresh analytics snapshot: {e}")
+            finally:
+                conn.close()
+            self._memo.clear()
+            return loaded
+
+    def _memoized(self, name, compute):
+        result = self._memo.get(name)
+        if result is None:
+            result = self._memo[name] = compute()
+        return result
+
+    def _pairs(self):
+        """Distinct (magazine_id, author_id) pairs with both sides set."""
+        def compute():
+            pairs = set(zip(self.magazine_ids, self.author_ids))
+            return {(m, a) for m, a in pairs if m and a}
+        return self._memoized('pairs', compute)
+
+    def article_counts(self):
+        """Articles per magazine id, including magazines with none."""
+        def compute():
+            counts = Counter(self.magazine_ids)
+            return {id: counts.get(id, 0) for id in self.categories}
+        return self._memoized('article_counts', compute)
+
+    def author_article_counts(self):
+        """Articles per author id, for authors with at least one article."""
+        def compute():
+            counts = Counter(self.author_ids)
+            counts.pop(0, None)
+            return dict(counts)
+        return self._memoized('author_article_counts', compute)
+
+    def category_counts(self):
+        """Articles per magazine category."""
+        def compute():
+            counts = Counter()
+            for id, count in self.article_counts().items():
+                counts[self.categories[id]] += count
+            return dict(counts)
+        return self._memoized('category_counts', compute)
+
+    def distinct_author_counts(self):
+        """Distinct authors per magazine id, for magazines with any authored article."""
+        return self._memoized('distinct_author_counts',
+                              lambda: dict(Counter(m for m, _ in self._pairs())))
+
+    def magazines_with_multiple_authors(self):
+        """Sorted ids of magazines with articles by at least 2 different authors."""
+        return sorted(id for id, count in self.distinct_author_counts().items() if count >= 2)
+
+    def topic_areas(self):
+        """Sorted distinct categories each author has written in, by author id."""
+        def compute():
+            topics = {}
+            for magazine_id, author_id in self._pairs():
+                category = self.categories.get(magazine_id)
+                if category is not None:
+                    topics.setdefault(author_id, set()).add(category)
+            return {id: sorted(categories) for id, categories in topics.items()}
+        return self._memoized('topic_areas', compute)
+
+    def top_magazines(self, n=10):
+        """The n magazines with the most articles as (id, count), ties by lowest id."""
+        return heapq.nsmallest(n, self.article_counts().items(), key=lambda item: (-item[1], item[0]))
+
+    def top_authors(self, n=10):
+        """The n authors with the most articles as (id, count), ties by lowest id."""
+        return heapq.nsmallest(n, self.author_article_counts().items(), key=lambda item: (-item[1], item[0]))
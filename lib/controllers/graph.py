@@ -0,0 +1,167 @@
+import bisect
+import heapq
+import threading
+from array import array
+from collections import Counter
+from lib.db.connection import get_connection
+
+# Rows fetched per round trip while loading the index.
+LOAD_CHUNK_SIZE = 50_000
+
+
+def _add(adjacency, key, value):
+    ids = adjacency.get(key)
+    if ids is None:
+        adjacency[key] = array('q', (value,))
+        return True
+    i = bisect.bisect_left(ids, value)
+    if i < len(ids) and ids[i] == value:
+        return False
+    ids.insert(i, value)
+    return True
+
+
+def _top(counts, k):
+    return heapq.nsmallest(k, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+class AuthorMagazineGraph:
+    """In-memory bipartite index of which authors write for which magazines.
+
+    Each author id maps to a sorted array of the magazine ids they have
+    written for, and each magazine id to a sorted array of its contributors,
+    so co-contributor questions become set walks instead of one query per
+    hop. refresh() only reads articles with an id above the last one loaded;
+    deletes and reassignments are picked up by refresh(full=True).
+    """
+
+    def __init__(self):
+        self.magazines_by_author = {}
+        self.authors_by_magazine = {}
+        self.last_id = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, full=False):
+        """Add the author-magazine links of new articles; returns the number of new links."""
+        with self._lock:
+            if full:
+                self.magazines_by_author, self.authors_by_magazine, self.last_id = {}, {}, 0
+            conn = get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute("SELECT MAX(id) FROM articles")
+                last_id = cursor.fetchone()[0] or 0
+                cursor.execute("""
+                    SELECT DISTINCT author_id, magazine_id FROM articles
+                    WHERE id > ? AND id <= ? AND author_id IS NOT NULL AND magazine_id IS NOT NULL
+                    ORDER BY author_id, magazine_id
+                """, (self.last_id, last_id))
+                added = 0
+                while True:
+                    rows = cursor.fetchmany(LOAD_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    for author_id, magazine_id in rows:
+                        if _add(self.magazines_by_author, author_id, magazine_id):
+                            _add(self.authors_by_magazine, magazine_id, author_id)
+                            added += 1
+                cursor.close()
+                self.last_id = max(self.last_id, last_id)
+            except Exception as e:
+                raise Exception(f"Failed to refresh author-magazine graph: {e}")
+            finally:
+                conn.close()
+            return added
+
+    def magazines_of(self, author_id):
+        """Ids of the magazines an author has written for."""
+        return list(self.magazines_by_author.get(author_id, ()))
+
+    def authors_of(self, magazine_id):
+        """Ids of the authors who have written for a magazine."""
+        return list(self.authors_by_magazine.get(magazine_id, ()))
+
+    def related_authors(self, author_id, k=10):
+        """Authors who also write for this author's magazines.
+
+        Returns up to k (author_id, shared magazine count) pairs, most shared
+        first and ties broken by lowest id.
+        """
+        shared = Counter()
+        for magazine_id in self.magazines_by_author.get(author_id, ()):
+            shared.update(self.authors_by_magazine[magazine_id])
+        shared.pop(author_id, None)
+        return _top(shared, k)
+
+    def similar_magazines(self, magazine_id, k=10):
+        """Magazines sharing contributors with this one.
+
+        Returns up to k (magazine_id, shared contributor count) pairs, most
+        shared first and ties broken by lowest id.
+        """
+        shared = Counter()
+        for author_id in self.authors_by_magazine.get(magazine_id, ()):
+            shared.update(self.magazines_by_author[author_id])
+        shared.pop(magazine_id, None)
+        return _top(shared, k)
+
+    def reachable_authors(self, author_id, max_hops=2, limit=None):
+        """Authors connected through shared magazines within max_hops.
+
+        One hop is author -> magazine -> author. Returns a dict of author id
+        to hop distance, excluding the starting author; the walk is
+        breadth-first and stops early once `limit` authors were found.
+        """
+        distances = {author_id: 0}
+        seen_magazines = set()
+        frontier = [author_id]
+        for hop in range(1, max_hops + 1):
+            next_frontier = []
+            for current in frontier:
+                for magazine_id in self.magazines_by_author.get(current, ()):
+                    if magazine_id in seen_magazines:
+                        continue
+                    seen_magazines.add(magazine_id)
+                    for other in self.authors_by_magazine[magazine_id]:
+                        if other not in distances:
+                            distances[other] = hop
+                            next_frontier.append(other)
+                            if limit is not None and len(distances) > limit:
+                                del distances[author_id]
+                                return distances
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        del distances[author_id]
+        return distances
+
+
+def reachable_authors_query(author_id, max_hops=2):
+    """reachable_authors() computed in SQL with a recursive CTE, without an index.
+
+    Walks magazine_author_stats (one row per author-magazine link) and
+    returns the same dict of author id to hop distance.
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("""
+            WITH RECURSIVE reach(author_id, hop) AS (
+                SELECT ?, 0
+                UNION
+                SELECT other.author_id, reach.hop + 1 FROM reach
+                JOIN magazine_author_stats mine ON mine.author_id = reach.author_id
+                JOIN magazine_author_stats other ON other.magazine_id = mine.magazine_id
+                WHERE reach.hop < ?
+            )
+            SELECT author_id, MIN(hop) FROM reach
+            WHERE author_id != ?
+            GROUP BY author_id
+        """, (author_id, max_hops, author_id))
+        return dict(cursor.fetchall())
+    except Exception as e:
+        raise Exception(f"Failed to walk author graph: {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,59 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from lib.db.connection import ConnectionPool, bind_thread_pool
+
+DEFAULT_MAX_WORKERS = int(os.environ.get('CODE_CHALLENGE_ASYNC_WORKERS', '4'))
+
+_executor = None
+_pool = None
+_lock = threading.Lock()
+
+
+def _init_worker(pool):
+    bind_thread_pool(pool)
+
+
+def configure_executor(max_workers=DEFAULT_MAX_WORKERS, profile=None):
+    """Replace the executor used by the async model methods.
+
+    The executor runs at most max_workers database calls at once, and its
+    threads borrow from a dedicated thread-affine pool of the same size, so
+    async callers never wait on connections held by synchronous code.
+    """
+    global _executor, _pool
+    with _lock:
+        old_executor, old_pool = _executor, _pool
+        _pool = ConnectionPool(size=max_workers, thread_affinity=True, profile=profile)
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db-async',
+                                       initializer=_init_worker, initargs=(_pool,))
+    if old_executor is not None:
+        old_executor.shutdown(wait=True)
+        old_pool.close()
+    return _executor
+
+
+def get_executor():
+    """Return the async executor, creating it on first use."""
+    if _executor is None:
+        configure_executor()
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the executor threads and close their connections."""
+    global _executor, _pool
+    with _lock:
+        executor, pool = _executor, _pool
+        _executor = _pool = None
+    if executor is not None:
+        executor.shutdown(wait=True)
+        pool.close()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Run a blocking model call on the database executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
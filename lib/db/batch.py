@@ -0,0 +1,169 @@
+from lib.db.cache import entity_cache
+from lib.db.connection import get_connection
+from lib.db.writer import flush_write_behind
+
+DEFAULT_BATCH_SIZE = 500
+
+# Rows pulled per fetchmany() call by the streaming iterators.
+DEFAULT_FETCH_SIZE = 1000
+
+# Ids bound per IN (...) list, well under SQLite's host parameter limit.
+IN_CLAUSE_LIMIT = 500
+
+
+def chunked(items, size=DEFAULT_BATCH_SIZE):
+    """Yield successive lists of at most `size` items."""
+    if size <= 0:
+        raise ValueError("Batch size must be a positive integer")
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def placeholders(values):
+    """Return a "?, ?, ..." parameter list with one marker per value."""
+    return ", ".join("?" * len(values))
+
+
+def insert_many(cursor, sql, rows):
+    """Run an INSERT with executemany and return the ids assigned to the rows.
+
+    Must run inside a transaction: once the first row is written this
+    connection holds the write lock, so AUTOINCREMENT ids of the batch are
+    consecutive and end at last_insert_rowid().
+    """
+    if not rows:
+        return []
+    cursor.executemany(sql, rows)
+    last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+def upsert_models(models, key, update=True, batch_size=DEFAULT_BATCH_SIZE, error="Failed to upsert"):
+    """Insert model instances of one class, resolving clashes on the unique `key` column.
+
+    Each chunk of batch_size instances is written by one multi-row
+    INSERT ... ON CONFLICT (key) DO UPDATE ... RETURNING statement, all in a
+    single transaction. With update=True an existing row takes the
+    instance's other column values (upsert); otherwise it is left untouched
+    (find-or-create). Either way every instance ends up with the id and
+    values of its stored row. Needs the unique key from lib.db.keys on `key`.
+    """
+    models = list(models)
+    if not models:
+        return models
+    table, columns = models[0].TABLE, models[0].COLUMNS
+    assignments = ", ".join(f"{column} = excluded.{column}" for column in columns if column != key)
+    if not update or not assignments:
+        # A no-op update, so that RETURNING still yields the existing row.
+        assignments = "id = id"
+    position = columns.index(key) + 1
+    row = f"({placeholders(columns)})"
+    # Send each key once: the last instance wins an upsert, the first a find-or-create.
+    pending = {}
+    for model in models:
+        value = model._values()[position - 1]
+        if update or value not in pending:
+            pending[value] = model
+    flush_write_behind()
+    stored = {}
+    conn = get_connection()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            for chunk in chunked(pending.values(), batch_size):
+                cursor.execute(f"""
+                    INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row] * len(chunk))}
+                    ON CONFLICT ({key}) DO UPDATE SET {assignments}
+                    RETURNING id, {', '.join(columns)}
+                """, [value for model in chunk for value in model._values()])
+                for result in cursor.fetchall():
+                    stored[result[position]] = result
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"{error}: {e}")
+    finally:
+        conn.close()
+    for model in models:
+        result = stored[model._values()[position - 1]]
+        for column, value in zip(columns, result[1:]):
+            setattr(model, column, value)
+        model._committed(result[0], tuple(result[1:]))
+    return models
+
+
+def delete_where(table, where, params=(), batch_size=DEFAULT_BATCH_SIZE, progress=None, cascade=()):
+    """Delete the rows of `table` matching a WHERE clause, batch_size rows per transaction.
+
+    Each chunk is committed on its own, so the write lock is released between
+    batches and other readers and writers get a turn; the predicate is
+    re-evaluated for every chunk. progress, when given, is called with the
+    running total after each chunk; batch_size=None deletes every match in
+    one statement. Cached lookups of the deleted rows are dropped, and so is
+    every cached row of the `cascade` tables whose rows went with them
+    through ON DELETE CASCADE. Returns the number of rows deleted.
+    """
+    if batch_size is None:
+        sql, params = f"DELETE FROM {table} WHERE {where} RETURNING id", tuple(params)
+    elif batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer")
+    else:
+        sql = f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} WHERE {where} LIMIT ?) RETURNING id"
+        params = (*params, batch_size)
+    flush_write_behind()
+    total = 0
+    conn = get_connection()
+    try:
+        while True:
+            with conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(sql, params)
+                ids = [row[0] for row in cursor.fetchall()]
+            for id in ids:
+                entity_cache.invalidate(table, id)
+            if ids:
+                for child in cascade:
+                    entity_cache.invalidate_table(child)
+            total += len(ids)
+            if progress is not None and ids:
+                progress(total)
+            if batch_size is None or len(ids) < batch_size:
+                return total
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to delete from {table}: {e}")
+    finally:
+        conn.close()
+
+
+def stream_rows(sql, params=(), chunk_size=DEFAULT_FETCH_SIZE, row_factory=None):
+    """Yield the rows of a query lazily, pulling chunk_size rows at a time.
+
+    row_factory, when given, is set on the cursor (e.g. a model's _row_factory).
+
+    The connection is borrowed on the first next() and returned once the
+    generator is exhausted, closed, or garbage collected.
+    """
+    conn = get_connection()
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        if row_factory is not None:
+            cursor.row_factory = row_factory
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        if cursor is not None:
+            cursor.close()
+        conn.close()
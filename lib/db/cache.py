@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class EntityCache:
+    """Size-bounded LRU cache of rows keyed by (table, column, value).
+
+    Rows are stored as plain tuples whose first element is the primary key,
+    so callers always build a fresh model instance from a hit. Every key is
+    also indexed by (table, id) so that a write to a row drops all lookups
+    that resolved to it.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_entity = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entity = (key[0], entry[0][0])
+            keys = self._by_entity.get(entity)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_entity[entity]
+
+    def lookup(self, table, column, value):
+        """Return the cached row for a lookup, or None on a miss."""
+        if self.maxsize <= 0:
+            return None
+        key = (table, column, value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() > entry[1]:
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def store(self, table, column, value, row):
+        """Cache a row (a tuple starting with its id) under a lookup key."""
+        if self.maxsize <= 0:
+            return
+        key = (table, column, value)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (tuple(row), expires)
+            self._by_entity.setdefault((table, row[0]), set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, table, column, value):
+        """Forget a single lookup key."""
+        with self._lock:
+            self._drop((table, column, value))
+
+    def invalidate(self, table, id):
+        """Forget every lookup that resolved to the row with this id."""
+        with self._lock:
+            for key in list(self._by_entity.get((table, id), ())):
+                self._drop(key)
+
+    def invalidate_table(self, table):
+        """Forget every lookup of a table, e.g. after a cascading delete."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == table]:
+                self._drop(key)
+
+    def clear(self):
+        """Empty the cache and reset its counters."""
+        with self._lock:
+            self._entries.clear()
+            self._by_entity.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+
+# Process-wide cache used by the model finders; CODE_CHALLENGE_CACHE_SIZE=0 disables it.
+entity_cache = EntityCache(
+    maxsize=int(os.environ.get('CODE_CHALLENGE_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('CODE_CHALLENGE_CACHE_TTL', '300')),
+)
+
+
+class ResultCache:
+    """Cache of aggregate query results, invalidated whenever the database changes.
+
+    Results are lists of plain row tuples keyed by a caller-chosen key. Each
+    entry remembers the PRAGMA data_version read from a dedicated monitor
+    connection before the query ran; that value changes after any commit by
+    any other connection, in this process or another one, so an entry is
+    only served while nothing has been written since. Memory is bounded both
+    by the number of entries and by the total number of cached rows.
+    """
+
+    def __init__(self, maxsize=64, max_rows=100_000):
+        self.maxsize = maxsize
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._monitor = None
+        self._monitor_path = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _version(self):
+        from lib.db import connection
+        if self._monitor_path != connection.database_key():
+            if self._monitor is not None:
+                self._monitor.close()
+            self._monitor = connection.open_database()
+            self._monitor_path = connection.database_key()
+            self._drop_all()
+        return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= len(entry[0])
+
+    def _drop_all(self):
+        self._entries.clear()
+        self._rows = 0
+
+    def get(self, key, compute):
+        """Return the rows cached under key, or run compute() and cache its rows."""
+        if self.maxsize <= 0:
+            return compute()
+        with self._lock:
+            version = self._version()
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._drop(key)
+                self.invalidations += 1
+            self.misses += 1
+        rows = [tuple(row) for row in compute()]
+        if len(rows) > self.max_rows:
+            return rows
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (rows, version)
+            self._rows += len(rows)
+            while len(self._entries) > self.maxsize or self._rows > self.max_rows:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return rows
+
+    def clear(self):
+        """Empty the cache, close the monitor connection and reset the counters."""
+        with self._lock:
+            self._drop_all()
+            if self._monitor is not None:
+                self._monitor.close()
+            self._monitor = self._monitor_path = None
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'rows': self._rows,
+                'max_rows': self.max_rows,
+            }
+
+
+# Process-wide cache used by the aggregate queries; CODE_CHALLENGE_RESULT_CACHE_SIZE=0 disables it.
+result_cache = ResultCache(
+    maxsize=int(os.environ.get('CODE_CHALLENGE_RESULT_CACHE_SIZE', '64')),
+    max_rows=int(os.environ.get('CODE_CHALLENGE_RESULT_CACHE_ROWS', '100000')),
+)
@@ -1,7 +1,486 @@
+import itertools
+import logging
+import os
 import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import deque
+from lib.db.deadline import check_deadlines, install_progress_handler
+from lib.db.instrumentation import connection_factory, install
 
-def get_connection():
-    """Establish and return a database connection."""
-    conn = sqlite3.connect('code_challenge.db')
+logger = logging.getLogger(__name__)
+
+# On-disk database file; see configure_database() to change it at runtime.
+DATABASE = os.environ.get('CODE_CHALLENGE_DATABASE', 'code_challenge.db')
+
+DEFAULT_POOL_SIZE = int(os.environ.get('CODE_CHALLENGE_POOL_SIZE', '5'))
+
+# Named PRAGMA profiles applied to every new connection. cache_size is in
+# KiB when negative, mmap_size in bytes, busy_timeout in milliseconds.
+PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -8000,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+        'foreign_keys': 'ON',
+    },
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'foreign_keys': 'ON',
+    },
+    'read-heavy': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 1024 * 1024 * 1024,
+        'cache_size': -256000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+        'foreign_keys': 'ON',
+    },
+}
+
+DEFAULT_PROFILE = 'durable'
+
+# The profile settings that only affect this connection's reads; read-only
+# connections skip the rest (journal_mode would have to write the file).
+READ_PRAGMAS = ('mmap_size', 'cache_size', 'temp_store', 'busy_timeout')
+
+
+def resolve_profile(profile=None):
+    """Return the profile name to use: the argument, $CODE_CHALLENGE_DB_PROFILE, or the default."""
+    name = profile or os.environ.get('CODE_CHALLENGE_DB_PROFILE') or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown database profile: {name!r} (expected one of {', '.join(PROFILES)})")
+    return name
+
+
+def apply_profile(conn, profile=None, pragmas=None):
+    """Apply the PRAGMA settings of a profile to a connection, or only those named in `pragmas`."""
+    for pragma, value in PROFILES[resolve_profile(profile)].items():
+        if pragmas is None or pragma in pragmas:
+            conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+    return conn
+
+
+class MemoryDatabase:
+    """An in-memory database shared by every connection in this process.
+
+    It lives in SQLite's memdb VFS under a unique "file:/name?vfs=memdb" URI.
+    A private anchor connection keeps it alive until close(). The contents
+    are loaded from `source` with the backup API, and can be written back to
+    it on demand with write_back() or every writeback_interval seconds.
+    clone() makes an independent copy, which is cheap for small databases
+    such as a per-test fixture.
+    """
+
+    _names = itertools.count(1)
+
+    def __init__(self, source=None, writeback_interval=None):
+        self.source = source
+        self.uri = f"file:/code_challenge_{os.getpid()}_{next(self._names)}?vfs=memdb"
+        self._lock = threading.Lock()
+        self._anchor = self.connect()
+        if source is not None and os.path.exists(source):
+            self._load(source)
+        self._stop = threading.Event()
+        self._thread = None
+        if writeback_interval:
+            self._thread = threading.Thread(target=self._write_back_periodically, args=(writeback_interval,),
+                                            name='db-writeback', daemon=True)
+            self._thread.start()
+
+    def connect(self, factory=sqlite3.Connection):
+        """Open a new connection to the in-memory database."""
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False, factory=factory)
+
+    def _load(self, source):
+        disk = sqlite3.connect(source)
+        try:
+            data = bytearray(disk.serialize())
+        finally:
+            disk.close()
+        # memdb has no WAL: mark the copied header as a rollback-journal database.
+        if len(data) > 19:
+            data[18] = data[19] = 1
+        staging = sqlite3.connect(':memory:')
+        try:
+            staging.deserialize(bytes(data))
+            staging.backup(self._anchor)
+        finally:
+            staging.close()
+
+    def write_back(self, path=None):
+        """Copy the in-memory database to `path` (default: the file it was loaded from)."""
+        path = path or self.source
+        if path is None:
+            raise ValueError("No file to write the in-memory database back to")
+        dest = sqlite3.connect(path)
+        try:
+            with self._lock:
+                self._anchor.backup(dest)
+        finally:
+            dest.close()
+
+    def _write_back_periodically(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.write_back()
+            except Exception:
+                logger.exception("Write-back of the in-memory database to %s failed", self.source)
+
+    def clone(self):
+        """Return an independent in-memory copy of this database (with no source file)."""
+        copy = MemoryDatabase()
+        with self._lock:
+            self._anchor.backup(copy._anchor)
+        return copy
+
+    def close(self):
+        """Stop scheduled write-backs (after a final one) and release the database."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.write_back()
+        with self._lock:
+            self._anchor.close()
+
+
+_memory = None
+_memory_from_env = os.environ.get('CODE_CHALLENGE_IN_MEMORY', '') not in ('', '0')
+# Connections opened before this moment point at a previous target and are
+# dropped by the pools instead of being reused.
+_target_changed_at = 0.0
+_target_lock = threading.Lock()
+
+
+def configure_database(path=None, in_memory=False, writeback_interval=None):
+    """Point new connections at a database file, or at an in-memory copy of it.
+
+    path defaults to the current DATABASE ($CODE_CHALLENGE_DATABASE or
+    "code_challenge.db"). With in_memory=True the file is loaded into a new
+    MemoryDatabase, written back every writeback_interval seconds when set.
+    Pooled connections to the previous target are dropped. A previous
+    MemoryDatabase is not closed; that is up to its creator. Returns the
+    MemoryDatabase in use, or None.
+    """
+    global DATABASE
+    if path is not None:
+        DATABASE = path
+    memory = MemoryDatabase(DATABASE, writeback_interval) if in_memory else None
+    use_memory_database(memory)
+    return memory
+
+
+def use_memory_database(memory):
+    """Route new connections to a MemoryDatabase (e.g. a clone), or back to DATABASE with None.
+
+    Entities cached from the previous target are forgotten.
+    """
+    from lib.db.cache import entity_cache
+    global _memory, _memory_from_env, _target_changed_at
+    with _target_lock:
+        _memory = memory
+        _memory_from_env = False
+        _target_changed_at = time.monotonic()
+    close_pool()
+    entity_cache.clear()
+
+
+def memory_database():
+    """Return the MemoryDatabase new connections go to, or None for the on-disk file."""
+    return _memory
+
+
+def database_key():
+    """Identify the current target; changes whenever connections would go elsewhere."""
+    return _memory.uri if _memory is not None else DATABASE
+
+
+def open_database(factory=sqlite3.Connection):
+    """Open a plain connection to the current target, with no profile applied."""
+    global _memory, _memory_from_env
+    if _memory_from_env:
+        with _target_lock:
+            if _memory_from_env:
+                _memory, _memory_from_env = MemoryDatabase(DATABASE), False
+    if _memory is not None:
+        return _memory.connect(factory)
+    return sqlite3.connect(DATABASE, check_same_thread=False, factory=factory)
+
+
+def _connect(profile=None):
+    """Open a new raw connection to the database."""
+    conn = open_database(connection_factory())
     conn.row_factory = sqlite3.Row  # Access columns by name
-    return conn
\ No newline at end of file
+    return apply_profile(install(conn), profile)
+
+
+def connect_readonly(profile=None, path=None):
+    """Open a new read-only connection (URI mode=ro) to the on-disk database."""
+    uri = f"file:{urllib.parse.quote(os.path.abspath(path or DATABASE))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=connection_factory())
+    conn.row_factory = sqlite3.Row
+    return apply_profile(install(conn), profile, READ_PRAGMAS)
+
+
+class PooledConnection:
+    """Wrapper around a pooled sqlite3 connection.
+
+    Behaves like the underlying connection, except that close() hands the
+    connection back to its pool instead of closing it.
+    """
+
+    def __init__(self, pool, conn, created_at):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_created_at', created_at)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, '_conn')
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a released connection.")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def close(self):
+        """Return the connection to the pool."""
+        conn = object.__getattribute__(self, '_conn')
+        if conn is None:
+            return
+        object.__setattr__(self, '_conn', None)
+        self._pool._release(conn, self._created_at)
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections.
+
+    size         -- number of idle connections kept open for reuse
+    max_overflow -- extra connections allowed while the pool is exhausted
+                    (None for no limit)
+    timeout      -- seconds to wait for a connection once the limit is hit
+    thread_affinity -- hand each thread back the connection it used last
+    health_check -- run a trivial query before handing out an idle connection
+    max_lifetime -- seconds after which a connection is closed and replaced
+    profile      -- PRAGMA profile applied to every connection the pool opens
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_overflow=None, timeout=30.0,
+                 thread_affinity=False, health_check=True, max_lifetime=3600.0,
+                 profile=None, connect=_connect):
+        self.size = size
+        self.profile = resolve_profile(profile)
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.thread_affinity = thread_affinity
+        self.health_check = health_check
+        self.max_lifetime = max_lifetime
+        self._connect = connect
+        self._idle = deque()
+        self._local = threading.local()
+        self._checked_out = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._closed = False
+
+    def _limit(self):
+        if self.max_overflow is None:
+            return None
+        return self.size + self.max_overflow
+
+    def _expired(self, created_at):
+        if created_at < _target_changed_at:
+            return True
+        return self.max_lifetime is not None and time.monotonic() - created_at > self.max_lifetime
+
+    def _healthy(self, conn, created_at):
+        if self._expired(created_at):
+            return False
+        if not self.health_check:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _take_idle(self):
+        """Pop an idle connection, preferring the calling thread's own one."""
+        if self.thread_affinity:
+            own = getattr(self._local, 'conn', None)
+            if own is not None and own in self._idle:
+                self._idle.remove(own)
+                return own
+        return self._idle.pop() if self._idle else None
+
+    def acquire(self):
+        """Borrow a connection from the pool."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed.")
+            while True:
+                entry = self._take_idle()
+                if entry is not None:
+                    break
+                limit = self._limit()
+                if limit is None or self._checked_out < limit:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    raise sqlite3.OperationalError("Timed out waiting for a pooled connection.")
+            self._checked_out += 1
+
+        try:
+            if entry is not None:
+                conn, created_at = entry
+                if not self._healthy(conn, created_at):
+                    self._discard(conn)
+                    entry = None
+            if entry is None:
+                conn, created_at = self._connect(self.profile), time.monotonic()
+        except Exception:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+        if self.thread_affinity:
+            self._local.conn = (conn, created_at)
+        return PooledConnection(self, conn, created_at)
+
+    def _release(self, conn, created_at):
+        """Reset a returned connection and put it back on the idle list."""
+        keep = not self._closed and not self._expired(created_at)
+        if keep:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.set_progress_handler(None, 0)
+                conn.row_factory = sqlite3.Row
+            except sqlite3.Error:
+                keep = False
+        with self._cond:
+            self._checked_out -= 1
+            if keep and len(self._idle) < self.size:
+                self._idle.append((conn, created_at))
+                conn = None
+            self._cond.notify()
+        if conn is not None:
+            self._discard(conn)
+
+    def close(self):
+        """Close every idle connection; connections still out are closed on return."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Return the number of idle and checked-out connections."""
+        with self._cond:
+            return {'idle': len(self._idle), 'checked_out': self._checked_out}
+
+
+_pools = {}
+_pool_options = {}
+_pool_lock = threading.Lock()
+_pool_pid = os.getpid()
+
+
+def configure_pool(**options):
+    """Set the options for the process-wide pools; size=0 disables pooling.
+
+    Existing pools are closed and recreated on next use with the new options.
+    """
+    global _pool_options
+    options.pop('profile', None)
+    with _pool_lock:
+        _pool_options = options
+        old = list(_pools.values())
+        _pools.clear()
+    for pool in old:
+        pool.close()
+
+
+def get_pool(profile=None):
+    """Return the process-wide pool for a profile, creating it on first use.
+
+    A forked child never reuses the parent's connections: its first call
+    forgets the inherited pools (without closing them) and starts afresh.
+    """
+    global _pool_pid
+    name = resolve_profile(profile)
+    if _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool_pid != os.getpid():
+                _pools.clear()
+                _pool_pid = os.getpid()
+    pool = _pools.get(name)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = ConnectionPool(profile=name, **_pool_options)
+    return pool
+
+
+def close_pool():
+    """Close the process-wide pools and their idle connections."""
+    with _pool_lock:
+        old = list(_pools.values())
+        _pools.clear()
+    for pool in old:
+        pool.close()
+
+
+_thread_state = threading.local()
+
+
+def bind_thread_pool(pool):
+    """Route get_connection() calls made on the current thread to `pool`.
+
+    Used by worker threads that keep their own connections (see lib/db/aio.py);
+    pass None to go back to the process-wide pools.
+    """
+    _thread_state.pool = pool
+
+
+def get_connection(profile=None):
+    """Borrow a database connection; close() returns it to the pool.
+
+    profile selects a PRAGMA profile from PROFILES ("durable", "throughput",
+    "read-heavy"); it defaults to $CODE_CHALLENGE_DB_PROFILE or "durable".
+    """
+    check_deadlines()
+    pool = getattr(_thread_state, 'pool', None)
+    if pool is None or (profile is not None and resolve_profile(profile) != pool.profile):
+        pool = get_pool(profile)
+    if pool.size <= 0:
+        return install_progress_handler(_connect(pool.profile))
+    return install_progress_handler(pool.acquire())
@@ -0,0 +1,71 @@
+from lib.db.connection import get_connection
+
+# Each counter table paired with the query that computes its true contents.
+COUNTER_QUERIES = {
+    'magazine_stats': """
+        SELECT magazine_id, COUNT(*), COUNT(DISTINCT author_id) FROM articles
+        WHERE magazine_id IS NOT NULL
+        GROUP BY magazine_id
+    """,
+    'author_stats': """
+        SELECT author_id, COUNT(*) FROM articles
+        WHERE author_id IS NOT NULL
+        GROUP BY author_id
+    """,
+    'magazine_author_stats': """
+        SELECT magazine_id, author_id, COUNT(*) FROM articles
+        WHERE magazine_id IS NOT NULL AND author_id IS NOT NULL
+        GROUP BY magazine_id, author_id
+    """,
+}
+
+# Rows with a zero count are left behind by deletes and mean the same as no row.
+COUNTER_COLUMNS = {
+    'magazine_stats': "magazine_id, article_count, author_count",
+    'author_stats': "author_id, article_count",
+    'magazine_author_stats': "magazine_id, author_id, article_count",
+}
+
+
+def rebuild_counters():
+    """Recompute every counter table from articles in a single transaction."""
+    conn = get_connection()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            for table, query in COUNTER_QUERIES.items():
+                cursor.execute(f"DELETE FROM {table}")
+                cursor.execute(f"INSERT INTO {table} ({COUNTER_COLUMNS[table]}) {query}")
+        print("Counters rebuilt!")
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to rebuild counters: {e}")
+    finally:
+        conn.close()
+
+
+def verify_counters():
+    """Compare the counter tables with the articles table.
+
+    Returns a dict mapping each table to the number of rows that drifted;
+    an empty dict means every counter is correct.
+    """
+    conn = get_connection()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            drift = {}
+            for table, query in COUNTER_QUERIES.items():
+                stored = f"SELECT {COUNTER_COLUMNS[table]} FROM {table} WHERE article_count != 0"
+                cursor.execute(f"""
+                    SELECT (SELECT COUNT(*) FROM ({stored} EXCEPT {query}))
+                         + (SELECT COUNT(*) FROM ({query} EXCEPT {stored}))
+                """)
+                mismatches = cursor.fetchone()[0]
+                if mismatches:
+                    drift[table] = mismatches
+            return drift
+    except Exception as e:
+        raise Exception(f"Failed to verify counters: {e}")
+    finally:
+        conn.close()
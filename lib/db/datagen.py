@@ -0,0 +1,97 @@
+import itertools
+import os
+import random
+import sqlite3
+from lib.db.connection import apply_profile
+from lib.db.keys import enable_unique_keys
+from lib.db.migrate import migrate
+
+# Named dataset sizes, in articles.
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+}
+
+CATEGORIES = [
+    "Technology", "News", "Science", "Business", "Health", "Sports",
+    "Culture", "Travel", "Food", "Politics", "Education", "Design",
+]
+
+WORDS = [
+    "tech", "future", "trends", "science", "breakthrough", "world", "news",
+    "ai", "advances", "data", "market", "health", "climate", "energy",
+    "space", "design", "policy", "culture", "travel", "food", "quantum",
+    "robotics", "security", "finance", "startup", "medicine", "ocean",
+    "history", "music", "cities", "learning", "privacy", "network", "cloud",
+]
+
+
+def parse_scale(scale):
+    """Return the article count for a named scale ("10k", "1m", ...) or a plain number."""
+    if isinstance(scale, int):
+        return scale
+    return SCALES.get(str(scale).lower()) or int(scale)
+
+
+def zipf_weights(n, skew):
+    """Cumulative Zipf weights for n items: item i is picked ~ 1 / (i + 1) ** skew."""
+    return list(itertools.accumulate(1.0 / (i + 1) ** skew for i in range(n)))
+
+
+def generate_dataset(path, articles=10_000, authors=None, magazines=None, skew=1.1,
+                     seed=42, batch_size=50_000):
+    """Create a fresh database at `path` filled with a deterministic synthetic dataset.
+
+    Authors and magazines default to articles / 20 and articles / 200. Which
+    author writes an article and which magazine publishes it both follow a
+    Zipf distribution with the given skew, so a few prolific authors and
+    large magazines dominate, as in real data. The same arguments always
+    produce the same rows. Names and titles are unique, and the unique keys
+    from lib.db.keys are enabled.
+    """
+    articles = parse_scale(articles)
+    authors = authors or max(3, articles // 20)
+    magazines = magazines or max(3, articles // 200)
+    rng = random.Random(seed)
+
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    conn = sqlite3.connect(path)
+    try:
+        apply_profile(conn, 'throughput')
+        migrate(conn=conn)
+        with conn:
+            conn.executemany(
+                "INSERT INTO authors (id, name) VALUES (?, ?)",
+                ((i, f"Author {i}") for i in range(1, authors + 1))
+            )
+            conn.executemany(
+                "INSERT INTO magazines (id, name, category) VALUES (?, ?, ?)",
+                ((i, f"Magazine {i}", CATEGORIES[(i - 1) % len(CATEGORIES)]) for i in range(1, magazines + 1))
+            )
+        author_weights = zipf_weights(authors, skew)
+        magazine_weights = zipf_weights(magazines, skew)
+        author_ids = range(1, authors + 1)
+        magazine_ids = range(1, magazines + 1)
+        next_id = 1
+        while next_id <= articles:
+            n = min(batch_size, articles - next_id + 1)
+            by_author = rng.choices(author_ids, cum_weights=author_weights, k=n)
+            by_magazine = rng.choices(magazine_ids, cum_weights=magazine_weights, k=n)
+            rows = [
+                (next_id + i, f"{' '.join(rng.sample(WORDS, 3)).title()} {next_id + i}", by_author[i], by_magazine[i])
+                for i in range(n)
+            ]
+            with conn:
+                conn.executemany(
+                    "INSERT INTO articles (id, title, author_id, magazine_id) VALUES (?, ?, ?, ?)", rows
+                )
+            next_id += n
+        enable_unique_keys(conn=conn)
+        conn.execute("ANALYZE")
+        return {'authors': authors, 'magazines': magazines, 'articles': articles}
+    finally:
+        conn.close()
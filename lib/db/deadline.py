@@ -0,0 +1,185 @@
+import concurrent.futures
+import functools
+import inspect
+import threading
+import time
+
+# SQLite VM instructions between two deadline checks on a running statement.
+PROGRESS_INTERVAL = 10000
+
+# Seconds between checks of the cancellation tokens while waiting on a future.
+CANCEL_POLL_INTERVAL = 0.05
+
+_local = threading.local()
+
+
+class QueryInterrupted(Exception):
+    """A statement was aborted by a Deadline before it finished."""
+
+
+class QueryTimeout(QueryInterrupted):
+    """The call ran past its timeout."""
+
+
+class QueryCancelled(QueryInterrupted):
+    """The call's CancellationToken was cancelled."""
+
+
+class CancellationToken:
+    """Flag another thread sets to stop the calls it was passed to."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+def _state():
+    if not hasattr(_local, 'scopes'):
+        _local.scopes = []   # Deadlines active on this thread, outermost first
+        _local.error = None  # what the progress handler aborted a statement for
+    return _local
+
+
+def _interruption(scopes, now):
+    """Return the error for the first of `scopes` that is cancelled or past its deadline, else None."""
+    for scope in scopes:
+        if scope.cancel is not None and scope.cancel.cancelled:
+            return QueryCancelled("Query was cancelled")
+        if scope.expires_at is not None and now >= scope.expires_at:
+            return QueryTimeout(f"Query exceeded its {scope.timeout:g}s timeout")
+    return None
+
+
+def _progress():
+    """Progress handler: a non-zero return makes SQLite abort the statement."""
+    state = _state()
+    if state.error is None:
+        state.error = _interruption(state.scopes, time.monotonic())
+    return 0 if state.error is None else 1
+
+
+def check_deadlines():
+    """Raise QueryTimeout or QueryCancelled if an active Deadline has already run out."""
+    state = _state()
+    if state.scopes and state.error is None:
+        state.error = _interruption(state.scopes, time.monotonic())
+    if state.error is not None:
+        raise state.error
+
+
+def wait_for(future):
+    """Return future.result(), giving up with QueryTimeout or QueryCancelled when an active Deadline runs out.
+
+    Only the wait is abandoned; whatever the future stands for carries on.
+    """
+    state = _state()
+    while True:
+        check_deadlines()
+        if not state.scopes:
+            return future.result()
+        timeout = CANCEL_POLL_INTERVAL
+        for scope in state.scopes:
+            if scope.expires_at is not None:
+                timeout = min(timeout, max(scope.expires_at - time.monotonic(), 0.0))
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            continue
+
+
+def install_progress_handler(conn):
+    """Have SQLite check the active Deadlines while conn runs statements, if there are any."""
+    if _state().scopes:
+        conn.set_progress_handler(_progress, PROGRESS_INTERVAL)
+    return conn
+
+
+class Deadline:
+    """Context manager bounding the statements run on this thread by a timeout and/or a token.
+
+    Entering it, and borrowing a connection with get_connection() inside
+    it, fails straight away once `timeout` seconds have passed since the
+    Deadline was created or `cancel` is cancelled. Connections borrowed
+    inside the block also get a progress handler that aborts a statement
+    still running at that point. The block then raises QueryTimeout or
+    QueryCancelled in place of whatever error the interrupted statement
+    was reported as. Deadlines nest; every active one is enforced.
+    """
+
+    def __init__(self, timeout=None, cancel=None):
+        self.timeout = timeout
+        self.cancel = cancel
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+
+    def __enter__(self):
+        error = _interruption((self,), time.monotonic())
+        if error is not None:
+            raise error
+        state = _state()
+        if not state.scopes:
+            state.error = None
+        state.scopes.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        state = _state()
+        state.scopes.remove(self)
+        error = state.error
+        if not state.scopes:
+            state.error = None
+        if exc_value is not None and error is not None and exc_value is not error:
+            raise error from exc_value
+        return False
+
+
+def _bounded(func):
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, timeout=None, cancel=None, **kwargs):
+            if timeout is None and cancel is None:
+                if getattr(_local, 'scopes', None):
+                    check_deadlines()
+                yield from func(*args, **kwargs)
+                return
+            scope, generator = Deadline(timeout, cancel), func(*args, **kwargs)
+            try:
+                while True:
+                    with scope:
+                        try:
+                            item = next(generator)
+                        except StopIteration:
+                            return
+                    yield item
+            finally:
+                generator.close()
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, timeout=None, cancel=None, **kwargs):
+        if timeout is None and cancel is None:
+            if getattr(_local, 'scopes', None):
+                check_deadlines()
+            return func(*args, **kwargs)
+        with Deadline(timeout, cancel):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def cancellable(cls):
+    """Class decorator adding timeout= and cancel= options to every public sync method of a model."""
+    for name, member in list(vars(cls).items()):
+        if name.startswith('_'):
+            continue
+        if isinstance(member, classmethod):
+            func = member.__func__
+            if not inspect.iscoroutinefunction(func):
+                setattr(cls, name, classmethod(_bounded(func)))
+        elif inspect.isfunction(member) and not inspect.iscoroutinefunction(member):
+            setattr(cls, name, _bounded(member))
+    return cls
@@ -0,0 +1,336 @@
+import bisect
+import functools
+import inspect
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float('inf'))
+
+# Statement records a thread keeps open for its running model methods; past
+# this, finished ones are dropped and the oldest are finished early.
+MAX_OPEN_RECORDS = 256
+
+slow_query_log = logging.getLogger('lib.db.slow_queries')
+
+_local = threading.local()
+
+
+def _state():
+    if not hasattr(_local, 'methods'):
+        _local.methods = []   # stack of model method names being executed
+        _local.traced = []    # statements reported by the trace callback
+        _local.open = []      # statement records that may still fetch rows
+    return _local
+
+
+def _finish_open(method):
+    """Finish the open statement records issued by `method` on this thread."""
+    state = _state()
+    still_open = []
+    for record in state.open:
+        if record['method'] == method:
+            metrics.finish_statement(record)
+        elif not record.get('done'):
+            still_open.append(record)
+    state.open[:] = still_open
+
+
+def _track_open(record):
+    """Keep a method's statement record open until the method returns, within MAX_OPEN_RECORDS."""
+    state = _state()
+    state.open.append(record)
+    if len(state.open) > MAX_OPEN_RECORDS:
+        state.open[:] = [r for r in state.open if not r.get('done')]
+        while len(state.open) > MAX_OPEN_RECORDS:
+            metrics.finish_statement(state.open.pop(0))
+
+
+class MethodStats:
+    """Call count, errors and latency histogram for one model method."""
+
+    __slots__ = ('calls', 'errors', 'statements', 'rows', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.calls = self.errors = self.statements = self.rows = 0
+        self.total = self.max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS_MS)
+
+    def observe(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1e3)] += 1
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'statements': self.statements,
+            'rows': self.rows,
+            'total_ms': self.total * 1e3,
+            'mean_ms': self.total / self.calls * 1e3 if self.calls else 0.0,
+            'max_ms': self.max * 1e3,
+            'histogram': dict(zip((f"<={b}ms" for b in LATENCY_BUCKETS_MS), self.buckets)),
+        }
+
+
+class Instrumentation:
+    """Process-wide SQL tracing, per-method metrics and slow-query logging.
+
+    While enabled, new connections trace every statement: its text (as
+    expanded by set_trace_callback, including trigger bodies), the SQL as
+    written (under 'statement'), duration, rows fetched and the model method
+    that issued it. Statements slower than slow_query_ms are logged to the
+    "lib.db.slow_queries" logger.
+    """
+
+    def __init__(self, enabled=False, slow_query_ms=100.0, history=1000):
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.statements = deque(maxlen=history)
+        self.methods = {}
+        self._lock = threading.Lock()
+
+    def enable(self, slow_query_ms=None, slow_log_path=None):
+        """Start tracing; pooled connections are reopened so they pick it up."""
+        from lib.db.connection import close_pool
+        if slow_query_ms is not None:
+            self.slow_query_ms = slow_query_ms
+        if slow_log_path:
+            handler = logging.FileHandler(slow_log_path)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            slow_query_log.addHandler(handler)
+            slow_query_log.setLevel(logging.WARNING)
+        self.enabled = True
+        close_pool()
+
+    def disable(self):
+        """Stop tracing; pooled connections are reopened without tracing."""
+        from lib.db.connection import close_pool
+        self.enabled = False
+        close_pool()
+
+    def reset(self):
+        """Forget recorded statements and method metrics."""
+        with self._lock:
+            self.statements.clear()
+            self.methods.clear()
+
+    def _method(self, name):
+        stats = self.methods.get(name)
+        if stats is None:
+            stats = self.methods[name] = MethodStats()
+        return stats
+
+    def record_method(self, name, seconds, failed):
+        with self._lock:
+            stats = self._method(name)
+            stats.observe(seconds)
+            if failed:
+                stats.errors += 1
+
+    def record_statement(self, record):
+        with self._lock:
+            self.statements.append(record)
+            if record['method']:
+                self._method(record['method']).statements += 1
+
+    def finish_statement(self, record):
+        """Account the rows of a statement and log it when it was slow."""
+        if record.get('done'):
+            return
+        record['done'] = True
+        if record['method'] and record['rows']:
+            with self._lock:
+                self._method(record['method']).rows += record['rows']
+        if record['duration_ms'] >= self.slow_query_ms:
+            slow_query_log.warning("slow query %.1f ms, %d rows, in %s: %s", record['duration_ms'],
+                                   record['rows'], record['method'] or '-', record['sql'])
+
+    def method_stats(self):
+        """Return per-method metrics as plain dicts."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self.methods.items())}
+
+    def summary(self, limit=10):
+        """Return a readable report of method latencies and the slowest statements."""
+        lines = [f"{'method':<44}{'calls':>7}{'stmts':>7}{'rows':>8}{'mean ms':>10}{'max ms':>10}"]
+        for name, s in self.method_stats().items():
+            lines.append(f"{name:<44}{s['calls']:>7}{s['statements']:>7}{s['rows']:>8}"
+                         f"{s['mean_ms']:>10.3f}{s['max_ms']:>10.3f}")
+        with self._lock:
+            slowest = sorted(self.statements, key=lambda r: r['duration_ms'], reverse=True)[:limit]
+        if slowest:
+            lines.append("")
+            lines.append("slowest statements:")
+            for r in slowest:
+                sql = " ".join(r['sql'].split())
+                lines.append(f"  {r['duration_ms']:9.3f} ms {r['rows']:>6} rows  {r['method'] or '-'}: {sql[:100]}")
+        return "\n".join(lines)
+
+
+metrics = Instrumentation(
+    enabled=os.environ.get('CODE_CHALLENGE_TRACE', '') not in ('', '0'),
+    slow_query_ms=float(os.environ.get('CODE_CHALLENGE_SLOW_QUERY_MS', '100')),
+)
+
+
+def _trace(statement):
+    _state().traced.append(statement)
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that times its statements and counts the rows fetched."""
+
+    _record = None
+
+    def _finish(self):
+        if self._record is not None:
+            metrics.finish_statement(self._record)
+            self._record = None
+
+    def _run(self, method, sql, params):
+        self._finish()
+        state = _state()
+        state.traced.clear()
+        start = time.perf_counter()
+        try:
+            return method(sql, params)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1e3
+            self._record = {
+                'sql': "\n".join(state.traced) or sql,
+                'statement': sql,
+                'duration_ms': elapsed,
+                'rows': 0,
+                'method': state.methods[-1] if state.methods else None,
+            }
+            metrics.record_statement(self._record)
+            # Outside a model method the record is finished by the cursor
+            # itself: on its next statement, fetchall(), close() or collection.
+            if self._record['method']:
+                _track_open(self._record)
+
+    def execute(self, sql, params=()):
+        return self._run(super().execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._run(super().executemany, sql, seq_of_params)
+
+    def _fetch(self, fetch, *args):
+        start = time.perf_counter()
+        rows = fetch(*args)
+        if self._record is not None:
+            self._record['duration_ms'] += (time.perf_counter() - start) * 1e3
+            self._record['rows'] += len(rows) if isinstance(rows, list) else int(rows is not None)
+        return rows
+
+    def fetchone(self):
+        return self._fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(super().fetchmany, self.arraysize if size is None else size)
+
+    def fetchall(self):
+        rows = self._fetch(super().fetchall)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors, including those of execute(), are TracedCursors."""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+
+def connection_factory():
+    """Return the sqlite3 connection class to use for new connections."""
+    return TracedConnection if metrics.enabled else sqlite3.Connection
+
+
+def install(conn):
+    """Attach the trace callback to a new connection when tracing is on."""
+    if metrics.enabled:
+        conn.set_trace_callback(_trace)
+    return conn
+
+
+def _timed(name, func):
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                yield from func(*args, **kwargs)
+                return
+            state, generator, elapsed, failed = _state(), func(*args, **kwargs), 0.0, False
+            try:
+                while True:
+                    state.methods.append(name)
+                    start = time.perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    except Exception:
+                        failed = True
+                        raise
+                    finally:
+                        elapsed += time.perf_counter() - start
+                        state.methods.pop()
+                    yield item
+            finally:
+                generator.close()
+                _finish_open(name)
+                metrics.record_method(name, elapsed, failed)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not metrics.enabled:
+            return func(*args, **kwargs)
+        state = _state()
+        state.methods.append(name)
+        start, failed = time.perf_counter(), False
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            state.methods.pop()
+            _finish_open(name)
+            metrics.record_method(name, time.perf_counter() - start, failed)
+    return wrapper
+
+
+def instrumented(cls):
+    """Class decorator timing every public sync method of a model."""
+    for name, member in list(vars(cls).items()):
+        if name.startswith('_'):
+            continue
+        if isinstance(member, classmethod):
+            func = member.__func__
+            if not inspect.iscoroutinefunction(func):
+                setattr(cls, name, classmethod(_timed(f"{cls.__name__}.{name}", func)))
+        elif inspect.isfunction(member) and not inspect.iscoroutinefunction(member):
+            setattr(cls, name, _timed(f"{cls.__name__}.{name}", member))
+    return cls
@@ -0,0 +1,97 @@
+from lib.db.connection import get_connection
+
+# Opt-in natural keys: the column upsert() and find_or_create() resolve
+# conflicts on, for each table.
+UNIQUE_KEYS = {
+    'authors': 'name',
+    'magazines': 'name',
+    'articles': 'title',
+}
+
+# The plain lookup index each unique index replaces while enabled.
+LOOKUP_INDEXES = {
+    'authors': 'idx_authors_name',
+    'magazines': 'idx_magazines_name',
+    'articles': 'idx_articles_title',
+}
+
+
+def unique_index(table):
+    return f"uq_{table}_{UNIQUE_KEYS[table]}"
+
+
+def _tables(tables):
+    tables = list(tables or UNIQUE_KEYS)
+    unknown = set(tables) - set(UNIQUE_KEYS)
+    if unknown:
+        raise ValueError(f"No unique key defined for {', '.join(sorted(unknown))}")
+    return tables
+
+
+def _with_connection(conn, work, error):
+    own = conn is None
+    conn = conn or get_connection()
+    try:
+        with conn:
+            return work(conn.cursor())
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"{error}: {e}")
+    finally:
+        if own:
+            conn.close()
+
+
+def duplicate_keys(tables=None, conn=None):
+    """Return {table: number of key values held by more than one row}, for tables with duplicates."""
+    def work(cursor):
+        duplicates = {}
+        for table in _tables(tables):
+            column = UNIQUE_KEYS[table]
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM (SELECT 1 FROM {table} GROUP BY {column} HAVING COUNT(*) > 1)
+            """)
+            count = cursor.fetchone()[0]
+            if count:
+                duplicates[table] = count
+        return duplicates
+    return _with_connection(conn, work, "Failed to check unique keys")
+
+
+def unique_keys_enabled(conn=None):
+    """Return {table: True if its unique key index exists}."""
+    def work(cursor):
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        indexes = {row[0] for row in cursor.fetchall()}
+        return {table: unique_index(table) in indexes for table in UNIQUE_KEYS}
+    return _with_connection(conn, work, "Failed to read unique keys")
+
+
+def enable_unique_keys(tables=None, conn=None):
+    """Create the unique key indexes, replacing the plain lookup indexes on the same columns.
+
+    Refuses to start while any of the tables holds duplicate keys; remove
+    them first (duplicate_keys() reports where they are).
+    """
+    tables = _tables(tables)
+    duplicates = duplicate_keys(tables, conn)
+    if duplicates:
+        found = ", ".join(f"{table} ({count})" for table, count in duplicates.items())
+        raise Exception(f"Failed to enable unique keys: duplicate values in {found}")
+
+    def work(cursor):
+        for table in tables:
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {unique_index(table)} ON {table}({UNIQUE_KEYS[table]})")
+            cursor.execute(f"DROP INDEX IF EXISTS {LOOKUP_INDEXES[table]}")
+    _with_connection(conn, work, "Failed to enable unique keys")
+
+
+def disable_unique_keys(tables=None, conn=None):
+    """Drop the unique key indexes and restore the plain lookup indexes."""
+    tables = _tables(tables)
+
+    def work(cursor):
+        for table in tables:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {LOOKUP_INDEXES[table]} ON {table}({UNIQUE_KEYS[table]})")
+            cursor.execute(f"DROP INDEX IF EXISTS {unique_index(table)}")
+    _with_connection(conn, work, "Failed to disable unique keys")
@@ -0,0 +1,67 @@
+import os
+import re
+from lib.db.connection import get_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+_FILENAME = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+
+def load_migrations(path=MIGRATIONS_DIR):
+    """Return the migrations in `path` as (version, name, sql) tuples, oldest first.
+
+    Migration files are named NNNN_description.sql; versions must run
+    1, 2, 3, ... without gaps.
+    """
+    migrations = []
+    for filename in os.listdir(path):
+        match = _FILENAME.match(filename)
+        if match:
+            with open(os.path.join(path, filename), 'r') as f:
+                migrations.append((int(match.group(1)), filename[:-4], f.read()))
+    migrations.sort()
+    for expected, (version, name, _) in enumerate(migrations, start=1):
+        if version != expected:
+            raise ValueError(f"Migration {name} is out of sequence; expected version {expected}")
+    return migrations
+
+
+def schema_version(conn):
+    """Return the schema version recorded in the database's user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(target=None, path=MIGRATIONS_DIR, conn=None):
+    """Apply pending migrations up to `target` (default: the latest).
+
+    Each migration runs in its own transaction together with the
+    user_version bump, so a failed migration leaves the database at the
+    previous version. Migrations are written to be safe on databases that
+    already have their objects (from the old schema.sql). Pass `conn` to
+    migrate a connection other than the pooled one. Returns the names of
+    the migrations applied.
+    """
+    migrations = load_migrations(path)
+    latest = migrations[-1][0] if migrations else 0
+    target = latest if target is None else target
+    owned = conn is None
+    conn = get_connection() if owned else conn
+    try:
+        current = schema_version(conn)
+        if current > latest:
+            raise RuntimeError(f"Database schema version {current} is newer than the latest migration ({latest})")
+        applied = []
+        for version, name, sql in migrations:
+            if current < version <= target:
+                try:
+                    conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version = {version};\nCOMMIT;")
+                except Exception as e:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise Exception(f"Failed to apply migration {name}: {e}")
+                applied.append(name)
+                print(f"Applied migration {name}")
+        return applied
+    finally:
+        if owned:
+            conn.close()
@@ -25,4 +25,4 @@ CREATE TABLE IF NOT EXISTS articles (
 );
 CREATE INDEX IF NOT EXISTS idx_articles_author_id ON articles(author_id);
 CREATE INDEX IF NOT EXISTS idx_articles_magazine_id ON articles(magazine_id);
-CREATE INDEX IF NOT EXISTS idx_articles_title ON articles(title);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_articles_title ON articles(title);
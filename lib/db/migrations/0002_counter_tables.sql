@@ -0,0 +1,121 @@
+-- Denormalized counters kept in sync with articles by the triggers below.
+-- Rebuild or verify them with `python -m scripts.counters rebuild|verify`.
+CREATE TABLE IF NOT EXISTS magazine_stats (
+    magazine_id INTEGER PRIMARY KEY,
+    article_count INTEGER NOT NULL DEFAULT 0,
+    author_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_magazine_stats_article_count ON magazine_stats(article_count DESC);
+CREATE INDEX IF NOT EXISTS idx_magazine_stats_author_count ON magazine_stats(author_count);
+
+CREATE TABLE IF NOT EXISTS author_stats (
+    author_id INTEGER PRIMARY KEY,
+    article_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_author_stats_article_count ON author_stats(article_count DESC);
+
+CREATE TABLE IF NOT EXISTS magazine_author_stats (
+    magazine_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    article_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (magazine_id, author_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_stats_insert AFTER INSERT ON articles
+BEGIN
+    INSERT INTO magazine_author_stats (magazine_id, author_id, article_count)
+    SELECT NEW.magazine_id, NEW.author_id, 1
+    WHERE NEW.magazine_id IS NOT NULL AND NEW.author_id IS NOT NULL
+    ON CONFLICT (magazine_id, author_id) DO UPDATE SET article_count = article_count + 1;
+
+    INSERT INTO magazine_stats (magazine_id, article_count, author_count)
+    SELECT NEW.magazine_id, 1, NEW.author_id IS NOT NULL
+    WHERE NEW.magazine_id IS NOT NULL
+    ON CONFLICT (magazine_id) DO UPDATE SET
+        article_count = article_count + 1,
+        author_count = author_count + (NEW.author_id IS NOT NULL AND (
+            SELECT article_count FROM magazine_author_stats
+            WHERE magazine_id = NEW.magazine_id AND author_id = NEW.author_id) = 1);
+
+    INSERT INTO author_stats (author_id, article_count)
+    SELECT NEW.author_id, 1
+    WHERE NEW.author_id IS NOT NULL
+    ON CONFLICT (author_id) DO UPDATE SET article_count = article_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_stats_delete AFTER DELETE ON articles
+BEGIN
+    UPDATE magazine_author_stats SET article_count = article_count - 1
+    WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id;
+
+    UPDATE magazine_stats SET
+        article_count = article_count - 1,
+        author_count = author_count - (OLD.author_id IS NOT NULL AND (
+            SELECT article_count FROM magazine_author_stats
+            WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id) = 0)
+    WHERE magazine_id = OLD.magazine_id;
+
+    DELETE FROM magazine_author_stats
+    WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id AND article_count <= 0;
+
+    UPDATE author_stats SET article_count = article_count - 1
+    WHERE author_id = OLD.author_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_stats_update AFTER UPDATE OF author_id, magazine_id ON articles
+WHEN OLD.author_id IS NOT NEW.author_id OR OLD.magazine_id IS NOT NEW.magazine_id
+BEGIN
+    UPDATE magazine_author_stats SET article_count = article_count - 1
+    WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id;
+
+    UPDATE magazine_stats SET
+        article_count = article_count - 1,
+        author_count = author_count - (OLD.author_id IS NOT NULL AND (
+            SELECT article_count FROM magazine_author_stats
+            WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id) = 0)
+    WHERE magazine_id = OLD.magazine_id;
+
+    DELETE FROM magazine_author_stats
+    WHERE magazine_id = OLD.magazine_id AND author_id = OLD.author_id AND article_count <= 0;
+
+    UPDATE author_stats SET article_count = article_count - 1
+    WHERE author_id = OLD.author_id;
+
+    INSERT INTO magazine_author_stats (magazine_id, author_id, article_count)
+    SELECT NEW.magazine_id, NEW.author_id, 1
+    WHERE NEW.magazine_id IS NOT NULL AND NEW.author_id IS NOT NULL
+    ON CONFLICT (magazine_id, author_id) DO UPDATE SET article_count = article_count + 1;
+
+    INSERT INTO magazine_stats (magazine_id, article_count, author_count)
+    SELECT NEW.magazine_id, 1, NEW.author_id IS NOT NULL
+    WHERE NEW.magazine_id IS NOT NULL
+    ON CONFLICT (magazine_id) DO UPDATE SET
+        article_count = article_count + 1,
+        author_count = author_count + (NEW.author_id IS NOT NULL AND (
+            SELECT article_count FROM magazine_author_stats
+            WHERE magazine_id = NEW.magazine_id AND author_id = NEW.author_id) = 1);
+
+    INSERT INTO author_stats (author_id, article_count)
+    SELECT NEW.author_id, 1
+    WHERE NEW.author_id IS NOT NULL
+    ON CONFLICT (author_id) DO UPDATE SET article_count = article_count + 1;
+END;
+
+-- Backfill the counters for rows that existed before the triggers.
+DELETE FROM magazine_stats;
+INSERT INTO magazine_stats (magazine_id, article_count, author_count)
+SELECT magazine_id, COUNT(*), COUNT(DISTINCT author_id) FROM articles
+WHERE magazine_id IS NOT NULL
+GROUP BY magazine_id;
+
+DELETE FROM author_stats;
+INSERT INTO author_stats (author_id, article_count)
+SELECT author_id, COUNT(*) FROM articles
+WHERE author_id IS NOT NULL
+GROUP BY author_id;
+
+DELETE FROM magazine_author_stats;
+INSERT INTO magazine_author_stats (magazine_id, author_id, article_count)
+SELECT magazine_id, author_id, COUNT(*) FROM articles
+WHERE magazine_id IS NOT NULL AND author_id IS NOT NULL
+GROUP BY magazine_id, author_id;
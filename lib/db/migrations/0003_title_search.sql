@@ -0,0 +1,26 @@
+-- Full-text index over article titles, kept in sync by the triggers below.
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title,
+    content='articles',
+    content_rowid='id',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_fts_insert AFTER INSERT ON articles
+BEGIN
+    INSERT INTO articles_fts (rowid, title) VALUES (NEW.id, NEW.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_fts_delete AFTER DELETE ON articles
+BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_fts_update AFTER UPDATE OF title ON articles
+BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+    INSERT INTO articles_fts (rowid, title) VALUES (NEW.id, NEW.title);
+END;
+
+-- Index the titles of rows that existed before the triggers.
+INSERT INTO articles_fts (articles_fts) VALUES ('rebuild');
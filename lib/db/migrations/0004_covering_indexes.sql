@@ -0,0 +1,12 @@
+-- Composite indexes that cover the author/magazine joins without table
+-- lookups: (magazine_id, author_id) serves Magazine.contributors and
+-- contributing_authors, (author_id, magazine_id) serves Author.magazines and
+-- topic_areas. Each makes the single-column index on its leading column
+-- redundant, so those are dropped.
+CREATE INDEX IF NOT EXISTS idx_articles_magazine_author ON articles(magazine_id, author_id);
+CREATE INDEX IF NOT EXISTS idx_articles_author_magazine ON articles(author_id, magazine_id);
+DROP INDEX IF EXISTS idx_articles_magazine_id;
+DROP INDEX IF EXISTS idx_articles_author_id;
+
+-- Refresh planner statistics so the new indexes are costed correctly.
+ANALYZE;
@@ -0,0 +1,14 @@
+-- Deleting an author or magazine cascades to its articles (foreign_keys is
+-- enabled on every connection), and the article triggers count them down.
+-- These drop the counter rows left behind for the deleted parent itself.
+CREATE TRIGGER IF NOT EXISTS trg_authors_stats_delete AFTER DELETE ON authors
+BEGIN
+    DELETE FROM author_stats WHERE author_id = OLD.id;
+    DELETE FROM magazine_author_stats WHERE author_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_magazines_stats_delete AFTER DELETE ON magazines
+BEGIN
+    DELETE FROM magazine_stats WHERE magazine_id = OLD.id;
+    DELETE FROM magazine_author_stats WHERE magazine_id = OLD.id;
+END;
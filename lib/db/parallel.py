@@ -0,0 +1,115 @@
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from lib.db import connection
+from lib.db.connection import ConnectionPool, bind_thread_pool, connect_readonly
+
+DEFAULT_PROCESSES = int(os.environ.get('CODE_CHALLENGE_PARALLEL_PROCESSES', '0')) or os.cpu_count() or 2
+
+
+class PackedModel(tuple):
+    """A model flattened to (table, id, *column values) so it pickles cheaply."""
+
+    __slots__ = ()
+
+
+def _model_classes():
+    from lib.models.article import Article
+    from lib.models.author import Author
+    from lib.models.magazine import Magazine
+    return {cls.TABLE: cls for cls in (Author, Magazine, Article)}
+
+
+def pack(value):
+    """Replace the models inside a result (lists, tuples, dicts) with PackedModels."""
+    if hasattr(value, 'TABLE') and hasattr(value, '_values'):
+        return PackedModel((value.TABLE, value.id) + tuple(value._values()))
+    if isinstance(value, list):
+        return [pack(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(pack(item) for item in value)
+    if isinstance(value, dict):
+        return {key: pack(item) for key, item in value.items()}
+    return value
+
+
+def unpack(value, classes=None):
+    """Rebuild the models of a packed result with their _from_db constructors."""
+    classes = classes or _model_classes()
+    if isinstance(value, PackedModel):
+        return classes[value[0]]._from_db(*value[1:])
+    if isinstance(value, list):
+        return [unpack(item, classes) for item in value]
+    if isinstance(value, tuple):
+        return tuple(unpack(item, classes) for item in value)
+    if isinstance(value, dict):
+        return {key: unpack(item, classes) for key, item in value.items()}
+    return value
+
+
+def _init_worker(database, profile):
+    from lib.db.cache import entity_cache, result_cache
+    connection.DATABASE = database
+    # The result cache watches for writes through a read-write connection of
+    # its own, and nothing tells a worker's entity cache about the parent's
+    # writes; read-only workers go without both.
+    entity_cache.maxsize = result_cache.maxsize = 0
+    bind_thread_pool(ConnectionPool(size=1, profile=profile,
+                                    connect=lambda profile: connect_readonly(profile, database)))
+
+
+def _run_chunk(func, chunk):
+    return [pack(func(*args)) for args in chunk]
+
+
+class ParallelExecutor:
+    """Runs batches of read-only model calls on a pool of worker processes.
+
+    Every worker holds one read-only (URI mode=ro) connection to the current
+    database, so finders and aggregates run outside this process's GIL.
+    Calls are sent in chunks, and models in the results travel back as plain
+    PackedModel tuples that are rebuilt here with _from_db. Workers are
+    started with the "spawn" method by default, so they never inherit open
+    connections. Use as a context manager, or call close().
+    """
+
+    def __init__(self, processes=DEFAULT_PROCESSES, profile='read-heavy', start_method='spawn'):
+        if connection.memory_database() is not None:
+            raise ValueError("Parallel reads need the on-disk database; write the in-memory one back first")
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(os.path.abspath(connection.DATABASE), profile),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def starmap(self, func, args_list, chunksize=None):
+        """Return [func(*args) for args in args_list], computed in the workers."""
+        args_list = [tuple(args) for args in args_list]
+        if not args_list:
+            return []
+        chunksize = chunksize or max(1, math.ceil(len(args_list) / (self.processes * 4)))
+        futures = [self._executor.submit(_run_chunk, func, args_list[i:i + chunksize])
+                   for i in range(0, len(args_list), chunksize)]
+        classes = _model_classes()
+        results = []
+        for future in futures:
+            results.extend(unpack(future.result(), classes))
+        return results
+
+    def map(self, func, values, chunksize=None):
+        """Return [func(value) for value in values], computed in the workers."""
+        return self.starmap(func, [(value,) for value in values], chunksize)
+
+    def close(self):
+        """Shut the worker processes down."""
+        self._executor.shutdown(wait=True)
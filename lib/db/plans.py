@@ -0,0 +1,96 @@
+import re
+from lib.db.connection import get_connection
+from lib.db.instrumentation import metrics
+
+# Statements that have no query plan worth checking.
+NO_PLAN = ('PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'ANALYZE', 'VACUUM')
+
+
+def normalize_sql(sql):
+    """Collapse whitespace, "?, ?" lists and repeated VALUES rows so each statement has one stable form."""
+    sql = re.sub(r"\?(?:\s*,\s*\?)+", "?, ...", " ".join(sql.split()))
+    return re.sub(r"(\((?:\?|\?, \.\.\.)\))(?:, \1)+", r"\1, ...", sql)
+
+
+def explain(conn, sql):
+    """Return the EXPLAIN QUERY PLAN of a statement as indented lines, like the sqlite3 shell.
+
+    Parameters are bound as NULL; without stat4 data the plan does not
+    depend on their values.
+    """
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count('?')).fetchall()
+    depth, lines = {0: -1}, []
+    for id, parent, _, detail in rows:
+        depth[id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[id] + detail)
+    return lines
+
+
+def capture_plans(calls):
+    """Run each zero-argument call with SQL tracing on and explain what the model methods issued.
+
+    Returns {method: {normalized statement: plan lines}}, covering every
+    statement that reads a table (a health check's SELECT 1 or a plain
+    INSERT ... VALUES does not). Tracing is switched back off afterwards
+    unless it was already enabled.
+    """
+    was_enabled = metrics.enabled
+    statements = set()
+    metrics.enable()
+    try:
+        for call in calls:
+            metrics.reset()
+            call()
+            statements.update((r['method'], r['statement']) for r in list(metrics.statements) if r['method'])
+    finally:
+        metrics.reset()
+        if not was_enabled:
+            metrics.disable()
+    plans = {}
+    conn = get_connection()
+    try:
+        for method, statement in sorted(statements):
+            if statement.lstrip().upper().startswith(NO_PLAN):
+                continue
+            plan = explain(conn, statement)
+            if not all('CONSTANT ROW' in detail for detail in plan):
+                plans.setdefault(method, {})[normalize_sql(statement)] = plan
+        return plans
+    except Exception as e:
+        raise Exception(f"Failed to capture query plans: {e}")
+    finally:
+        conn.close()
+
+
+def format_plans(plans):
+    """Render captured plans as text, sorted by method and statement, for diffing."""
+    lines = []
+    for method in sorted(plans):
+        lines.append(method)
+        for statement in sorted(plans[method]):
+            lines.append(f"  {statement}")
+            lines.extend(f"    {detail}" for detail in plans[method][statement])
+        lines.append("")
+    return "\n".join(lines)
+
+
+def plan_problems(plans, allowed=()):
+    """List full scans and sorts through a temp B-tree, except in the `allowed` methods.
+
+    A SCAN reads every row of a table or of one of its indexes, where a
+    SEARCH seeks into an index; a temp B-tree for ORDER BY means no index
+    delivers the rows in order.
+    """
+    problems = []
+    for method in sorted(plans):
+        if method in allowed:
+            continue
+        for statement, plan in sorted(plans[method].items()):
+            for detail in plan:
+                detail = detail.strip()
+                full_scan = (detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail
+                             and "CONSTANT ROW" not in detail)
+                temp_sort = detail.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in detail
+                if full_scan or temp_sort:
+                    problems.append(f"{method}: {detail} in {statement}")
+    return problems
@@ -0,0 +1,33 @@
+import re
+from lib.db.connection import get_connection
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text, prefix=True):
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted term (so user input can never be parsed as
+    FTS5 syntax), all terms must match, and with prefix=True each term also
+    matches longer words ("tech" finds "Technology"). Returns None when the
+    text has no searchable words.
+    """
+    terms = _TOKEN.findall(text or "")
+    if not terms:
+        return None
+    suffix = "*" if prefix else ""
+    return " ".join(f'"{term}"{suffix}' for term in terms)
+
+
+def rebuild_search_index():
+    """Rebuild the articles_fts index from the articles table."""
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        print("Search index rebuilt!")
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to rebuild search index: {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,161 @@
+from lib.db.batch import DEFAULT_BATCH_SIZE, chunked, insert_many
+from lib.db.connection import get_connection
+from lib.db.writer import flush_write_behind
+
+# Tables in the order their rows must be written: parents before articles.
+FLUSH_ORDER = ('authors', 'magazines', 'articles')
+
+
+def dirty_columns(model):
+    """Return the columns of a saved model that changed since it was loaded or saved.
+
+    Instances whose database state is unknown (built with an explicit id
+    rather than loaded) report every column.
+    """
+    if model._loaded is None:
+        return list(model.COLUMNS)
+    return [column for column, value, loaded in zip(model.COLUMNS, model._values(), model._loaded)
+            if value != loaded]
+
+
+def update_statement(model, columns):
+    """Return (sql, params) updating only `columns` of a saved model."""
+    values = dict(zip(model.COLUMNS, model._values()))
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return (f"UPDATE {model.TABLE} SET {assignments} WHERE id = ?",
+            [values[column] for column in columns] + [model.id])
+
+
+def _is_model(value):
+    return hasattr(value, 'TABLE') and hasattr(value, '_values')
+
+
+class Session:
+    """Unit of work that writes a set of model changes in one transaction.
+
+    Added instances are tracked until the session is discarded. flush()
+    inserts the new ones and updates only the changed columns of the rest,
+    skipping unchanged instances. Writes are grouped by table (authors,
+    magazines, then articles) and statement, and each group is sent with
+    executemany. An article's author_id or magazine_id may hold a pending
+    Author or Magazine; flush() replaces it with the parent's id once the
+    parent is inserted. Used as a context manager, the session flushes on a
+    clean exit.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._tracked = {}
+
+    def add(self, model):
+        """Track a model instance; returns it for chaining."""
+        self._tracked[id(model)] = model
+        return model
+
+    def add_all(self, models):
+        """Track several model instances."""
+        for model in models:
+            self.add(model)
+
+    def expunge(self, model):
+        """Stop tracking an instance."""
+        self._tracked.pop(id(model), None)
+
+    @property
+    def new(self):
+        """Tracked instances that have not been inserted yet."""
+        return [model for model in self._tracked.values() if model.id is None]
+
+    @property
+    def dirty(self):
+        """Saved instances with changes that flush() would write."""
+        return [model for model in self._tracked.values()
+                if model.id is not None and dirty_columns(model)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def _by_table(self, models):
+        tables = {}
+        for model in models:
+            tables.setdefault(model.TABLE, []).append(model)
+        return [(table, tables[table]) for table in sorted(tables, key=FLUSH_ORDER.index)]
+
+    def _references(self, models):
+        """Return (model, column, parent) for every column holding a model instead of an id.
+
+        Each parent must already be saved or be tracked by this session.
+        """
+        references = []
+        for model in models:
+            for column in model.COLUMNS:
+                value = getattr(model, column)
+                if not _is_model(value):
+                    continue
+                if value.id is None and id(value) not in self._tracked:
+                    raise Exception(f"Failed to flush session: {type(model).__name__}.{column} refers to "
+                                    f"an unsaved {type(value).__name__} that is not in the session")
+                references.append((model, column, value))
+        return references
+
+    def flush(self):
+        """Write all pending inserts and updates in one transaction.
+
+        Returns the number of rows written. On failure the transaction is
+        rolled back, new instances get their id reset to None, columns that
+        held a parent model get it back in place of the parent's id, and the
+        error is raised.
+        """
+        new, dirty = self.new, self.dirty
+        if not new and not dirty:
+            return 0
+        references = self._references(new + dirty)
+        committed = []
+        flush_write_behind()
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                for table, models in self._by_table(new):
+                    for model in models:
+                        for column in model.COLUMNS:
+                            value = getattr(model, column)
+                            if _is_model(value):
+                                setattr(model, column, value.id)
+                    columns = models[0].COLUMNS
+                    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+                    for chunk in chunked(models, self.batch_size):
+                        values = [model._values() for model in chunk]
+                        for model, id, row in zip(chunk, insert_many(cursor, sql, values), values):
+                            model.id = id
+                            committed.append((model, row))
+                for table, models in self._by_table(dirty):
+                    statements = {}
+                    for model in models:
+                        for column in model.COLUMNS:
+                            value = getattr(model, column)
+                            if _is_model(value):
+                                setattr(model, column, value.id)
+                        sql, params = update_statement(model, dirty_columns(model))
+                        statements.setdefault(sql, []).append((model, params))
+                    for sql, writes in statements.items():
+                        for chunk in chunked(writes, self.batch_size):
+                            cursor.executemany(sql, [params for _, params in chunk])
+                        committed.extend((model, model._values()) for model, _ in writes)
+        except Exception as e:
+            conn.rollback()
+            for model in new:
+                model.id = None
+            for model, column, parent in references:
+                setattr(model, column, parent)
+            raise Exception(f"Failed to flush session: {e}")
+        finally:
+            conn.close()
+        for model, values in committed:
+            model._committed(model.id, values)
+        return len(committed)
@@ -0,0 +1,263 @@
+import csv
+import json
+import logging
+import os
+import time
+from lib.db.batch import chunked, placeholders, stream_rows
+from lib.db.cache import entity_cache
+from lib.db.connection import get_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_BATCH = 10_000
+DEFAULT_COMMIT_EVERY = 200_000
+
+# Columns written by export and accepted by import, per table. Articles may
+# reference their author/magazine either by id or by name.
+FIELDS = {
+    'authors': ['id', 'name'],
+    'magazines': ['id', 'name', 'category'],
+    'articles': ['id', 'title', 'author_id', 'magazine_id', 'author', 'magazine'],
+}
+
+
+def _format(path, fmt=None):
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported format {fmt!r}; use csv or jsonl")
+    return fmt
+
+
+def read_records(path, fmt=None):
+    """Yield records (dicts) from a CSV or JSONL file one at a time."""
+    fmt = _format(path, fmt)
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            for record in csv.DictReader(f):
+                yield {k: v for k, v in record.items() if v not in (None, '')}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class RecordWriter:
+    """Streaming CSV/JSONL writer; use as a context manager."""
+
+    def __init__(self, path, fieldnames, fmt=None):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.fmt = _format(path, fmt)
+        self.rows = 0
+        self._file = None
+        self._csv = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        if self.fmt == 'csv':
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.fieldnames)
+        return self
+
+    def write(self, values):
+        """Write one row given as a sequence in fieldnames order."""
+        if self._csv is not None:
+            self._csv.writerow(values)
+        else:
+            self._file.write(json.dumps(dict(zip(self.fieldnames, values))) + "\n")
+        self.rows += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.close()
+        return False
+
+
+def _report(label, rows, started, progress):
+    if progress:
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0.0
+        print(f"{label}: {rows} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+
+
+def _deferred_objects(cursor, table):
+    """Non-unique indexes and triggers on `table` as (type, name, sql) tuples.
+
+    Unique indexes stay in place so that constraints hold during the load.
+    """
+    cursor.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL
+          AND sql NOT LIKE 'CREATE UNIQUE%'
+    """, (table,))
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def _restore_deferred(conn, cursor, table, deferred, rebuild):
+    """Recreate the dropped indexes and triggers; with rebuild, also redo what the article triggers maintain."""
+    for _, _, sql in deferred:
+        cursor.execute(sql.replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1)
+                       .replace("CREATE TRIGGER ", "CREATE TRIGGER IF NOT EXISTS ", 1))
+    conn.commit()
+    if rebuild and table == 'articles':
+        from lib.db.counters import rebuild_counters
+        from lib.db.search import rebuild_search_index
+        rebuild_counters()
+        rebuild_search_index()
+    entity_cache.clear()
+
+
+class NameResolver:
+    """Resolves author/magazine names to ids a batch at a time.
+
+    Resolved names are remembered, so each distinct name is looked up once.
+    With create_missing=True unknown names are inserted (magazines take the
+    record's category, or "Uncategorized").
+    """
+
+    def __init__(self, cursor, table, create_missing=False):
+        self.cursor = cursor
+        self.table = table
+        self.create_missing = create_missing
+        self.ids = {}
+
+    def resolve(self, names, categories=None):
+        missing = [n for n in dict.fromkeys(names) if n not in self.ids]
+        for chunk in chunked(missing, 500):
+            self.cursor.execute(
+                f"SELECT name, MIN(id) FROM {self.table} WHERE name IN ({placeholders(chunk)}) GROUP BY name", chunk
+            )
+            self.ids.update(self.cursor.fetchall())
+        unknown = [n for n in missing if n not in self.ids]
+        if unknown and not self.create_missing:
+            raise ValueError(f"Unknown {self.table} names: {', '.join(unknown[:5])}")
+        for name in unknown:
+            if self.table == 'magazines':
+                category = (categories or {}).get(name) or "Uncategorized"
+                self.cursor.execute("INSERT INTO magazines (name, category) VALUES (?, ?)", (name, category))
+            else:
+                self.cursor.execute("INSERT INTO authors (name) VALUES (?)", (name,))
+            self.ids[name] = self.cursor.lastrowid
+
+
+def _article_rows(records, authors, magazines):
+    # A null id (JSONL) counts as missing, like an empty CSV cell.
+    records = [{k: v for k, v in r.items() if v is not None} for r in records]
+    author_names = [r['author'] for r in records if 'author' in r and 'author_id' not in r]
+    magazine_names = [r['magazine'] for r in records if 'magazine' in r and 'magazine_id' not in r]
+    if author_names:
+        authors.resolve(author_names)
+    if magazine_names:
+        magazines.resolve(magazine_names, {r['magazine']: r.get('category') for r in records if 'magazine' in r})
+    return [
+        (
+            r.get('id'),
+            r['title'],
+            int(r['author_id']) if 'author_id' in r else authors.ids.get(r.get('author')),
+            int(r['magazine_id']) if 'magazine_id' in r else magazines.ids.get(r.get('magazine')),
+        )
+        for r in records
+    ]
+
+
+def import_records(table, records, batch_size=DEFAULT_IMPORT_BATCH, commit_every=DEFAULT_COMMIT_EVERY,
+                   defer_indexes=True, create_missing=False, progress=True):
+    """Bulk-load an iterable of records into authors, magazines or articles.
+
+    Records are consumed lazily and written with executemany in batches, and
+    the load commits every commit_every rows. With defer_indexes=True, the
+    table's secondary indexes and triggers are dropped during the load and
+    recreated at the end. For articles, the counter tables and search index
+    are then rebuilt in one pass, also when the load fails after some of it
+    was committed. This is meant for offline loads: other connections see
+    the table without its indexes meanwhile.
+
+    Returns a dict with the row count, elapsed seconds and rows per second.
+    """
+    if table not in FIELDS:
+        raise ValueError(f"Cannot import into {table!r}")
+    started = time.perf_counter()
+    rows = since_commit = committed = 0
+    conn = get_connection(profile='throughput')
+    try:
+        cursor = conn.cursor()
+        deferred = _deferred_objects(cursor, table) if defer_indexes else []
+        for kind, name, _ in deferred:
+            cursor.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+        try:
+            authors = NameResolver(cursor, 'authors', create_missing)
+            magazines = NameResolver(cursor, 'magazines', create_missing)
+            for batch in chunked(records, batch_size):
+                if table == 'authors':
+                    cursor.executemany("INSERT INTO authors (id, name) VALUES (?, ?)",
+                                       [(r.get('id'), r['name']) for r in batch])
+                elif table == 'magazines':
+                    cursor.executemany("INSERT INTO magazines (id, name, category) VALUES (?, ?, ?)",
+                                       [(r.get('id'), r['name'], r['category']) for r in batch])
+                else:
+                    cursor.executemany(
+                        "INSERT INTO articles (id, title, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+                        _article_rows(batch, authors, magazines)
+                    )
+                rows += len(batch)
+                since_commit += len(batch)
+                if since_commit >= commit_every:
+                    conn.commit()
+                    committed, since_commit = rows, 0
+                    _report(f"Imported {table}", rows, started, progress)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            # Batches committed before the failure were written without the
+            # triggers, so the counters and search index still need rebuilding.
+            try:
+                _restore_deferred(conn, cursor, table, deferred, rebuild=bool(deferred) and committed > 0)
+            except Exception:
+                logger.exception("Failed to restore %s indexes and triggers after a failed import", table)
+            raise
+        _restore_deferred(conn, cursor, table, deferred, rebuild=bool(deferred))
+    except Exception as e:
+        raise Exception(f"Failed to import {table}: {e}")
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    _report(f"Imported {table}", rows, started, progress)
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+
+
+def import_file(table, path, fmt=None, **options):
+    """Stream a CSV/JSONL file into a table; see import_records for options."""
+    return import_records(table, read_records(path, fmt), **options)
+
+
+def export_table(table, path, fmt=None, progress=True):
+    """Stream every row of authors, magazines or articles to a CSV/JSONL file."""
+    if table not in FIELDS:
+        raise ValueError(f"Cannot export {table!r}")
+    columns = [c for c in FIELDS[table] if c not in ('author', 'magazine')]
+    started = time.perf_counter()
+    with RecordWriter(path, columns, fmt) as writer:
+        for row in stream_rows(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id"):
+            writer.write(tuple(row))
+    _report(f"Exported {table}", writer.rows, started, progress)
+    return writer.rows
+
+
+def export_article_counts(path, fmt=None, use_counters=False, progress=True):
+    """Stream Magazine.article_counts() to a CSV/JSONL file."""
+    from lib.models.magazine import Magazine
+    started = time.perf_counter()
+    with RecordWriter(path, ['id', 'name', 'category', 'article_count'], fmt) as writer:
+        if use_counters:
+            for magazine, count in Magazine.article_counts(use_counters=True):
+                writer.write((magazine.id, magazine.name, magazine.category, count))
+        else:
+            for magazine, count in Magazine.iter_article_counts():
+                writer.write((magazine.id, magazine.name, magazine.category, count))
+    _report("Exported article counts", writer.rows, started, progress)
+    return writer.rows
+
+
+# Query exports available to the command line tool, by name.
+EXPORTS = {
+    'article_counts': export_article_counts,
+}
@@ -0,0 +1,233 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from lib.db.connection import ConnectionPool
+from lib.db.deadline import QueryInterrupted, wait_for
+
+DEFAULT_MAX_BATCH = int(os.environ.get('CODE_CHALLENGE_WRITE_BATCH', '256'))
+DEFAULT_WINDOW_MS = float(os.environ.get('CODE_CHALLENGE_WRITE_WINDOW_MS', '0'))
+
+_STOP = object()
+
+
+class _Write:
+    __slots__ = ('sql', 'params', 'id', 'error', 'on_commit', 'future')
+
+    def __init__(self, sql, params, id, error, on_commit):
+        self.sql = sql
+        self.params = params
+        self.id = id
+        self.error = error
+        self.on_commit = on_commit
+        self.future = Future()
+
+
+class WriteBehindQueue:
+    """Single background writer that commits queued writes in groups.
+
+    Writes are drained from a queue and applied in one transaction per
+    group. A group takes everything queued while the previous one was
+    committing, up to max_batch writes; window_ms > 0 additionally waits
+    that long after the first write for stragglers. Each write runs inside
+    its own savepoint, so a failing write only fails its own future.
+    Futures resolve with the row id (lastrowid for inserts) once the group
+    has committed; if no connection can be opened for a group, its futures
+    fail with that error and the writer carries on with the next group.
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, window_ms=DEFAULT_WINDOW_MS, profile=None):
+        self.max_batch = max_batch
+        self.window = window_ms / 1000.0
+        self._queue = queue.Queue()
+        self._pool = ConnectionPool(size=1, profile=profile, health_check=False)
+        self._closed = False
+        self.groups = 0
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, sql, params=(), id=None, error="Write failed", on_commit=None):
+        """Queue one statement; returns a Future for the row id.
+
+        `id` is the id to report for updates; inserts report lastrowid.
+        `on_commit(id)` runs on the writer thread after the group commits.
+        Failures are reported as Exception(f"{error}: {cause}").
+        """
+        if self._closed:
+            raise RuntimeError("Write-behind queue is closed")
+        write = _Write(sql, params, id, error, on_commit)
+        self._queue.put(write)
+        return write.future
+
+    def flush(self):
+        """Block until every write queued so far has been committed."""
+        self.submit(None).result()
+
+    def close(self):
+        """Commit the pending writes, then stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._pool.close()
+
+    def stats(self):
+        """Return the number of committed groups and writes."""
+        return {'groups': self.groups, 'writes': self.writes, 'pending': self._queue.qsize()}
+
+    def _collect(self, first):
+        group = [first]
+        deadline = time.monotonic() + self.window
+        while len(group) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            group.append(item)
+        return group
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            group = [first]
+            try:
+                group = self._collect(first)
+                # A connection per group, so a change of database target (which
+                # expires the pooled one) is picked up by the next group.
+                conn = self._pool.acquire()
+            except Exception as e:
+                self._fail(group, e)
+                continue
+            try:
+                self._commit(conn, group)
+            finally:
+                conn.close()
+
+    def _fail(self, group, error):
+        for write in group:
+            if not write.future.done():
+                write.future.set_exception(Exception(f"{write.error}: {error}"))
+
+    def _commit(self, conn, group):
+        results = []
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            for write in group:
+                if write.sql is None:
+                    results.append((write, None, None))
+                    continue
+                cursor.execute("SAVEPOINT write_behind")
+                try:
+                    cursor.execute(write.sql, write.params)
+                    results.append((write, cursor.lastrowid if write.id is None else write.id, None))
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write_behind")
+                    results.append((write, None, e))
+                cursor.execute("RELEASE write_behind")
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self._fail(group, e)
+            return
+        self.groups += 1
+        for write, id, error in results:
+            if error is not None:
+                write.future.set_exception(Exception(f"{write.error}: {error}"))
+                continue
+            if write.sql is not None:
+                self.writes += 1
+            try:
+                if write.on_commit is not None:
+                    write.on_commit(id)
+            except Exception as e:
+                write.future.set_exception(e)
+            else:
+                write.future.set_result(id)
+
+
+_writer = None
+_enabled = os.environ.get('CODE_CHALLENGE_WRITE_BEHIND', '') not in ('', '0')
+_lock = threading.Lock()
+
+
+def configure_write_behind(max_batch=DEFAULT_MAX_BATCH, window_ms=DEFAULT_WINDOW_MS, profile=None):
+    """Route model save() calls through a new write-behind queue.
+
+    Any previous queue is flushed and closed first.
+    """
+    global _writer, _enabled
+    with _lock:
+        old, _writer = _writer, WriteBehindQueue(max_batch, window_ms, profile)
+        _enabled = True
+    if old is not None:
+        old.close()
+    return _writer
+
+
+def disable_write_behind():
+    """Commit pending writes and go back to one transaction per save()."""
+    global _writer, _enabled
+    with _lock:
+        old, _writer = _writer, None
+        _enabled = False
+    if old is not None:
+        old.close()
+
+
+def write_behind():
+    """Return the active write-behind queue, or None when saves are synchronous.
+
+    CODE_CHALLENGE_WRITE_BEHIND=1 enables it with the default settings.
+    """
+    global _writer
+    if _writer is None and _enabled:
+        with _lock:
+            if _writer is None and _enabled:
+                _writer = WriteBehindQueue()
+    return _writer
+
+
+def flush_write_behind():
+    """Commit every write queued so far, when write-behind is on.
+
+    Call it before writing rows directly, so a queued save() cannot commit
+    after, and overwrite, a later write to the same row.
+    """
+    writer = write_behind()
+    if writer is not None:
+        writer.flush()
+
+
+def settle(future):
+    """Block until a queued write has committed or failed; its outcome is left to the future's owner.
+
+    Active Deadlines still apply to the wait.
+    """
+    try:
+        wait_for(future)
+    except QueryInterrupted:
+        raise
+    except Exception:
+        pass
+
+
+def completed(id):
+    """Return an already-resolved future, for saves that ran synchronously."""
+    future = Future()
+    future.set_result(id)
+    return future
+
+
+atexit.register(disable_write_behind)
@@ -1,9 +1,12 @@
 from lib.models.author import Author
 from lib.models.magazine import Magazine
 from lib.models.article import Article
+from lib.db.cache import entity_cache, result_cache
+from lib.db.instrumentation import metrics
 
 def debug():
     """Interactive debugging session."""
+    metrics.enable()
     print("Debugging Session")
     print("1. All Authors:")
     for author in [Author.find_by_id(i) for i in range(1, 4)]:
@@ -29,5 +32,15 @@ def debug():
     if prolific:
         print(f"Most Prolific Author: {prolific.name}")
 
+    print("\n6. Entity Cache:")
+    stats = entity_cache.stats()
+    print(f"Hits: {stats['hits']}, Misses: {stats['misses']}, Size: {stats['size']}/{stats['maxsize']}")
+    stats = result_cache.stats()
+    print(f"Result cache hits: {stats['hits']}, Misses: {stats['misses']}, "
+          f"Invalidations: {stats['invalidations']}, Rows: {stats['rows']}/{stats['max_rows']}")
+
+    print("\n7. Query Metrics:")
+    print(metrics.summary())
+
 if __name__ == "__main__":
     debug()
\ No newline at end of file
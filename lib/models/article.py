@@ -1,13 +1,29 @@
+from lib.db.aio import run_sync
+from lib.db.batch import (DEFAULT_BATCH_SIZE, DEFAULT_FETCH_SIZE, chunked, delete_where, insert_many, stream_rows,
+                          upsert_models)
+from lib.db.cache import entity_cache, result_cache
 from lib.db.connection import get_connection
-from lib.models.author import Author
-from lib.models.magazine import Magazine
+from lib.db.deadline import cancellable, wait_for
+from lib.db.instrumentation import instrumented
+from lib.db.search import build_match_query
+from lib.db.session import dirty_columns, update_statement
+from lib.db.writer import completed, flush_write_behind, settle, write_behind
 
+@instrumented
+@cancellable
 class Article:
+    __slots__ = ('id', '_title', 'author_id', 'magazine_id', '_loaded', '_pending')
+
+    TABLE = 'articles'
+    COLUMNS = ('title', 'author_id', 'magazine_id')
+
     def __init__(self, title, author_id, magazine_id, id=None):
         self.id = id
         self.title = title
         self.author_id = author_id
         self.magazine_id = magazine_id
+        self._loaded = None
+        self._pending = None
 
     @property
     def title(self):
@@ -19,39 +35,208 @@ class Article:
             raise ValueError("Article title must be a non-empty string")
         self._title = value.strip()
 
-    def save(self):
-        """Save or update the article in the database with transaction."""
+    @classmethod
+    def _from_db(cls, id, title, author_id, magazine_id):
+        """Build an article from a trusted database row, skipping validation."""
+        article = object.__new__(cls)
+        article.id = id
+        article._title = title
+        article.author_id = author_id
+        article.magazine_id = magazine_id
+        article._loaded = (title, author_id, magazine_id)
+        article._pending = None
+        return article
+
+    @classmethod
+    def _row_factory(cls, cursor, row):
+        """sqlite3 row factory building articles straight from (id, title, author_id, magazine_id) tuples."""
+        return cls._from_db(*row)
+
+    def _values(self):
+        """Column values in COLUMNS order."""
+        return (self._title, self.author_id, self.magazine_id)
+
+    def save(self, wait=True):
+        """Save or update the article in the database with transaction.
+
+        Saving an unchanged article is a no-op, and updates only write the
+        columns changed since it was loaded or last saved. With write-behind
+        enabled the write is queued for the background writer and committed
+        with other pending writes; save() blocks until that happens, or its
+        timeout/cancel runs out, unless wait=False, which returns a future
+        for the id. A new instance whose
+        queued insert has not committed yet waits for it first, so saving it
+        again updates the row instead of inserting a second one.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None and self.id is None:
+            settle(pending)
+        values = self._values()
+        if self.id is None:
+            sql, params = "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)", values
+        else:
+            columns = dirty_columns(self)
+            if not columns:
+                return None if wait else completed(self.id)
+            sql, params = update_statement(self, columns)
+        writer = write_behind()
+        if writer is not None:
+            future = writer.submit(sql, params, id=self.id, error="Failed to save article",
+                                   on_commit=lambda id: self._committed(id, values))
+            if self.id is None:
+                self._pending = future
+            if not wait:
+                return future
+            wait_for(future)
+            return None
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+                id = cursor.lastrowid if self.id is None else self.id
+            self._committed(id, values)
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Failed to save article: {e}")
+        finally:
+            conn.close()
+        return None if wait else completed(self.id)
+
+    def _committed(self, id, values):
+        """Record a committed save: its id, the saved values, and drop stale cache entries."""
+        self.id = id
+        self._loaded = values
+        entity_cache.invalidate('articles', id)
+        entity_cache.discard('articles', 'title', self.title)
+
+    def delete(self):
+        """Delete the article.
+
+        Returns True if a row was deleted. The instance keeps its values but
+        loses its id, so a later save() inserts it again.
+        """
+        if self.id is None:
+            return False
+        deleted = delete_where('articles', "id = ?", (self.id,), batch_size=None)
+        self.id = None
+        self._loaded = None
+        return deleted == 1
+
+    @classmethod
+    def delete_by_author(cls, author_id, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """Delete all articles by an author, batch_size rows per transaction.
+
+        progress, when given, is called with the running total after each
+        batch. Returns the number of articles deleted.
+        """
+        return delete_where('articles', "author_id = ?", (author_id,), batch_size=batch_size, progress=progress)
+
+    @classmethod
+    def delete_by_magazine(cls, magazine_id, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """Delete all articles of a magazine, batch_size rows per transaction.
+
+        progress, when given, is called with the running total after each
+        batch. Returns the number of articles deleted.
+        """
+        return delete_where('articles', "magazine_id = ?", (magazine_id,), batch_size=batch_size, progress=progress)
+
+    @classmethod
+    def bulk_save(cls, articles, batch_size=DEFAULT_BATCH_SIZE):
+        """Insert new articles and update existing ones in a single transaction.
+
+        Rows are written with executemany in chunks of batch_size, and the
+        generated ids are back-filled on the new instances.
+        """
+        articles = list(articles)
+        cls._bulk_write([article for article in articles if article.id is None],
+                        [article for article in articles if article.id is not None], batch_size)
+        return articles
+
+    @classmethod
+    def bulk_update(cls, articles, batch_size=DEFAULT_BATCH_SIZE):
+        """Update already-saved articles in a single transaction with executemany."""
+        articles = list(articles)
+        if any(article.id is None for article in articles):
+            raise ValueError("bulk_update requires saved articles; use bulk_save for new ones")
+        cls._bulk_write([], articles, batch_size)
+        return articles
+
+    @classmethod
+    def _bulk_write(cls, new, existing, batch_size):
+        flush_write_behind()
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
-                if self.id is None:
-                    cursor.execute(
+                for chunk in chunked(new, batch_size):
+                    ids = insert_many(
+                        cursor,
                         "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)",
-                        (self.title, self.author_id, self.magazine_id)
+                        [(article.title, article.author_id, article.magazine_id) for article in chunk]
                     )
-                    self.id = cursor.lastrowid
-                else:
-                    cursor.execute(
+                    for article, id in zip(chunk, ids):
+                        article.id = id
+                for chunk in chunked(existing, batch_size):
+                    cursor.executemany(
                         "UPDATE articles SET title = ?, author_id = ?, magazine_id = ? WHERE id = ?",
-                        (self.title, self.author_id, self.magazine_id, self.id)
+                        [(article.title, article.author_id, article.magazine_id, article.id) for article in chunk]
                     )
+            for article in new + existing:
+                article._committed(article.id, article._values())
         except Exception as e:
             conn.rollback()
-            raise Exception(f"Failed to save article: {e}")
+            for article in new:
+                article.id = None
+            raise Exception(f"Failed to bulk save articles: {e}")
         finally:
             conn.close()
 
+    @classmethod
+    def upsert(cls, title, author_id, magazine_id):
+        """Insert an article, or point the one with this title at the given author and magazine.
+
+        Runs as one statement. Needs the unique key on articles.title
+        (lib.db.keys.enable_unique_keys()).
+        """
+        return upsert_models([cls(title, author_id, magazine_id)], 'title', error="Failed to upsert article")[0]
+
+    @classmethod
+    def find_or_create(cls, title, author_id, magazine_id):
+        """Return the article with this title as stored, creating it if needed, in one statement."""
+        return upsert_models([cls(title, author_id, magazine_id)], 'title', update=False,
+                             error="Failed to find or create article")[0]
+
+    @classmethod
+    def bulk_upsert(cls, articles, batch_size=DEFAULT_BATCH_SIZE):
+        """upsert() for a list of articles: one statement per batch_size rows, in a single transaction.
+
+        Each instance gets the id of its stored row.
+        """
+        return upsert_models(articles, 'title', batch_size=batch_size, error="Failed to bulk upsert articles")
+
+    @classmethod
+    def bulk_find_or_create(cls, articles, batch_size=DEFAULT_BATCH_SIZE):
+        """find_or_create() for a list of articles; instances take the stored values of existing ones."""
+        return upsert_models(articles, 'title', update=False, batch_size=batch_size,
+                             error="Failed to bulk find or create articles")
+
     @classmethod
     def find_by_id(cls, id):
         """Find an article by ID."""
+        cached = entity_cache.lookup('articles', 'id', id)
+        if cached is not None:
+            return cls._from_db(*cached)
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, title, author_id, magazine_id FROM articles WHERE id = ?", (id,))
                 result = cursor.fetchone()
-                return cls(title=result['title'], author_id=result['author_id'], magazine_id=result['magazine_id'], id=result['id']) if result else None
+                if result is None:
+                    return None
+                entity_cache.store('articles', 'id', id, tuple(result))
+                return cls._from_db(*result)
         except Exception as e:
             raise Exception(f"Failed to find article: {e}")
         finally:
@@ -60,18 +245,53 @@ class Article:
     @classmethod
     def find_by_title(cls, title):
         """Find an article by title."""
+        cached = entity_cache.lookup('articles', 'title', title)
+        if cached is not None:
+            return cls._from_db(*cached)
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, title, author_id, magazine_id FROM articles WHERE title = ?", (title,))
                 result = cursor.fetchone()
-                return cls(title=result['title'], author_id=result['author_id'], magazine_id=result['magazine_id'], id=result['id']) if result else None
+                if result is None:
+                    return None
+                entity_cache.store('articles', 'title', title, tuple(result))
+                return cls._from_db(*result)
         except Exception as e:
             raise Exception(f"Failed to find article: {e}")
         finally:
             conn.close()
 
+    @classmethod
+    def search(cls, query, limit=20, offset=0, prefix=True):
+        """Full-text search over article titles, best matches first.
+
+        Results are ranked by bm25 and paginated with limit/offset; with
+        prefix=True each word also matches longer words.
+        """
+        match = build_match_query(query, prefix=prefix)
+        if match is None:
+            return []
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                cursor.row_factory = cls._row_factory
+                # rank is the FTS5 bm25() score; lower is a better match.
+                cursor.execute("""
+                    SELECT a.id, a.title, a.author_id, a.magazine_id FROM articles_fts f
+                    JOIN articles a ON a.id = f.rowid
+                    WHERE articles_fts MATCH ?
+                    ORDER BY f.rank
+                    LIMIT ? OFFSET ?
+                """, (match, limit, offset))
+                return cursor.fetchall()
+        except Exception as e:
+            raise Exception(f"Failed to search articles: {e}")
+        finally:
+            conn.close()
+
     @classmethod
     def find_by_author(cls, author_id):
         """Find articles by author ID."""
@@ -79,14 +299,23 @@ class Article:
         try:
             with conn:
                 cursor = conn.cursor()
+                cursor.row_factory = cls._row_factory
                 cursor.execute("SELECT id, title, author_id, magazine_id FROM articles WHERE author_id = ?", (author_id,))
-                results = cursor.fetchall()
-                return [cls(title=row['title'], author_id=row['author_id'], magazine_id=row['magazine_id'], id=row['id']) for row in results]
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to find articles: {e}")
         finally:
             conn.close()
 
+    @classmethod
+    def iter_by_author(cls, author_id, chunk_size=DEFAULT_FETCH_SIZE):
+        """Lazily yield articles by author ID, fetching chunk_size rows at a time."""
+        try:
+            yield from stream_rows("SELECT id, title, author_id, magazine_id FROM articles WHERE author_id = ?",
+                                   (author_id,), chunk_size, row_factory=cls._row_factory)
+        except Exception as e:
+            raise Exception(f"Failed to find articles: {e}")
+
     @classmethod
     def find_by_magazine(cls, magazine_id):
         """Find articles by magazine ID."""
@@ -94,31 +323,99 @@ class Article:
         try:
             with conn:
                 cursor = conn.cursor()
+                cursor.row_factory = cls._row_factory
                 cursor.execute("SELECT id, title, author_id, magazine_id FROM articles WHERE magazine_id = ?", (magazine_id,))
-                results = cursor.fetchall()
-                return [cls(title=row['title'], author_id=row['author_id'], magazine_id=row['magazine_id'], id=row['id']) for row in results]
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to find articles: {e}")
         finally:
             conn.close()
 
     @classmethod
-    def most_prolific_author(cls):
-        """Find the author who has written the most articles."""
+    def iter_by_magazine(cls, magazine_id, chunk_size=DEFAULT_FETCH_SIZE):
+        """Lazily yield articles by magazine ID, fetching chunk_size rows at a time."""
+        try:
+            yield from stream_rows("SELECT id, title, author_id, magazine_id FROM articles WHERE magazine_id = ?",
+                                   (magazine_id,), chunk_size, row_factory=cls._row_factory)
+        except Exception as e:
+            raise Exception(f"Failed to find articles: {e}")
+
+    @classmethod
+    def most_prolific_author(cls, use_counters=False, cached=True):
+        """Find the author who has written the most articles.
+
+        With use_counters=True this is an index lookup on author_stats.
+        Results are served from the result cache until the database changes.
+        """
+        from lib.models.author import Author
+        compute = lambda: cls._most_prolific_rows(use_counters)
+        rows = result_cache.get(('most_prolific_author', use_counters), compute) if cached else compute()
+        return Author._from_db(*rows[0]) if rows else None
+
+    @classmethod
+    def _most_prolific_rows(cls, use_counters):
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT a.* FROM authors a
-                    JOIN articles ar ON a.id = ar.author_id
-                    GROUP BY a.id, a.name
-                    ORDER BY COUNT(*) DESC
-                    LIMIT 1
-                """)
+                if use_counters:
+                    cursor.execute("""
+                        SELECT a.id, a.name FROM author_stats s
+                        JOIN authors a ON a.id = s.author_id
+                        WHERE s.article_count > 0
+                        ORDER BY s.article_count DESC, s.author_id
+                        LIMIT 1
+                    """)
+                else:
+                    cursor.execute("""
+                        SELECT a.id, a.name FROM authors a
+                        JOIN articles ar ON a.id = ar.author_id
+                        GROUP BY ar.author_id
+                        ORDER BY COUNT(*) DESC
+                        LIMIT 1
+                    """)
                 result = cursor.fetchone()
-                return Author(name=result['name'], id=result['id']) if result else None
+                return [result] if result else []
         except Exception as e:
             raise Exception(f"Failed to fetch most prolific author: {e}")
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    @classmethod
+    async def abulk_save(cls, *args, **kwargs):
+        """Async variant of bulk_save(), run on the database executor."""
+        return await run_sync(cls.bulk_save, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_id(cls, *args, **kwargs):
+        """Async variant of find_by_id(), run on the database executor."""
+        return await run_sync(cls.find_by_id, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_title(cls, *args, **kwargs):
+        """Async variant of find_by_title(), run on the database executor."""
+        return await run_sync(cls.find_by_title, *args, **kwargs)
+
+    @classmethod
+    async def asearch(cls, *args, **kwargs):
+        """Async variant of search(), run on the database executor."""
+        return await run_sync(cls.search, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_author(cls, *args, **kwargs):
+        """Async variant of find_by_author(), run on the database executor."""
+        return await run_sync(cls.find_by_author, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_magazine(cls, *args, **kwargs):
+        """Async variant of find_by_magazine(), run on the database executor."""
+        return await run_sync(cls.find_by_magazine, *args, **kwargs)
+
+    @classmethod
+    async def amost_prolific_author(cls, *args, **kwargs):
+        """Async variant of most_prolific_author(), run on the database executor."""
+        return await run_sync(cls.most_prolific_author, *args, **kwargs)
+
+    async def asave(self, *args, **kwargs):
+        """Async variant of save(), run on the database executor."""
+        return await run_sync(self.save, *args, **kwargs)
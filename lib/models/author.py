@@ -1,11 +1,29 @@
+from lib.db.aio import run_sync
+from lib.db.batch import (DEFAULT_BATCH_SIZE, IN_CLAUSE_LIMIT, chunked, delete_where, insert_many, placeholders,
+                          upsert_models)
+from lib.db.cache import entity_cache
 from lib.db.connection import get_connection
-from lib.models.article import Article
-from lib.models.magazine import Magazine
+from lib.db.deadline import cancellable, wait_for
+from lib.db.instrumentation import instrumented
+from lib.db.session import dirty_columns, update_statement
+from lib.db.writer import completed, flush_write_behind, settle, write_behind
 
+@instrumented
+@cancellable
 class Author:
+    __slots__ = ('id', '_name', '_prefetched', '_loaded', '_pending')
+
+    TABLE = 'authors'
+    COLUMNS = ('name',)
+
+    PREFETCHABLE = ('articles', 'magazines', 'topic_areas')
+
     def __init__(self, name, id=None):
         self.id = id
         self.name = name
+        self._prefetched = {}
+        self._loaded = None
+        self._pending = None
 
     @property
     def name(self):
@@ -17,39 +35,198 @@ class Author:
             raise ValueError("Author name must be a non-empty string")
         self._name = value.strip()
 
-    def save(self):
-        """Save or update the author in the database with transaction."""
+    @classmethod
+    def _from_db(cls, id, name):
+        """Build an author from a trusted database row, skipping validation."""
+        author = object.__new__(cls)
+        author.id = id
+        author._name = name
+        author._prefetched = {}
+        author._loaded = (name,)
+        author._pending = None
+        return author
+
+    @classmethod
+    def _row_factory(cls, cursor, row):
+        """sqlite3 row factory building authors straight from (id, name) tuples."""
+        return cls._from_db(*row)
+
+    def _values(self):
+        """Column values in COLUMNS order."""
+        return (self._name,)
+
+    def save(self, wait=True):
+        """Save or update the author in the database with transaction.
+
+        Saving an unchanged author is a no-op, and updates only write the
+        columns changed since it was loaded or last saved. With write-behind
+        enabled the write is queued for the background writer and committed
+        with other pending writes; save() blocks until that happens, or its
+        timeout/cancel runs out, unless wait=False, which returns a future
+        for the id. A new instance whose
+        queued insert has not committed yet waits for it first, so saving it
+        again updates the row instead of inserting a second one.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None and self.id is None:
+            settle(pending)
+        values = self._values()
+        if self.id is None:
+            sql, params = "INSERT INTO authors (name) VALUES (?)", values
+        else:
+            columns = dirty_columns(self)
+            if not columns:
+                return None if wait else completed(self.id)
+            sql, params = update_statement(self, columns)
+        writer = write_behind()
+        if writer is not None:
+            future = writer.submit(sql, params, id=self.id, error="Failed to save author",
+                                   on_commit=lambda id: self._committed(id, values))
+            if self.id is None:
+                self._pending = future
+            if not wait:
+                return future
+            wait_for(future)
+            return None
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+                id = cursor.lastrowid if self.id is None else self.id
+            self._committed(id, values)
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Failed to save author: {e}")
+        finally:
+            conn.close()
+        return None if wait else completed(self.id)
+
+    def _committed(self, id, values):
+        """Record a committed save: its id, the saved values, and drop stale cache entries."""
+        self.id = id
+        self._loaded = values
+        entity_cache.invalidate('authors', id)
+        entity_cache.discard('authors', 'name', self.name)
+
+    def delete(self):
+        """Delete the author; their articles are deleted with them (ON DELETE CASCADE).
+
+        Returns True if a row was deleted. The instance keeps its values but
+        loses its id, so a later save() inserts it again.
+        """
+        if self.id is None:
+            return False
+        deleted = delete_where('authors', "id = ?", (self.id,), batch_size=None, cascade=('articles',))
+        self.id = None
+        self._loaded = None
+        self._prefetched.clear()
+        return deleted == 1
+
+    @classmethod
+    def delete_without_articles(cls, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """Delete every author who has no articles, batch_size rows per transaction.
+
+        progress, when given, is called with the running total after each
+        batch. Returns the number of authors deleted.
+        """
+        return delete_where('authors', "NOT EXISTS (SELECT 1 FROM articles WHERE articles.author_id = authors.id)",
+                            batch_size=batch_size, progress=progress)
+
+    @classmethod
+    def bulk_save(cls, authors, batch_size=DEFAULT_BATCH_SIZE):
+        """Insert new authors and update existing ones in a single transaction.
+
+        Rows are written with executemany in chunks of batch_size, and the
+        generated ids are back-filled on the new instances.
+        """
+        authors = list(authors)
+        cls._bulk_write([author for author in authors if author.id is None],
+                        [author for author in authors if author.id is not None], batch_size)
+        return authors
+
+    @classmethod
+    def bulk_update(cls, authors, batch_size=DEFAULT_BATCH_SIZE):
+        """Update already-saved authors in a single transaction with executemany."""
+        authors = list(authors)
+        if any(author.id is None for author in authors):
+            raise ValueError("bulk_update requires saved authors; use bulk_save for new ones")
+        cls._bulk_write([], authors, batch_size)
+        return authors
+
+    @classmethod
+    def _bulk_write(cls, new, existing, batch_size):
+        flush_write_behind()
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
-                if self.id is None:
-                    cursor.execute(
+                for chunk in chunked(new, batch_size):
+                    ids = insert_many(
+                        cursor,
                         "INSERT INTO authors (name) VALUES (?)",
-                        (self.name,)
+                        [(author.name,) for author in chunk]
                     )
-                    self.id = cursor.lastrowid
-                else:
-                    cursor.execute(
+                    for author, id in zip(chunk, ids):
+                        author.id = id
+                for chunk in chunked(existing, batch_size):
+                    cursor.executemany(
                         "UPDATE authors SET name = ? WHERE id = ?",
-                        (self.name, self.id)
+                        [(author.name, author.id) for author in chunk]
                     )
+            for author in new + existing:
+                author._committed(author.id, author._values())
         except Exception as e:
             conn.rollback()
-            raise Exception(f"Failed to save author: {e}")
+            for author in new:
+                author.id = None
+            raise Exception(f"Failed to bulk save authors: {e}")
         finally:
             conn.close()
 
+    @classmethod
+    def upsert(cls, name):
+        """Insert an author, or return the stored one with this name, in one statement.
+
+        Needs the unique key on authors.name (lib.db.keys.enable_unique_keys()).
+        """
+        return upsert_models([cls(name)], 'name', error="Failed to upsert author")[0]
+
+    @classmethod
+    def find_or_create(cls, name):
+        """Return the author with this name, creating it first if needed, in one statement."""
+        return upsert_models([cls(name)], 'name', update=False, error="Failed to find or create author")[0]
+
+    @classmethod
+    def bulk_upsert(cls, authors, batch_size=DEFAULT_BATCH_SIZE):
+        """upsert() for a list of authors: one statement per batch_size rows, in a single transaction.
+
+        Each instance gets the id of its stored row.
+        """
+        return upsert_models(authors, 'name', batch_size=batch_size, error="Failed to bulk upsert authors")
+
+    @classmethod
+    def bulk_find_or_create(cls, authors, batch_size=DEFAULT_BATCH_SIZE):
+        """find_or_create() for a list of authors, one statement per batch_size rows."""
+        return upsert_models(authors, 'name', update=False, batch_size=batch_size,
+                             error="Failed to bulk find or create authors")
+
     @classmethod
     def find_by_id(cls, id):
         """Find an author by ID."""
+        cached = entity_cache.lookup('authors', 'id', id)
+        if cached is not None:
+            return cls._from_db(*cached)
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, name FROM authors WHERE id = ?", (id,))
                 result = cursor.fetchone()
-                return cls(name=result['name'], id=result['id']) if result else None
+                if result is None:
+                    return None
+                entity_cache.store('authors', 'id', id, tuple(result))
+                return cls._from_db(*result)
         except Exception as e:
             raise Exception(f"Failed to find author: {e}")
         finally:
@@ -58,35 +235,104 @@ class Author:
     @classmethod
     def find_by_name(cls, name):
         """Find an author by name."""
+        cached = entity_cache.lookup('authors', 'name', name)
+        if cached is not None:
+            return cls._from_db(*cached)
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, name FROM authors WHERE name = ?", (name,))
                 result = cursor.fetchone()
-                return cls(name=result['name'], id=result['id']) if result else None
+                if result is None:
+                    return None
+                entity_cache.store('authors', 'name', name, tuple(result))
+                return cls._from_db(*result)
         except Exception as e:
             raise Exception(f"Failed to find author: {e}")
         finally:
             conn.close()
 
+    @classmethod
+    def prefetch(cls, authors, relations):
+        """Load relationships for a batch of authors with one query per relationship.
+
+        relations is a list of names from PREFETCHABLE; afterwards the matching
+        instance methods return the loaded rows without querying.
+        """
+        from lib.models.article import Article
+        from lib.models.magazine import Magazine
+        unknown = set(relations) - set(cls.PREFETCHABLE)
+        if unknown:
+            raise ValueError(f"Cannot prefetch {', '.join(sorted(unknown))} on Author")
+        by_id = {a.id: a for a in authors if a.id is not None}
+        # Instances sharing an id share the loaded lists, so all of them are served.
+        for relation in relations:
+            loaded = {id: [] for id in by_id}
+            for author in authors:
+                if author.id is not None:
+                    author._prefetched[relation] = loaded[author.id]
+        if not by_id:
+            return authors
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                for ids in chunked(list(by_id), IN_CLAUSE_LIMIT):
+                    if 'articles' in relations:
+                        cursor.execute(f"""
+                            SELECT id, title, author_id, magazine_id FROM articles
+                            WHERE author_id IN ({placeholders(ids)})
+                        """, ids)
+                        for row in cursor.fetchall():
+                            by_id[row['author_id']]._prefetched['articles'].append(
+                                Article._from_db(row['id'], row['title'], row['author_id'], row['magazine_id']))
+                    if 'magazines' in relations:
+                        cursor.execute(f"""
+                            SELECT DISTINCT a.author_id, m.id, m.name, m.category FROM magazines m
+                            JOIN articles a ON m.id = a.magazine_id
+                            WHERE a.author_id IN ({placeholders(ids)})
+                        """, ids)
+                        for row in cursor.fetchall():
+                            by_id[row['author_id']]._prefetched['magazines'].append(
+                                Magazine._from_db(row['id'], row['name'], row['category']))
+                    if 'topic_areas' in relations:
+                        cursor.execute(f"""
+                            SELECT DISTINCT a.author_id, m.category FROM magazines m
+                            JOIN articles a ON m.id = a.magazine_id
+                            WHERE a.author_id IN ({placeholders(ids)})
+                        """, ids)
+                        for row in cursor.fetchall():
+                            by_id[row['author_id']]._prefetched['topic_areas'].append(row['category'])
+            return authors
+        except Exception as e:
+            raise Exception(f"Failed to prefetch author relationships: {e}")
+        finally:
+            conn.close()
+
     def articles(self):
         """Get all articles written by this author."""
+        from lib.models.article import Article
+        if 'articles' in self._prefetched:
+            return list(self._prefetched['articles'])
         return Article.find_by_author(self.id)
 
     def magazines(self):
         """Find all magazines this author has contributed to."""
+        from lib.models.magazine import Magazine
+        if 'magazines' in self._prefetched:
+            return list(self._prefetched['magazines'])
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
+                cursor.row_factory = Magazine._row_factory
                 cursor.execute("""
-                    SELECT DISTINCT m.* FROM magazines m
+                    SELECT DISTINCT m.id, m.name, m.category FROM magazines m
                     JOIN articles a ON m.id = a.magazine_id
                     WHERE a.author_id = ?
                 """, (self.id,))
-                results = cursor.fetchall()
-                return [Magazine(name=row['name'], category=row['category'], id=row['id']) for row in results]
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to fetch magazines: {e}")
         finally:
@@ -94,19 +340,21 @@ class Author:
 
     def add_article(self, magazine, title):
         """Creates and inserts a new article for this author and magazine."""
-        conn = get_connection()
+        from lib.models.article import Article
+        self._prefetched.clear()
+        # article.save() runs its own transaction; holding a second pooled
+        # connection here could exhaust the pool.
         try:
-            with conn:
-                article = Article(title=title, author_id=self.id, magazine_id=magazine.id)
-                article.save()
-                return article
+            article = Article(title=title, author_id=self.id, magazine_id=magazine.id)
+            article.save()
+            return article
         except Exception as e:
             raise Exception(f"Failed to add article: {e}")
-        finally:
-            conn.close()
 
     def topic_areas(self):
         """Returns unique categories of magazines this author has contributed to."""
+        if 'topic_areas' in self._prefetched:
+            return list(self._prefetched['topic_areas'])
         conn = get_connection()
         try:
             with conn:
@@ -135,15 +383,54 @@ class Author:
                     (author_name,)
                 )
                 author_id = cursor.lastrowid
-                for article in articles_data:
-                    cursor.execute(
-                        "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)",
-                        (article['title'], author_id, article['magazine_id'])
-                    )
+                cursor.executemany(
+                    "INSERT INTO articles (title, author_id, magazine_id) VALUES (?, ?, ?)",
+                    [(article['title'], author_id, article['magazine_id']) for article in articles_data]
+                )
                 return True
         except Exception as e:
             conn.rollback()
             print(f"Transaction failed: {e}")
             return False
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    @classmethod
+    async def abulk_save(cls, *args, **kwargs):
+        """Async variant of bulk_save(), run on the database executor."""
+        return await run_sync(cls.bulk_save, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_id(cls, *args, **kwargs):
+        """Async variant of find_by_id(), run on the database executor."""
+        return await run_sync(cls.find_by_id, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_name(cls, *args, **kwargs):
+        """Async variant of find_by_name(), run on the database executor."""
+        return await run_sync(cls.find_by_name, *args, **kwargs)
+
+    @classmethod
+    async def aprefetch(cls, *args, **kwargs):
+        """Async variant of prefetch(), run on the database executor."""
+        return await run_sync(cls.prefetch, *args, **kwargs)
+
+    async def asave(self, *args, **kwargs):
+        """Async variant of save(), run on the database executor."""
+        return await run_sync(self.save, *args, **kwargs)
+
+    async def aarticles(self, *args, **kwargs):
+        """Async variant of articles(), run on the database executor."""
+        return await run_sync(self.articles, *args, **kwargs)
+
+    async def amagazines(self, *args, **kwargs):
+        """Async variant of magazines(), run on the database executor."""
+        return await run_sync(self.magazines, *args, **kwargs)
+
+    async def aadd_article(self, *args, **kwargs):
+        """Async variant of add_article(), run on the database executor."""
+        return await run_sync(self.add_article, *args, **kwargs)
+
+    async def atopic_areas(self, *args, **kwargs):
+        """Async variant of topic_areas(), run on the database executor."""
+        return await run_sync(self.topic_areas, *args, **kwargs)
@@ -1,13 +1,31 @@
 import sqlite3
+from lib.db.aio import run_sync
+from lib.db.batch import (DEFAULT_BATCH_SIZE, DEFAULT_FETCH_SIZE, IN_CLAUSE_LIMIT, chunked, delete_where,
+                          insert_many, placeholders, stream_rows, upsert_models)
+from lib.db.cache import entity_cache, result_cache
 from lib.db.connection import get_connection
-from lib.models.article import Article
-from lib.models.author import Author
+from lib.db.deadline import cancellable, wait_for
+from lib.db.instrumentation import instrumented
+from lib.db.session import dirty_columns, update_statement
+from lib.db.writer import completed, flush_write_behind, settle, write_behind
 
+@instrumented
+@cancellable
 class Magazine:
+    __slots__ = ('id', '_name', '_category', '_prefetched', '_loaded', '_pending')
+
+    TABLE = 'magazines'
+    COLUMNS = ('name', 'category')
+
+    PREFETCHABLE = ('articles', 'contributors')
+
     def __init__(self, name, category, id=None):
         self.id = id
         self.name = name
         self.category = category
+        self._prefetched = {}
+        self._loaded = None
+        self._pending = None
 
     @property
     def name(self):
@@ -29,31 +47,190 @@ class Magazine:
             raise ValueError("Category must be a non-empty string")
         self._category = value.strip()
 
-    def save(self):
-        """Save or update the magazine in the database with transaction."""
+    @classmethod
+    def _from_db(cls, id, name, category):
+        """Build a magazine from a trusted database row, skipping validation."""
+        magazine = object.__new__(cls)
+        magazine.id = id
+        magazine._name = name
+        magazine._category = category
+        magazine._prefetched = {}
+        magazine._loaded = (name, category)
+        magazine._pending = None
+        return magazine
+
+    @classmethod
+    def _row_factory(cls, cursor, row):
+        """sqlite3 row factory building magazines straight from (id, name, category) tuples."""
+        return cls._from_db(*row)
+
+    def _values(self):
+        """Column values in COLUMNS order."""
+        return (self._name, self._category)
+
+    def save(self, wait=True):
+        """Save or update the magazine in the database with transaction.
+
+        Saving an unchanged magazine is a no-op, and updates only write the
+        columns changed since it was loaded or last saved. With write-behind
+        enabled the write is queued for the background writer and committed
+        with other pending writes; save() blocks until that happens, or its
+        timeout/cancel runs out, unless wait=False, which returns a future
+        for the id. A new instance whose
+        queued insert has not committed yet waits for it first, so saving it
+        again updates the row instead of inserting a second one.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None and self.id is None:
+            settle(pending)
+        values = self._values()
+        if self.id is None:
+            sql, params = "INSERT INTO magazines (name, category) VALUES (?, ?)", values
+        else:
+            columns = dirty_columns(self)
+            if not columns:
+                return None if wait else completed(self.id)
+            sql, params = update_statement(self, columns)
+        writer = write_behind()
+        if writer is not None:
+            future = writer.submit(sql, params, id=self.id, error="Failed to save magazine",
+                                   on_commit=lambda id: self._committed(id, values))
+            if self.id is None:
+                self._pending = future
+            if not wait:
+                return future
+            wait_for(future)
+            return None
         conn = get_connection()
         try:
             with conn:
                 cursor = conn.cursor()
-                if self.id is None:
-                    cursor.execute(
+                cursor.execute(sql, params)
+                id = cursor.lastrowid if self.id is None else self.id
+            self._committed(id, values)
+        except Exception as e:
+            raise Exception(f"Failed to save magazine: {e}")
+        finally:
+            conn.close()
+        return None if wait else completed(self.id)
+
+    def _committed(self, id, values):
+        """Record a committed save: its id, the saved values, and drop stale cache entries."""
+        self.id = id
+        self._loaded = values
+        entity_cache.invalidate('magazines', id)
+        entity_cache.discard('magazines', 'name', self.name)
+
+    def delete(self):
+        """Delete the magazine; its articles are deleted with it (ON DELETE CASCADE).
+
+        Returns True if a row was deleted. The instance keeps its values but
+        loses its id, so a later save() inserts it again.
+        """
+        if self.id is None:
+            return False
+        deleted = delete_where('magazines', "id = ?", (self.id,), batch_size=None, cascade=('articles',))
+        self.id = None
+        self._loaded = None
+        self._prefetched.clear()
+        return deleted == 1
+
+    @classmethod
+    def delete_without_articles(cls, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """Delete every magazine that has no articles, batch_size rows per transaction.
+
+        progress, when given, is called with the running total after each
+        batch. Returns the number of magazines deleted.
+        """
+        return delete_where('magazines',
+                            "NOT EXISTS (SELECT 1 FROM articles WHERE articles.magazine_id = magazines.id)",
+                            batch_size=batch_size, progress=progress)
+
+    @classmethod
+    def bulk_save(cls, magazines, batch_size=DEFAULT_BATCH_SIZE):
+        """Insert new magazines and update existing ones in a single transaction.
+
+        Rows are written with executemany in chunks of batch_size, and the
+        generated ids are back-filled on the new instances.
+        """
+        magazines = list(magazines)
+        cls._bulk_write([magazine for magazine in magazines if magazine.id is None],
+                        [magazine for magazine in magazines if magazine.id is not None], batch_size)
+        return magazines
+
+    @classmethod
+    def bulk_update(cls, magazines, batch_size=DEFAULT_BATCH_SIZE):
+        """Update already-saved magazines in a single transaction with executemany."""
+        magazines = list(magazines)
+        if any(magazine.id is None for magazine in magazines):
+            raise ValueError("bulk_update requires saved magazines; use bulk_save for new ones")
+        cls._bulk_write([], magazines, batch_size)
+        return magazines
+
+    @classmethod
+    def _bulk_write(cls, new, existing, batch_size):
+        flush_write_behind()
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                for chunk in chunked(new, batch_size):
+                    ids = insert_many(
+                        cursor,
                         "INSERT INTO magazines (name, category) VALUES (?, ?)",
-                        (self.name, self.category)
+                        [(magazine.name, magazine.category) for magazine in chunk]
                     )
-                    self.id = cursor.lastrowid
-                else:
-                    cursor.execute(
+                    for magazine, id in zip(chunk, ids):
+                        magazine.id = id
+                for chunk in chunked(existing, batch_size):
+                    cursor.executemany(
                         "UPDATE magazines SET name = ?, category = ? WHERE id = ?",
-                        (self.name, self.category, self.id)
+                        [(magazine.name, magazine.category, magazine.id) for magazine in chunk]
                     )
+            for magazine in new + existing:
+                magazine._committed(magazine.id, magazine._values())
         except Exception as e:
-            raise Exception(f"Failed to save magazine: {e}")
+            conn.rollback()
+            for magazine in new:
+                magazine.id = None
+            raise Exception(f"Failed to bulk save magazines: {e}")
         finally:
             conn.close()
 
+    @classmethod
+    def upsert(cls, name, category):
+        """Insert a magazine, or update the category of the one with this name, in one statement.
+
+        Needs the unique key on magazines.name (lib.db.keys.enable_unique_keys()).
+        """
+        return upsert_models([cls(name, category)], 'name', error="Failed to upsert magazine")[0]
+
+    @classmethod
+    def find_or_create(cls, name, category):
+        """Return the magazine with this name as stored, creating it with `category` if needed."""
+        return upsert_models([cls(name, category)], 'name', update=False,
+                             error="Failed to find or create magazine")[0]
+
+    @classmethod
+    def bulk_upsert(cls, magazines, batch_size=DEFAULT_BATCH_SIZE):
+        """upsert() for a list of magazines: one statement per batch_size rows, in a single transaction.
+
+        Each instance gets the id of its stored row.
+        """
+        return upsert_models(magazines, 'name', batch_size=batch_size, error="Failed to bulk upsert magazines")
+
+    @classmethod
+    def bulk_find_or_create(cls, magazines, batch_size=DEFAULT_BATCH_SIZE):
+        """find_or_create() for a list of magazines; instances take the stored category of existing ones."""
+        return upsert_models(magazines, 'name', update=False, batch_size=batch_size,
+                             error="Failed to bulk find or create magazines")
+
     @classmethod
     def find_by_id(cls, id):
         """Find a magazine by ID."""
+        cached = entity_cache.lookup('magazines', 'id', id)
+        if cached is not None:
+            return cls._from_db(*cached)
         conn = get_connection()
         conn.row_factory = sqlite3.Row  # Enable dictionary-like row access
         try:
@@ -61,7 +238,10 @@ class Magazine:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, name, category FROM magazines WHERE id = ?", (id,))
                 result = cursor.fetchone()
-                return cls(name=result['name'], category=result['category'], id=result['id']) if result else None
+                if result is None:
+                    return None
+                entity_cache.store('magazines', 'id', id, tuple(result))
+                return cls._from_db(*result)
         except Exception as e:
             raise Exception(f"Failed to find magazine: {e}")
         finally:
@@ -70,6 +250,9 @@ class Magazine:
     @classmethod
     def find_by_name(cls, name):
         """Find a magazine by name."""
+        cached = entity_cache.lookup('magazines', 'name', name)
+        if cached is not None:
+            return cls._from_db(*cached)
         conn = get_connection()
         conn.row_factory = sqlite3.Row
         try:
@@ -77,46 +260,118 @@ class Magazine:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, name, category FROM magazines WHERE name = ?", (name,))
                 result = cursor.fetchone()
-                return cls(name=result['name'], category=result['category'], id=result['id']) if result else None
+                if result is None:
+                    return None
+                entity_cache.store('magazines', 'name', name, tuple(result))
+                return cls._from_db(*result)
         except Exception as e:
             raise Exception(f"Failed to find magazine: {e}")
         finally:
             conn.close()
 
     @classmethod
-    def find_by_category(cls, category):
-        """Find magazines by category."""
+    def find_by_category(cls, category, prefetch=None):
+        """Find magazines by category, optionally prefetching relationships."""
         conn = get_connection()
         conn.row_factory = sqlite3.Row
         try:
             with conn:
                 cursor = conn.cursor()
+                cursor.row_factory = cls._row_factory
                 cursor.execute("SELECT id, name, category FROM magazines WHERE category = ?", (category,))
-                results = cursor.fetchall()
-                return [cls(name=row['name'], category=row['category'], id=row['id']) for row in results]
+                magazines = cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to find magazines: {e}")
         finally:
             conn.close()
+        if prefetch:
+            cls.prefetch(magazines, prefetch)
+        return magazines
+
+    @classmethod
+    def iter_by_category(cls, category, chunk_size=DEFAULT_FETCH_SIZE):
+        """Lazily yield magazines by category, fetching chunk_size rows at a time."""
+        try:
+            yield from stream_rows("SELECT id, name, category FROM magazines WHERE category = ?",
+                                   (category,), chunk_size, row_factory=cls._row_factory)
+        except Exception as e:
+            raise Exception(f"Failed to find magazines: {e}")
+
+    @classmethod
+    def prefetch(cls, magazines, relations):
+        """Load relationships for a batch of magazines with one query per relationship.
+
+        relations is a list of names from PREFETCHABLE; afterwards the matching
+        instance methods return the loaded rows without querying.
+        """
+        from lib.models.article import Article
+        from lib.models.author import Author
+        unknown = set(relations) - set(cls.PREFETCHABLE)
+        if unknown:
+            raise ValueError(f"Cannot prefetch {', '.join(sorted(unknown))} on Magazine")
+        by_id = {m.id: m for m in magazines if m.id is not None}
+        # Instances sharing an id share the loaded lists, so all of them are served.
+        for relation in relations:
+            loaded = {id: [] for id in by_id}
+            for magazine in magazines:
+                if magazine.id is not None:
+                    magazine._prefetched[relation] = loaded[magazine.id]
+        if not by_id:
+            return magazines
+        conn = get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                for ids in chunked(list(by_id), IN_CLAUSE_LIMIT):
+                    if 'articles' in relations:
+                        cursor.execute(f"""
+                            SELECT id, title, author_id, magazine_id FROM articles
+                            WHERE magazine_id IN ({placeholders(ids)})
+                        """, ids)
+                        for row in cursor.fetchall():
+                            by_id[row['magazine_id']]._prefetched['articles'].append(
+                                Article._from_db(row['id'], row['title'], row['author_id'], row['magazine_id']))
+                    if 'contributors' in relations:
+                        # CROSS JOIN keeps articles as the outer loop, so the
+                        # magazine_id index drives the join on small tables too.
+                        cursor.execute(f"""
+                            SELECT DISTINCT ar.magazine_id, a.id, a.name FROM articles ar
+                            CROSS JOIN authors a ON a.id = ar.author_id
+                            WHERE ar.magazine_id IN ({placeholders(ids)})
+                        """, ids)
+                        for row in cursor.fetchall():
+                            by_id[row['magazine_id']]._prefetched['contributors'].append(
+                                Author._from_db(row['id'], row['name']))
+            return magazines
+        except Exception as e:
+            raise Exception(f"Failed to prefetch magazine relationships: {e}")
+        finally:
+            conn.close()
 
     def articles(self):
         """Returns list of all articles published in this magazine."""
+        from lib.models.article import Article
+        if 'articles' in self._prefetched:
+            return list(self._prefetched['articles'])
         return Article.find_by_magazine(self.id)
 
     def contributors(self):
         """Returns unique list of authors who have written for this magazine."""
+        from lib.models.author import Author
+        if 'contributors' in self._prefetched:
+            return list(self._prefetched['contributors'])
         conn = get_connection()
         conn.row_factory = sqlite3.Row
         try:
             with conn:
                 cursor = conn.cursor()
+                cursor.row_factory = Author._row_factory
                 cursor.execute("""
-                    SELECT DISTINCT a.* FROM authors a
+                    SELECT DISTINCT a.id, a.name FROM authors a
                     JOIN articles ar ON a.id = ar.author_id
                     WHERE ar.magazine_id = ?
                 """, (self.id,))
-                results = cursor.fetchall()
-                return [Author(name=row['name'], id=row['id']) for row in results]
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to fetch contributors: {e}")
         finally:
@@ -124,6 +379,8 @@ class Magazine:
 
     def article_titles(self):
         """Returns list of titles of all articles in this magazine."""
+        if 'articles' in self._prefetched:
+            return [article.title for article in self._prefetched['articles']]
         conn = get_connection()
         conn.row_factory = sqlite3.Row
         try:
@@ -139,85 +396,214 @@ class Magazine:
 
     def contributing_authors(self):
         """Returns list of authors with more than 2 articles in this magazine."""
+        from lib.models.author import Author
         conn = get_connection()
         conn.row_factory = sqlite3.Row
         try:
             with conn:
                 cursor = conn.cursor()
+                cursor.row_factory = Author._row_factory
                 cursor.execute("""
-                    SELECT a.* FROM authors a
+                    SELECT a.id, a.name FROM authors a
                     JOIN articles ar ON a.id = ar.author_id
                     WHERE ar.magazine_id = ?
-                    GROUP BY a.id, a.name
+                    GROUP BY ar.author_id
                     HAVING COUNT(*) > 2
                 """, (self.id,))
-                results = cursor.fetchall()
-                return [Author(name=row['name'], id=row['id']) for row in results]
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to fetch contributing authors: {e}")
         finally:
             conn.close()
 
     @classmethod
-    def magazines_with_multiple_authors(cls):
-        """Find magazines with articles by at least 2 different authors."""
+    def magazines_with_multiple_authors(cls, use_counters=False, cached=True):
+        """Find magazines with articles by at least 2 different authors.
+
+        With use_counters=True the trigger-maintained magazine_stats table is
+        read instead of aggregating the articles table. Results are served
+        from the result cache until the database changes; pass cached=False
+        to always query.
+        """
+        compute = lambda: cls._multiple_author_rows(use_counters)
+        rows = result_cache.get(('magazines_with_multiple_authors', use_counters), compute) if cached else compute()
+        return [cls._from_db(*row) for row in rows]
+
+    @classmethod
+    def _multiple_author_rows(cls, use_counters):
         conn = get_connection()
-        conn.row_factory = sqlite3.Row
         try:
             with conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT m.* FROM magazines m
-                    JOIN articles a ON m.id = a.magazine_id
-                    GROUP BY m.id, m.name, m.category
-                    HAVING COUNT(DISTINCT a.author_id) >= 2
-                """)
-                results = cursor.fetchall()
-                return [cls(name=row['name'], category=row['category'], id=row['id']) for row in results]
+                if use_counters:
+                    cursor.execute("""
+                        SELECT m.id, m.name, m.category FROM magazine_stats s
+                        JOIN magazines m ON m.id = s.magazine_id
+                        WHERE s.author_count >= 2
+                    """)
+                else:
+                    cursor.execute("""
+                        SELECT m.id, m.name, m.category FROM magazines m
+                        JOIN articles a ON m.id = a.magazine_id
+                        GROUP BY m.id
+                        HAVING COUNT(DISTINCT a.author_id) >= 2
+                    """)
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to fetch magazines: {e}")
         finally:
             conn.close()
 
     @classmethod
-    def article_counts(cls):
-        """Count the number of articles in each magazine."""
+    def article_counts(cls, use_counters=False, cached=True):
+        """Count the number of articles in each magazine.
+
+        With use_counters=True the counts come from the magazine_stats table.
+        Results are served from the result cache until the database changes.
+        """
+        compute = lambda: cls._article_count_rows(use_counters)
+        rows = result_cache.get(('article_counts', use_counters), compute) if cached else compute()
+        return [(cls._from_db(id, name, category), count) for id, name, category, count in rows]
+
+    @classmethod
+    def _article_count_rows(cls, use_counters):
         conn = get_connection()
-        conn.row_factory = sqlite3.Row
         try:
             with conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT m.id, m.name, m.category, COUNT(a.id) as article_count
-                    FROM magazines m
-                    LEFT JOIN articles a ON m.id = a.magazine_id
-                    GROUP BY m.id, m.name, m.category
-                """)
-                results = cursor.fetchall()
-                return [(cls(name=row['name'], category=row['category'], id=row['id']), row['article_count']) for row in results]
+                if use_counters:
+                    cursor.execute("""
+                        SELECT m.id, m.name, m.category, COALESCE(s.article_count, 0) as article_count
+                        FROM magazines m
+                        LEFT JOIN magazine_stats s ON m.id = s.magazine_id
+                    """)
+                else:
+                    cursor.execute("""
+                        SELECT m.id, m.name, m.category, COUNT(a.id) as article_count
+                        FROM magazines m
+                        LEFT JOIN articles a ON m.id = a.magazine_id
+                        GROUP BY m.id
+                    """)
+                return cursor.fetchall()
         except Exception as e:
             raise Exception(f"Failed to fetch article counts: {e}")
         finally:
             conn.close()
 
     @classmethod
-    def top_publisher(cls):
-        """Find the magazine with the most articles (bonus challenge)."""
+    def iter_article_counts(cls, chunk_size=DEFAULT_FETCH_SIZE):
+        """Lazily yield (magazine, article count) pairs, fetching chunk_size rows at a time."""
+        try:
+            for row in stream_rows("""
+                SELECT m.id, m.name, m.category, COUNT(a.id) as article_count
+                FROM magazines m
+                LEFT JOIN articles a ON m.id = a.magazine_id
+                GROUP BY m.id
+            """, (), chunk_size):
+                yield cls._from_db(row['id'], row['name'], row['category']), row['article_count']
+        except Exception as e:
+            raise Exception(f"Failed to fetch article counts: {e}")
+
+    @classmethod
+    def top_publisher(cls, use_counters=False, cached=True):
+        """Find the magazine with the most articles (bonus challenge).
+
+        With use_counters=True this is an index lookup on magazine_stats.
+        Results are served from the result cache until the database changes.
+        """
+        compute = lambda: cls._top_publisher_rows(use_counters)
+        rows = result_cache.get(('top_publisher', use_counters), compute) if cached else compute()
+        return cls._from_db(*rows[0]) if rows else None
+
+    @classmethod
+    def _top_publisher_rows(cls, use_counters):
         conn = get_connection()
-        conn.row_factory = sqlite3.Row
         try:
             with conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT m.* FROM magazines m
-                    LEFT JOIN articles a ON m.id = a.magazine_id
-                    GROUP BY m.id, m.name, m.category
-                    ORDER BY COUNT(a.id) DESC
-                    LIMIT 1
-                """)
-                result = cursor.fetchone()
-                return cls(name=result['name'], category=result['category'], id=result['id']) if result else None
+                if use_counters:
+                    cursor.execute("""
+                        SELECT m.id, m.name, m.category FROM magazine_stats s
+                        JOIN magazines m ON m.id = s.magazine_id
+                        ORDER BY s.article_count DESC, s.magazine_id
+                        LIMIT 1
+                    """)
+                    result = cursor.fetchone()
+                    if result is None:
+                        # No articles at all: every magazine ties at zero.
+                        cursor.execute("SELECT id, name, category FROM magazines ORDER BY id LIMIT 1")
+                        result = cursor.fetchone()
+                else:
+                    cursor.execute("""
+                        SELECT m.id, m.name, m.category FROM magazines m
+                        LEFT JOIN articles a ON m.id = a.magazine_id
+                        GROUP BY m.id
+                        ORDER BY COUNT(a.id) DESC
+                        LIMIT 1
+                    """)
+                    result = cursor.fetchone()
+                return [result] if result else []
         except Exception as e:
             raise Exception(f"Failed to fetch top publisher: {e}")
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    @classmethod
+    async def abulk_save(cls, *args, **kwargs):
+        """Async variant of bulk_save(), run on the database executor."""
+        return await run_sync(cls.bulk_save, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_id(cls, *args, **kwargs):
+        """Async variant of find_by_id(), run on the database executor."""
+        return await run_sync(cls.find_by_id, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_name(cls, *args, **kwargs):
+        """Async variant of find_by_name(), run on the database executor."""
+        return await run_sync(cls.find_by_name, *args, **kwargs)
+
+    @classmethod
+    async def afind_by_category(cls, *args, **kwargs):
+        """Async variant of find_by_category(), run on the database executor."""
+        return await run_sync(cls.find_by_category, *args, **kwargs)
+
+    @classmethod
+    async def aprefetch(cls, *args, **kwargs):
+        """Async variant of prefetch(), run on the database executor."""
+        return await run_sync(cls.prefetch, *args, **kwargs)
+
+    @classmethod
+    async def amagazines_with_multiple_authors(cls, *args, **kwargs):
+        """Async variant of magazines_with_multiple_authors(), run on the database executor."""
+        return await run_sync(cls.magazines_with_multiple_authors, *args, **kwargs)
+
+    @classmethod
+    async def aarticle_counts(cls, *args, **kwargs):
+        """Async variant of article_counts(), run on the database executor."""
+        return await run_sync(cls.article_counts, *args, **kwargs)
+
+    @classmethod
+    async def atop_publisher(cls, *args, **kwargs):
+        """Async variant of top_publisher(), run on the database executor."""
+        return await run_sync(cls.top_publisher, *args, **kwargs)
+
+    async def asave(self, *args, **kwargs):
+        """Async variant of save(), run on the database executor."""
+        return await run_sync(self.save, *args, **kwargs)
+
+    async def aarticles(self, *args, **kwargs):
+        """Async variant of articles(), run on the database executor."""
+        return await run_sync(self.articles, *args, **kwargs)
+
+    async def acontributors(self, *args, **kwargs):
+        """Async variant of contributors(), run on the database executor."""
+        return await run_sync(self.contributors, *args, **kwargs)
+
+    async def aarticle_titles(self, *args, **kwargs):
+        """Async variant of article_titles(), run on the database executor."""
+        return await run_sync(self.article_titles, *args, **kwargs)
+
+    async def acontributing_authors(self, *args, **kwargs):
+        """Async variant of contributing_authors(), run on the database executor."""
+        return await run_sync(self.contributing_authors, *args, **kwargs)
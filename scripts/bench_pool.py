@@ -0,0 +1,28 @@
+import sys
+import time
+from lib.db.connection import configure_pool, close_pool
+from lib.models.author import Author
+
+def time_find_by_id(iterations):
+    """Time a loop of Author.find_by_id lookups and return seconds per call."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        Author.find_by_id(1 + i % 3)
+    return (time.perf_counter() - start) / iterations
+
+def bench_pool(iterations=5000):
+    """Compare find_by_id latency with and without the connection pool."""
+    results = {}
+    for label, size in (("no pool", 0), ("pooled", 5)):
+        configure_pool(size=size)
+        Author.find_by_id(1)  # warm up
+        results[label] = time_find_by_id(iterations)
+    close_pool()
+
+    for label, seconds in results.items():
+        print(f"{label:>8}: {seconds * 1e6:8.1f} us/call")
+    print(f"speedup: {results['no pool'] / results['pooled']:.1f}x")
+    return results
+
+if __name__ == "__main__":
+    bench_pool(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
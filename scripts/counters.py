@@ -0,0 +1,23 @@
+import sys
+from lib.db.counters import rebuild_counters, verify_counters
+
+def main(argv):
+    """Rebuild or verify the trigger-maintained counter tables."""
+    command = argv[1] if len(argv) > 1 else "verify"
+    if command == "rebuild":
+        rebuild_counters()
+        return 0
+    if command == "verify":
+        drift = verify_counters()
+        if not drift:
+            print("Counters are in sync.")
+            return 0
+        for table, mismatches in drift.items():
+            print(f"{table}: {mismatches} rows out of sync")
+        print("Run `python -m scripts.counters rebuild` to fix them.")
+        return 1
+    print("Usage: python -m scripts.counters [verify|rebuild]")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
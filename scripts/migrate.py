@@ -0,0 +1,26 @@
+import sys
+from lib.db.connection import get_connection
+from lib.db.migrate import load_migrations, migrate, schema_version
+
+def main(argv):
+    """Show the schema version or apply pending migrations."""
+    command = argv[1] if len(argv) > 1 else "up"
+    if command == "status":
+        conn = get_connection()
+        try:
+            current = schema_version(conn)
+        finally:
+            conn.close()
+        for version, name, _ in load_migrations():
+            print(f"[{'x' if version <= current else ' '}] {name}")
+        return 0
+    if command == "up":
+        target = int(argv[2]) if len(argv) > 2 else None
+        if not migrate(target):
+            print("Schema is up to date.")
+        return 0
+    print("Usage: python -m scripts.migrate [status|up [VERSION]]")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,88 @@
+import argparse
+import difflib
+import os
+import sys
+import tempfile
+from lib.db import connection
+from lib.db.cache import entity_cache, result_cache
+from lib.db.connection import MemoryDatabase, use_memory_database
+from lib.db.datagen import generate_dataset
+from lib.db.plans import capture_plans, format_plans, plan_problems
+from scripts.run_queries import CASES, BenchContext
+
+# The reviewed plans that tests/test_query_plans.py compares against.
+PLANS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'query_plans.txt')
+
+# Dataset the plans are captured on: large enough that the planner's
+# statistics favour the indexes a production-sized database would use.
+PLAN_SCALE = '10k'
+PLAN_SEED = 42
+
+# Whole-table reports and purges, which read every row by design.
+FULL_SCAN_METHODS = (
+    'Article.most_prolific_author',
+    'Author.delete_without_articles',
+    'Magazine.article_counts',
+    'Magazine.delete_without_articles',
+    'Magazine.iter_article_counts',
+    'Magazine.magazines_with_multiple_authors',
+    'Magazine.top_publisher',
+)
+
+
+def capture_case_plans(db_path, scale=PLAN_SCALE, seed=PLAN_SEED):
+    """Generate the plan dataset at db_path and return the plans of every benchmark case.
+
+    Each case runs once, with the caches off so every call reaches SQLite,
+    against an in-memory copy of the dataset.
+    """
+    sizes = generate_dataset(db_path, articles=scale, seed=seed)
+    previous_memory = connection.memory_database()
+    previous_cache = (entity_cache.maxsize, result_cache.maxsize)
+    memory = MemoryDatabase(db_path)
+    use_memory_database(memory)
+    entity_cache.maxsize = result_cache.maxsize = 0
+    try:
+        ctx = BenchContext(sizes, seed)
+        return capture_plans(setup(ctx) for setup in CASES.values())
+    finally:
+        use_memory_database(previous_memory)
+        entity_cache.maxsize, result_cache.maxsize = previous_cache
+        result_cache.clear()
+        memory.close()
+
+
+def diff_plans(expected, actual):
+    """Unified diff from the reviewed plans to the captured ones; empty when they match."""
+    return "".join(difflib.unified_diff(expected.splitlines(True), actual.splitlines(True),
+                                        'tests/query_plans.txt', 'captured plans'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the EXPLAIN QUERY PLAN of every model query.")
+    parser.add_argument('--update', action='store_true', help="rewrite tests/query_plans.txt with the captured plans")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plans = capture_case_plans(os.path.join(tmp, 'plans.db'))
+    actual = format_plans(plans)
+    problems = plan_problems(plans, FULL_SCAN_METHODS)
+    for problem in problems:
+        print(f"Problem: {problem}")
+    if args.update:
+        with open(PLANS_FILE, 'w') as f:
+            f.write(actual)
+        print(f"Plans written to {os.path.normpath(PLANS_FILE)}")
+        return 1 if problems else 0
+    with open(PLANS_FILE) as f:
+        diff = diff_plans(f.read(), actual)
+    if diff:
+        print(diff)
+        print("Query plans changed; review the diff and run `python -m scripts.query_plans --update`.")
+        return 1
+    print("Query plans match." if not problems else "Query plans match, but have problems.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
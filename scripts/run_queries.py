@@ -0,0 +1,381 @@
+import argparse
+import inspect
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from lib.db import connection
+from lib.db.cache import entity_cache, result_cache
+from lib.db.datagen import CATEGORIES, WORDS, generate_dataset, parse_scale
+from lib.db.keys import enable_unique_keys, unique_keys_enabled
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+MODELS = (Author, Magazine, Article)
+
+
+def _author(ctx):
+    return Author._from_db(ctx.author_id(), "Author")
+
+
+def _magazine(ctx):
+    return Magazine._from_db(ctx.magazine_id(), "Magazine", "Technology")
+
+
+def _new_articles(ctx, n):
+    return [Article(title=ctx.name("Bench Article"), author_id=ctx.author_id(),
+                    magazine_id=ctx.magazine_id()) for _ in range(n)]
+
+
+def _saved(model):
+    model.save()
+    return model
+
+
+def _magazine_with_articles(ctx, n):
+    magazine = _saved(Magazine(name=ctx.name("Bench Magazine"), category=ctx.category()))
+    Article.bulk_save([Article(title=ctx.name("Bench Article"), author_id=ctx.author_id(), magazine_id=magazine.id)
+                       for _ in range(n)])
+    return magazine
+
+
+def _author_with_articles(ctx, n):
+    author = _saved(Author(name=ctx.name("Bench Author")))
+    Article.bulk_save([Article(title=ctx.name("Bench Article"), author_id=author.id, magazine_id=ctx.magazine_id())
+                       for _ in range(n)])
+    return author
+
+
+def _existing_and_new_authors(ctx, n):
+    return ([Author(name=f"Author {id}") for id in ctx.author_ids(n)]
+            + [Author(name=ctx.name("Bench Author")) for _ in range(n)])
+
+
+def _existing_and_new_magazines(ctx, n):
+    return ([Magazine(name=f"Magazine {id}", category=ctx.category()) for id in ctx.magazine_ids(n)]
+            + [Magazine(name=ctx.name("Bench Magazine"), category=ctx.category()) for _ in range(n)])
+
+
+def _existing_and_new_articles(ctx, n):
+    existing = [Article.find_by_id(id) for id in ctx.article_ids(n)]
+    return ([Article(title=article.title, author_id=ctx.author_id(), magazine_id=ctx.magazine_id())
+             for article in existing] + _new_articles(ctx, n))
+
+
+# Each case maps a method name to a setup function. Setup runs untimed and
+# returns the zero-argument call that is timed.
+CASES = {
+    'Author.find_by_id': lambda ctx: (lambda id=ctx.author_id(): Author.find_by_id(id)),
+    'Author.find_by_name': lambda ctx: (lambda name=f"Author {ctx.author_id()}": Author.find_by_name(name)),
+    'Author.articles': lambda ctx: _author(ctx).articles,
+    'Author.magazines': lambda ctx: _author(ctx).magazines,
+    'Author.topic_areas': lambda ctx: _author(ctx).topic_areas,
+    'Author.prefetch': lambda ctx: (lambda authors=[_author(ctx) for _ in range(50)]:
+                                    Author.prefetch(authors, Author.PREFETCHABLE)),
+    'Author.save': lambda ctx: Author(name=ctx.name("Bench Author")).save,
+    'Author.bulk_save': lambda ctx: (lambda authors=[Author(name=ctx.name("Bench Author")) for _ in range(100)]:
+                                     Author.bulk_save(authors)),
+    'Author.bulk_update': lambda ctx: (lambda authors=[Author._from_db(id, f"Author {id}")
+                                                       for id in ctx.author_ids(100)]:
+                                       Author.bulk_update(authors)),
+    'Author.delete': lambda ctx: _saved(Author(name=ctx.name("Bench Author"))).delete,
+    'Author.upsert': lambda ctx: (lambda name=f"Author {ctx.author_id()}": Author.upsert(name)),
+    'Author.find_or_create': lambda ctx: (lambda name=f"Author {ctx.author_id()}": Author.find_or_create(name)),
+    'Author.bulk_upsert': lambda ctx: (lambda authors=_existing_and_new_authors(ctx, 50): Author.bulk_upsert(authors)),
+    'Author.bulk_find_or_create': lambda ctx: (lambda authors=_existing_and_new_authors(ctx, 50):
+                                               Author.bulk_find_or_create(authors)),
+    'Author.add_article': lambda ctx: (lambda author=_author(ctx), magazine=_magazine(ctx):
+                                       author.add_article(magazine, ctx.name("Bench Added Article"))),
+    'Author.add_author_with_articles': lambda ctx: (lambda mid=ctx.magazine_id(): Author.add_author_with_articles(
+        ctx.name("Bench Author"), [{'title': ctx.name("Bench Article"), 'magazine_id': mid} for _ in range(10)])),
+
+    'Magazine.find_by_id': lambda ctx: (lambda id=ctx.magazine_id(): Magazine.find_by_id(id)),
+    'Magazine.find_by_name': lambda ctx: (lambda name=f"Magazine {ctx.magazine_id()}": Magazine.find_by_name(name)),
+    'Magazine.find_by_category': lambda ctx: (lambda c=ctx.category(): Magazine.find_by_category(c)),
+    'Magazine.iter_by_category': lambda ctx: (lambda c=ctx.category(): list(Magazine.iter_by_category(c))),
+    'Magazine.articles': lambda ctx: _magazine(ctx).articles,
+    'Magazine.contributors': lambda ctx: _magazine(ctx).contributors,
+    'Magazine.article_titles': lambda ctx: _magazine(ctx).article_titles,
+    'Magazine.contributing_authors': lambda ctx: _magazine(ctx).contributing_authors,
+    'Magazine.prefetch': lambda ctx: (lambda magazines=[_magazine(ctx) for _ in range(20)]:
+                                      Magazine.prefetch(magazines, Magazine.PREFETCHABLE)),
+    'Magazine.magazines_with_multiple_authors': lambda ctx: Magazine.magazines_with_multiple_authors,
+    'Magazine.magazines_with_multiple_authors[counters]': lambda ctx: (
+        lambda: Magazine.magazines_with_multiple_authors(use_counters=True)),
+    'Magazine.article_counts': lambda ctx: Magazine.article_counts,
+    'Magazine.article_counts[counters]': lambda ctx: (lambda: Magazine.article_counts(use_counters=True)),
+    'Magazine.iter_article_counts': lambda ctx: (lambda: list(Magazine.iter_article_counts())),
+    'Magazine.top_publisher': lambda ctx: Magazine.top_publisher,
+    'Magazine.top_publisher[counters]': lambda ctx: (lambda: Magazine.top_publisher(use_counters=True)),
+    'Magazine.save': lambda ctx: Magazine(name=ctx.name("Bench Magazine"), category=ctx.category()).save,
+    'Magazine.bulk_save': lambda ctx: (lambda magazines=[Magazine(name=ctx.name("Bench Magazine"),
+                                                                  category=ctx.category()) for _ in range(100)]:
+                                       Magazine.bulk_save(magazines)),
+    'Magazine.bulk_update': lambda ctx: (lambda magazines=[Magazine._from_db(id, f"Magazine {id}", "News")
+                                                           for id in ctx.magazine_ids(100)]:
+                                         Magazine.bulk_update(magazines)),
+    'Magazine.upsert': lambda ctx: (lambda name=f"Magazine {ctx.magazine_id()}", c=ctx.category():
+                                    Magazine.upsert(name, c)),
+    'Magazine.find_or_create': lambda ctx: (lambda name=f"Magazine {ctx.magazine_id()}", c=ctx.category():
+                                            Magazine.find_or_create(name, c)),
+    'Magazine.bulk_upsert': lambda ctx: (lambda magazines=_existing_and_new_magazines(ctx, 50):
+                                         Magazine.bulk_upsert(magazines)),
+    'Magazine.bulk_find_or_create': lambda ctx: (lambda magazines=_existing_and_new_magazines(ctx, 50):
+                                                 Magazine.bulk_find_or_create(magazines)),
+    'Magazine.delete': lambda ctx: _magazine_with_articles(ctx, 10).delete,
+
+    'Article.find_by_id': lambda ctx: (lambda id=ctx.article_id(): Article.find_by_id(id)),
+    'Article.find_by_title': lambda ctx: (lambda title=Article.find_by_id(ctx.article_id()).title:
+                                          Article.find_by_title(title)),
+    'Article.find_by_author': lambda ctx: (lambda id=ctx.author_id(): Article.find_by_author(id)),
+    'Article.iter_by_author': lambda ctx: (lambda id=ctx.author_id(): list(Article.iter_by_author(id))),
+    'Article.find_by_magazine': lambda ctx: (lambda id=ctx.magazine_id(): Article.find_by_magazine(id)),
+    'Article.iter_by_magazine': lambda ctx: (lambda id=ctx.magazine_id(): list(Article.iter_by_magazine(id))),
+    'Article.search': lambda ctx: (lambda q=ctx.word(): Article.search(q)),
+    'Article.most_prolific_author': lambda ctx: Article.most_prolific_author,
+    'Article.most_prolific_author[counters]': lambda ctx: (lambda: Article.most_prolific_author(use_counters=True)),
+    'Article.save': lambda ctx: _new_articles(ctx, 1)[0].save,
+    'Article.bulk_save': lambda ctx: (lambda articles=_new_articles(ctx, 100): Article.bulk_save(articles)),
+    'Article.bulk_update': lambda ctx: (lambda articles=[Article._from_db(id, f"Bench Title {id}", ctx.author_id(),
+                                                                          ctx.magazine_id())
+                                                         for id in ctx.article_ids(100)]:
+                                        Article.bulk_update(articles)),
+    'Article.upsert': lambda ctx: (lambda title=Article.find_by_id(ctx.article_id()).title, aid=ctx.author_id(),
+                                   mid=ctx.magazine_id(): Article.upsert(title, aid, mid)),
+    'Article.find_or_create': lambda ctx: (lambda title=Article.find_by_id(ctx.article_id()).title, aid=ctx.author_id(),
+                                           mid=ctx.magazine_id(): Article.find_or_create(title, aid, mid)),
+    'Article.bulk_upsert': lambda ctx: (lambda articles=_existing_and_new_articles(ctx, 50):
+                                        Article.bulk_upsert(articles)),
+    'Article.bulk_find_or_create': lambda ctx: (lambda articles=_existing_and_new_articles(ctx, 50):
+                                                Article.bulk_find_or_create(articles)),
+    'Article.delete': lambda ctx: _saved(_new_articles(ctx, 1)[0]).delete,
+    'Article.delete_by_author': lambda ctx: (lambda author=_author_with_articles(ctx, 100):
+                                             Article.delete_by_author(author.id)),
+    'Article.delete_by_magazine': lambda ctx: (lambda magazine=_magazine_with_articles(ctx, 100):
+                                               Article.delete_by_magazine(magazine.id)),
+
+    # These delete every childless author or magazine, including generated
+    # ones that earlier cases pick by id, so they run last.
+    'Author.delete_without_articles': lambda ctx: (
+        lambda authors=Author.bulk_save([Author(name=ctx.name("Bench Author")) for _ in range(100)]):
+        Author.delete_without_articles()),
+    'Magazine.delete_without_articles': lambda ctx: (
+        lambda magazines=Magazine.bulk_save([Magazine(name=ctx.name("Bench Magazine"), category=ctx.category())
+                                             for _ in range(100)]): Magazine.delete_without_articles()),
+}
+
+
+class BenchContext:
+    """Deterministic source of ids and arguments for the benchmark cases."""
+
+    def __init__(self, sizes, seed):
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self._names = itertools.count(1)
+
+    def author_id(self):
+        return self.rng.randint(1, self.sizes['authors'])
+
+    def magazine_id(self):
+        return self.rng.randint(1, self.sizes['magazines'])
+
+    def article_id(self):
+        return self.rng.randint(1, self.sizes['articles'])
+
+    def author_ids(self, n):
+        return [self.author_id() for _ in range(n)]
+
+    def magazine_ids(self, n):
+        return [self.magazine_id() for _ in range(n)]
+
+    def article_ids(self, n):
+        return [self.article_id() for _ in range(n)]
+
+    def name(self, prefix):
+        """A name no earlier call returned, so writes never clash on the unique keys."""
+        return f"{prefix} {next(self._names)}"
+
+    def category(self):
+        return self.rng.choice(CATEGORIES)
+
+    def word(self):
+        return self.rng.choice(WORDS)
+
+
+def uncovered_methods():
+    """Public model methods that have no benchmark case."""
+    names = []
+    for model in MODELS:
+        for name, member in vars(model).items():
+            func = getattr(member, '__func__', member)
+            if name.startswith('_') or not callable(func) or inspect.iscoroutinefunction(func):
+                continue
+            if f"{model.__name__}.{name}" not in CASES:
+                names.append(f"{model.__name__}.{name}")
+    return names
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def count_rows(result):
+    if result is None or isinstance(result, bool):
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def run_case(setup, ctx, iterations, warmup):
+    """Time `iterations` calls of a case and summarize the latencies."""
+    timings, rows = [], 0
+    for i in range(warmup + iterations):
+        call = setup(ctx)
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            timings.append(elapsed)
+            rows += count_rows(result)
+    timings.sort()
+    total = sum(timings)
+    return {
+        'calls': iterations,
+        'mean_ms': total / iterations * 1e3,
+        'p50_ms': percentile(timings, 50) * 1e3,
+        'p95_ms': percentile(timings, 95) * 1e3,
+        'p99_ms': percentile(timings, 99) * 1e3,
+        'rows': rows,
+        'rows_per_sec': rows / total if total else 0.0,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(db_path, scale='10k', iterations=50, warmup=3, seed=42, reuse=False,
+                   only=None, use_cache=False, skew=1.1):
+    """Generate (or reuse) a dataset, time every case, and return the report dict."""
+    articles = parse_scale(scale)
+    if reuse and os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        sizes = dict(zip(('authors', 'magazines', 'articles'), conn.execute(
+            "SELECT (SELECT MAX(id) FROM authors), (SELECT MAX(id) FROM magazines), (SELECT MAX(id) FROM articles)"
+        ).fetchone()))
+        if not all(unique_keys_enabled(conn).values()):
+            enable_unique_keys(conn=conn)
+        conn.close()
+    else:
+        start = time.perf_counter()
+        sizes = generate_dataset(db_path, articles=articles, skew=skew, seed=seed)
+        print(f"Generated {sizes['articles']} articles in {time.perf_counter() - start:.1f}s")
+
+    previous_db, previous_memory = connection.DATABASE, connection.memory_database()
+    previous_cache = (entity_cache.maxsize, result_cache.maxsize)
+    connection.configure_database(db_path)
+    entity_cache.clear()
+    result_cache.clear()
+    if not use_cache:
+        entity_cache.maxsize = result_cache.maxsize = 0
+    try:
+        ctx = BenchContext(sizes, seed)
+        results = {}
+        for name, setup in CASES.items():
+            if only and only not in name:
+                continue
+            results[name] = run_case(setup, ctx, iterations, warmup)
+            r = results[name]
+            print(f"{name:<52} p50 {r['p50_ms']:9.3f} ms  p95 {r['p95_ms']:9.3f} ms  "
+                  f"p99 {r['p99_ms']:9.3f} ms  {r['rows_per_sec']:12.0f} rows/s")
+    finally:
+        connection.configure_database(previous_db)
+        connection.use_memory_database(previous_memory)
+        entity_cache.maxsize, result_cache.maxsize = previous_cache
+        entity_cache.clear()
+        result_cache.clear()
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'scale': scale,
+            'dataset': sizes,
+            'iterations': iterations,
+            'seed': seed,
+            'entity_cache': use_cache,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current, threshold=1.2):
+    """Print p50/p95 ratios against a baseline report; return the regressed cases."""
+    regressions = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if not old or not old['p50_ms']:
+            continue
+        ratio = new['p50_ms'] / old['p50_ms']
+        flag = "REGRESSION" if ratio > threshold else ""
+        print(f"{name:<52} p50 {old['p50_ms']:9.3f} -> {new['p50_ms']:9.3f} ms  x{ratio:5.2f}  {flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every public model method.")
+    parser.add_argument('--scale', default='10k', help="10k, 100k, 1m, 10m or a number of articles")
+    parser.add_argument('--db', default='bench.db', help="database file to generate and benchmark")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skew', type=float, default=1.1, help="Zipf skew of authors and magazines")
+    parser.add_argument('--reuse', action='store_true', help="reuse an existing --db instead of regenerating it")
+    parser.add_argument('--only', help="run only cases whose name contains this text")
+    parser.add_argument('--cache', action='store_true', help="leave the entity and result caches enabled")
+    parser.add_argument('--output', default='bench_report.json', help="where to write the JSON report")
+    parser.add_argument('--compare', help="baseline report to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2, help="p50 ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    missing = uncovered_methods()
+    if missing:
+        print(f"Warning: no benchmark case for {', '.join(missing)}")
+
+    report = run_benchmarks(args.db, scale=args.scale, iterations=args.iterations, warmup=args.warmup,
+                            seed=args.seed, reuse=args.reuse, only=args.only, use_cache=args.cache,
+                            skew=args.skew)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare_reports(baseline, report, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,34 @@
+import sqlite3
+from lib.db import connection
 from lib.db.connection import get_connection
+from lib.db.counters import rebuild_counters
+from lib.db.migrate import migrate
+from lib.db.search import rebuild_search_index
 from lib.db.seed import seed_database
 
+def check_wal_mode():
+    """Verify that WAL journal mode is persisted on the database file."""
+    conn = sqlite3.connect(connection.DATABASE)  # plain connection, no profile applied
+    try:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    finally:
+        conn.close()
+    if mode.lower() != 'wal':
+        raise RuntimeError(f"Expected WAL journal mode, database is in {mode!r} mode")
+    print("WAL mode persisted!")
+    return mode
+
 def setup_database():
-    """Set up the test database by creating tables and seeding data."""
+    """Set up the test database by migrating the schema and seeding data."""
     conn = get_connection()
     try:
-        with conn:
-            cursor = conn.cursor()
-            with open('lib/db/schema.sql', 'r') as f:
-                schema = f.read()
-            cursor.executescript(schema)
+        migrate(conn=conn)
         print("Database schema created!")
         seed_database()
+        rebuild_counters()
+        rebuild_search_index()
+        conn.execute("ANALYZE")
+        check_wal_mode()
     except Exception as e:
         conn.rollback()
         print(f"Setup failed: {e}")
@@ -19,4 +36,4 @@ def setup_database():
         conn.close()
 
 if __name__ == "__main__":
-    setup_database()
\ No newline at end of file
+    setup_database()
@@ -0,0 +1,36 @@
+import argparse
+import sys
+from lib.db.transfer import EXPORTS, FIELDS, export_table, import_file
+
+def main(argv=None):
+    """Import or export authors, magazines and articles as CSV or JSONL."""
+    parser = argparse.ArgumentParser(description="Stream data in and out of the database.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('import', help="load a CSV/JSONL file into a table")
+    load.add_argument('table', choices=sorted(FIELDS))
+    load.add_argument('path')
+    load.add_argument('--format', choices=['csv', 'jsonl'])
+    load.add_argument('--batch-size', type=int, default=10_000)
+    load.add_argument('--commit-every', type=int, default=200_000)
+    load.add_argument('--no-defer', action='store_true', help="keep indexes and triggers during the load")
+    load.add_argument('--create-missing', action='store_true', help="insert unknown author/magazine names")
+
+    dump = commands.add_parser('export', help="write a table or query result to a CSV/JSONL file")
+    dump.add_argument('source', choices=sorted(FIELDS) + sorted(EXPORTS))
+    dump.add_argument('path')
+    dump.add_argument('--format', choices=['csv', 'jsonl'])
+
+    args = parser.parse_args(argv)
+    if args.command == 'import':
+        import_file(args.table, args.path, fmt=args.format, batch_size=args.batch_size,
+                    commit_every=args.commit_every, defer_indexes=not args.no_defer,
+                    create_missing=args.create_missing)
+    elif args.source in EXPORTS:
+        EXPORTS[args.source](args.path, fmt=args.format)
+    else:
+        export_table(args.source, args.path, fmt=args.format)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import sys
+from lib.db.keys import UNIQUE_KEYS, disable_unique_keys, duplicate_keys, enable_unique_keys, unique_keys_enabled
+
+def main(argv):
+    """Enable, disable or report the opt-in unique keys used by upsert() and find_or_create()."""
+    command = argv[1] if len(argv) > 1 else "status"
+    if command == "status":
+        for table, enabled in unique_keys_enabled().items():
+            print(f"{table}.{UNIQUE_KEYS[table]}: {'unique' if enabled else 'not unique'}")
+        return 0
+    if command == "enable":
+        duplicates = duplicate_keys()
+        if duplicates:
+            for table, count in duplicates.items():
+                print(f"{table}: {count} {UNIQUE_KEYS[table]} values are used by more than one row")
+            print("Remove the duplicates before enabling unique keys.")
+            return 1
+        enable_unique_keys()
+        print("Unique keys enabled!")
+        return 0
+    if command == "disable":
+        disable_unique_keys()
+        print("Unique keys disabled!")
+        return 0
+    print("Usage: python -m scripts.unique_keys [status|enable|disable]")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
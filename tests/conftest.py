@@ -0,0 +1,38 @@
+import pytest
+from lib.db import connection
+from lib.db.cache import result_cache
+from lib.db.connection import MemoryDatabase, configure_database, use_memory_database
+from lib.db.migrate import migrate
+from lib.db.seed import seed_database
+
+@pytest.fixture(scope='session')
+def template_database():
+    """Migrated and seeded in-memory database that every test starts from."""
+    template = MemoryDatabase()
+    use_memory_database(template)
+    migrate()
+    seed_database()
+    yield template
+    use_memory_database(None)
+    template.close()
+
+@pytest.fixture(autouse=True)
+def database(template_database):
+    """Give each test its own in-memory clone of the template database."""
+    clone = template_database.clone()
+    use_memory_database(clone)
+    result_cache.clear()
+    yield clone
+    use_memory_database(None)
+    clone.close()
+
+@pytest.fixture
+def on_disk(database, tmp_path):
+    """Run a test against an on-disk copy of its database, in WAL mode like setup_db leaves it."""
+    previous = connection.DATABASE
+    path = str(tmp_path / "code_challenge.db")
+    database.write_back(path)
+    configure_database(path)
+    connection.get_connection().close()  # the profile switches the file to WAL
+    yield path
+    configure_database(previous)
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from lib.db.deadline import CancellationToken, QueryCancelled, QueryTimeout
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def test_async_finders():
+    """Test that async finders return the same rows as the sync ones."""
+    async def run():
+        author = await Author.afind_by_name("John Doe")
+        articles = await author.aarticles()
+        magazine = await Magazine.afind_by_name("Tech Weekly")
+        contributors = await magazine.acontributors()
+        return author, articles, contributors
+
+    author, articles, contributors = asyncio.run(run())
+    assert author.name == "John Doe"
+    assert sorted(a.id for a in articles) == sorted(a.id for a in Article.find_by_author(author.id))
+    assert any(c.name == "John Doe" for c in contributors)
+
+def test_async_concurrent_calls():
+    """Test that many concurrent async calls complete and keep their order."""
+    async def run():
+        return await asyncio.gather(*(Author.afind_by_id(i) for i in (1, 2, 3) * 10))
+
+    authors = asyncio.run(run())
+    assert [a.id for a in authors] == [1, 2, 3] * 10
+
+def test_async_save():
+    """Test saving a model through the async API."""
+    async def run():
+        magazine = Magazine(name="Async Mag", category="Async")
+        await magazine.asave()
+        return magazine
+
+    magazine = asyncio.run(run())
+    assert magazine.id is not None
+    assert Magazine.find_by_id(magazine.id).name == "Async Mag"
+
+def test_async_variants_pass_options_through():
+    """Test that async variants accept the sync method's keyword options, including deadlines."""
+    token = CancellationToken()
+    token.cancel()
+
+    async def run():
+        magazines = await Magazine.amagazines_with_multiple_authors(cached=False, timeout=30)
+        with pytest.raises(QueryTimeout):
+            await Magazine.amagazines_with_multiple_authors(cached=False, timeout=0)
+        with pytest.raises(QueryCancelled):
+            await Article.amost_prolific_author(cancel=token)
+        return magazines
+
+    magazines = asyncio.run(run())
+    assert [m.id for m in magazines] == [m.id for m in Magazine.magazines_with_multiple_authors(cached=False)]
@@ -0,0 +1,30 @@
+from lib.controllers.analytics import AnalyticsSnapshot
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def test_snapshot_matches_sql_aggregates():
+    """Test that snapshot aggregates agree with the model queries."""
+    snapshot = AnalyticsSnapshot()
+    snapshot.refresh()
+    assert snapshot.article_counts() == {m.id: count for m, count in Magazine.article_counts(cached=False)}
+    assert snapshot.magazines_with_multiple_authors() == sorted(
+        m.id for m in Magazine.magazines_with_multiple_authors(cached=False))
+    author = Article.most_prolific_author(cached=False)
+    assert snapshot.topic_areas()[author.id] == sorted(author.topic_areas())
+    assert snapshot.top_authors(1)[0][1] == len(author.articles())
+    assert sum(snapshot.category_counts().values()) == len(snapshot)
+
+def test_snapshot_incremental_refresh():
+    """Test that refresh() only loads articles added since the last load."""
+    snapshot = AnalyticsSnapshot()
+    snapshot.refresh()
+    magazine = Magazine("Analytics Quarterly", "Science")
+    magazine.save()
+    author = Author("Analytics Author")
+    author.save()
+    Article("Analytics Article", author.id, magazine.id).save()
+    assert snapshot.refresh() == 1
+    assert snapshot.article_counts()[magazine.id] == 1
+    assert snapshot.author_article_counts()[author.id] == 1
+    assert snapshot.refresh() == 0
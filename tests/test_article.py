@@ -1,3 +1,7 @@
+import pytest
+from lib.db.connection import get_connection, get_pool
+from lib.db.counters import verify_counters
+from lib.db.keys import enable_unique_keys
 from lib.models.article import Article
 from lib.models.author import Author
 from lib.models.magazine import Magazine
@@ -30,4 +34,125 @@ def test_most_prolific_author():
     """Test finding the most prolific author."""
     author = Article.most_prolific_author()
     assert author is not None
-    assert isinstance(author, Author)
\ No newline at end of file
+    assert isinstance(author, Author)
+
+def test_article_bulk_save_backfills_ids():
+    """Test that bulk_save assigns the generated ids to every article."""
+    articles = [Article(title=f"Bulk Article {i}", author_id=1, magazine_id=1) for i in range(7)]
+    Article.bulk_save(articles, batch_size=3)
+    for i, article in enumerate(articles):
+        retrieved = Article.find_by_id(article.id)
+        assert retrieved.title == f"Bulk Article {i}"
+
+def test_article_bulk_update_requires_ids():
+    """Test that bulk_update rejects unsaved articles."""
+    with pytest.raises(ValueError):
+        Article.bulk_update([Article(title="Unsaved", author_id=1, magazine_id=1)])
+
+def test_article_iter_by_author():
+    """Test that the streaming iterator yields the same articles as the finder."""
+    streamed = list(Article.iter_by_author(1, chunk_size=1))
+    assert sorted(a.id for a in streamed) == sorted(a.id for a in Article.find_by_author(1))
+
+def test_article_iter_releases_connection_on_close():
+    """Test that closing a partially consumed iterator returns its connection."""
+    before = get_pool().stats()['checked_out']
+    articles = Article.iter_by_magazine(1, chunk_size=1)
+    first = next(articles)
+    assert first.magazine_id == 1
+    assert get_pool().stats()['checked_out'] == before + 1
+    articles.close()
+    assert get_pool().stats()['checked_out'] == before
+
+def test_counters_follow_article_writes():
+    """Test that the counter triggers track inserts, moves and deletes."""
+    article = Article(title="Counter Article", author_id=2, magazine_id=1)
+    article.save()
+    article.magazine_id = 3
+    article.save()
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute("DELETE FROM articles WHERE id = ?", (article.id,))
+    finally:
+        conn.close()
+    assert verify_counters() == {}
+
+def test_most_prolific_author_counters():
+    """Test that the counter variant agrees with the aggregation."""
+    prolific = Article.most_prolific_author(use_counters=True)
+    conn = get_connection()
+    try:
+        counts = dict(conn.execute("SELECT author_id, COUNT(*) FROM articles GROUP BY author_id").fetchall())
+    finally:
+        conn.close()
+    assert counts[prolific.id] == max(counts.values())
+
+def test_article_trusted_hydration():
+    """Test that finder results are slot-based instances built by the row factory."""
+    articles = Article.find_by_magazine(1)
+    assert articles
+    assert all(type(a) is Article and not hasattr(a, '__dict__') for a in articles)
+    assert Article._from_db(5, "Raw", 1, 2).title == "Raw"
+
+def test_article_search():
+    """Test ranked, prefix and paginated title search."""
+    article = Article(title="Quantum Zebrafish Migration", author_id=1, magazine_id=3)
+    article.save()
+    assert any(a.id == article.id for a in Article.search("zebrafish"))
+    assert any(a.id == article.id for a in Article.search("zebra quant"))
+    assert not any(a.id == article.id for a in Article.search("zebra", prefix=False))
+    first_page = Article.search("tech", limit=1)
+    second_page = Article.search("tech", limit=1, offset=1)
+    assert len(first_page) == 1 and len(second_page) == 1
+    assert first_page[0].id != second_page[0].id
+
+def test_article_search_follows_title_changes():
+    """Test that the search index tracks title updates."""
+    article = Article(title="Obsolete Heliograph Notes", author_id=2, magazine_id=2)
+    article.save()
+    article.title = "Modern Semaphore Notes"
+    article.save()
+    assert not any(a.id == article.id for a in Article.search("heliograph"))
+    assert any(a.id == article.id for a in Article.search("semaphore"))
+
+def test_article_search_ignores_fts_syntax():
+    """Test that FTS5 operators in user input are treated as plain words."""
+    assert isinstance(Article.search('NEAR(tech "AND* OR'), list)
+    assert Article.search("") == []
+
+def test_article_delete_by_magazine():
+    """Test deleting a magazine's articles in chunks, keeping the magazine."""
+    magazine = Magazine(name="Purge Weekly", category="News")
+    magazine.save()
+    Article.bulk_save([Article(title=f"Purge {i}", author_id=1, magazine_id=magazine.id) for i in range(5)])
+    cached = Article.find_by_title("Purge 0")
+    reports = []
+    assert Article.delete_by_magazine(magazine.id, batch_size=2, progress=reports.append) == 5
+    assert reports == [2, 4, 5]
+    assert Article.find_by_magazine(magazine.id) == []
+    assert Article.find_by_id(cached.id) is None
+    assert Magazine.find_by_id(magazine.id) is not None
+
+def test_article_delete():
+    """Test deleting a single article."""
+    article = Article(title="Short Lived", author_id=1, magazine_id=1)
+    article.save()
+    id = article.id
+    assert article.delete() is True
+    assert Article.find_by_id(id) is None
+    article.save()
+    assert article.id is not None and article.id != id
+
+def test_article_upsert_moves_existing_article():
+    """Test that an article upsert keeps the id, moves the article and keeps counters right."""
+    enable_unique_keys()
+    existing = Article.find_by_title("Tech Trends")
+    moved = Article.upsert("Tech Trends", 2, 2)
+    assert (moved.id, moved.author_id, moved.magazine_id) == (existing.id, 2, 2)
+    assert Article.find_by_id(existing.id).author_id == 2
+    same = Article.find_or_create("Tech Trends", 3, 3)
+    assert (same.id, same.author_id) == (existing.id, 2)
+    articles = Article.bulk_upsert([Article("Tech Trends", 1, 1), Article("Bulk Upserted", 3, 1)])
+    assert articles[0].id == existing.id and articles[1].id is not None
+    assert verify_counters() == {}
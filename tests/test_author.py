@@ -1,6 +1,9 @@
 from lib.models.author import Author
 from lib.models.magazine import Magazine
 from lib.db.connection import get_connection
+from lib.db.counters import verify_counters
+from lib.db.keys import enable_unique_keys
+from lib.models.article import Article
 
 def test_author_save():
     """Test saving an author."""
@@ -48,4 +51,74 @@ def test_author_topic_areas():
     author = Author.find_by_name("John Doe")
     topics = author.topic_areas()
     assert len(topics) >= 2
-    assert "Technology" in topics
\ No newline at end of file
+    assert "Technology" in topics
+
+def test_author_bulk_save():
+    """Test inserting and updating authors in bulk."""
+    authors = [Author(name=f"Bulk Author {i}") for i in range(5)]
+    Author.bulk_save(authors, batch_size=2)
+    assert all(a.id is not None for a in authors)
+    assert len({a.id for a in authors}) == 5
+    assert Author.find_by_id(authors[3].id).name == "Bulk Author 3"
+    for a in authors:
+        a.name = a.name + " Updated"
+    Author.bulk_update(authors)
+    assert Author.find_by_id(authors[3].id).name == "Bulk Author 3 Updated"
+
+def test_author_prefetch():
+    """Test that prefetched relationships match the per-author queries."""
+    authors = Author.prefetch([Author.find_by_name("John Doe"), Author.find_by_name("Jane Smith")],
+                              ["articles", "magazines", "topic_areas"])
+    for author in authors:
+        fresh = Author.find_by_id(author.id)
+        assert sorted(a.id for a in author.articles()) == sorted(a.id for a in fresh.articles())
+        assert sorted(m.id for m in author.magazines()) == sorted(m.id for m in fresh.magazines())
+        assert sorted(author.topic_areas()) == sorted(fresh.topic_areas())
+
+def test_author_delete_cascades_to_articles():
+    """Test that deleting an author deletes their articles and counters."""
+    author = Author.find_by_name("John Doe")
+    article_ids = [article.id for article in author.articles()]
+    assert article_ids and Article.find_by_id(article_ids[0]) is not None
+    assert author.delete() is True
+    assert author.id is None
+    assert Author.find_by_name("John Doe") is None
+    assert all(Article.find_by_id(id) is None for id in article_ids)
+    assert verify_counters() == {}
+    conn = get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM author_stats WHERE author_id NOT IN "
+                            "(SELECT id FROM authors)").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+def test_author_delete_without_articles():
+    """Test deleting authors with no articles in chunks with progress reports."""
+    Author.bulk_save([Author(name=f"Idle Author {i}") for i in range(7)])
+    busy = len(Author.find_by_name("John Doe").articles())
+    reports = []
+    assert Author.delete_without_articles(batch_size=3, progress=reports.append) == 7
+    assert reports == [3, 6, 7]
+    assert Author.find_by_name("Idle Author 0") is None
+    assert len(Author.find_by_name("John Doe").articles()) == busy
+
+def test_author_upsert_and_find_or_create():
+    """Test that upserts reuse the row with the same name."""
+    enable_unique_keys()
+    existing = Author.find_by_name("John Doe")
+    assert Author.upsert("John Doe").id == existing.id
+    created = Author.find_or_create("New Voice")
+    assert created.id is not None
+    assert Author.find_or_create("New Voice").id == created.id
+    authors = Author.bulk_upsert([Author(name="John Doe"), Author(name="Fresh Name"), Author(name="Fresh Name")])
+    assert authors[0].id == existing.id
+    assert authors[1].id == authors[2].id != existing.id
+    assert Author.find_by_name("Fresh Name").id == authors[1].id
+
+def test_author_prefetch_duplicate_instances():
+    """Test that every instance sharing an id gets the prefetched relationships."""
+    first, second = Author.find_by_id(1), Author._from_db(1, "John Doe")
+    Author.prefetch([first, second], ["articles", "topic_areas"])
+    assert set(first._prefetched) == set(second._prefetched) == {"articles", "topic_areas"}
+    assert sorted(a.id for a in second.articles()) == sorted(a.id for a in first.articles())
+    assert sorted(second.topic_areas()) == sorted(first.topic_areas())
@@ -0,0 +1,35 @@
+import sqlite3
+from lib.db.datagen import generate_dataset
+from scripts.run_queries import percentile, uncovered_methods
+
+def test_every_public_method_has_a_benchmark():
+    """Test that the benchmark suite covers every public model method."""
+    assert uncovered_methods() == []
+
+def test_dataset_is_deterministic(tmp_path):
+    """Test that the same seed produces the same rows."""
+    dumps = []
+    for name in ("a.db", "b.db"):
+        path = str(tmp_path / name)
+        sizes = generate_dataset(path, articles=500, seed=7)
+        conn = sqlite3.connect(path)
+        dumps.append(conn.execute("SELECT id, title, author_id, magazine_id FROM articles ORDER BY id").fetchall())
+        conn.close()
+    assert sizes == {'authors': 25, 'magazines': 3, 'articles': 500}
+    assert dumps[0] == dumps[1]
+
+def test_dataset_is_skewed(tmp_path):
+    """Test that a few authors write a large share of the articles."""
+    path = str(tmp_path / "skew.db")
+    generate_dataset(path, articles=2000, skew=1.2)
+    conn = sqlite3.connect(path)
+    counts = [n for (n,) in conn.execute("SELECT COUNT(*) FROM articles GROUP BY author_id ORDER BY 1 DESC")]
+    conn.close()
+    assert counts[0] > 10 * counts[-1]
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 95) == 3.0
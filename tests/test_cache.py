@@ -0,0 +1,76 @@
+import time
+from lib.db.cache import EntityCache, ResultCache, entity_cache, result_cache
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def test_cache_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = EntityCache(maxsize=2, ttl=None)
+    cache.store('authors', 'id', 1, (1, 'A'))
+    cache.store('authors', 'id', 2, (2, 'B'))
+    assert cache.lookup('authors', 'id', 1) == (1, 'A')
+    cache.store('authors', 'id', 3, (3, 'C'))
+    assert cache.lookup('authors', 'id', 2) is None
+    assert cache.lookup('authors', 'id', 1) == (1, 'A')
+    assert cache.stats()['evictions'] == 1
+
+def test_cache_ttl_expiry():
+    """Test that entries expire after the TTL."""
+    cache = EntityCache(maxsize=10, ttl=0.01)
+    cache.store('authors', 'id', 1, (1, 'A'))
+    time.sleep(0.02)
+    assert cache.lookup('authors', 'id', 1) is None
+
+def test_cache_invalidate_entity():
+    """Test that invalidating a row drops every lookup that resolved to it."""
+    cache = EntityCache(maxsize=10, ttl=None)
+    cache.store('authors', 'id', 1, (1, 'A'))
+    cache.store('authors', 'name', 'A', (1, 'A'))
+    cache.invalidate('authors', 1)
+    assert cache.stats()['size'] == 0
+
+def test_find_by_id_is_cached():
+    """Test that a repeated lookup is served from the cache."""
+    author = Author(name="Cached Author")
+    author.save()
+    Author.find_by_id(author.id)
+    hits = entity_cache.stats()['hits']
+    retrieved = Author.find_by_id(author.id)
+    assert retrieved.name == "Cached Author"
+    assert entity_cache.stats()['hits'] == hits + 1
+
+def test_save_invalidates_cache():
+    """Test that saving a row refreshes the cached lookups."""
+    magazine = Magazine(name="Before Rename", category="Test")
+    magazine.save()
+    assert Magazine.find_by_id(magazine.id).name == "Before Rename"
+    magazine.name = "After Rename"
+    magazine.save()
+    assert Magazine.find_by_id(magazine.id).name == "After Rename"
+    assert Magazine.find_by_name("After Rename").name == "After Rename"
+
+def test_result_cache_serves_until_write():
+    """Test that cached aggregates are reused until another write commits."""
+    result_cache.clear()
+    first = Magazine.article_counts()
+    assert [count for _, count in Magazine.article_counts()] == [count for _, count in first]
+    assert result_cache.stats()['hits'] == 1
+    magazine = first[0][0]
+    author = Author("Result Cache Author")
+    author.save()
+    Article(title="Result Cache Article", author_id=author.id, magazine_id=magazine.id).save()
+    counts = dict((m.id, count) for m, count in Magazine.article_counts())
+    assert counts[magazine.id] == first[0][1] + 1
+    assert result_cache.stats()['invalidations'] == 1
+
+def test_result_cache_row_bound():
+    """Test that entries are evicted to stay within the row budget."""
+    cache = ResultCache(maxsize=10, max_rows=3)
+    cache.get('a', lambda: [(1,), (2,)])
+    cache.get('b', lambda: [(3,), (4,)])
+    assert cache.stats()['size'] == 1
+    assert cache.stats()['rows'] == 2
+    assert cache.get('c', lambda: [(1,), (2,), (3,), (4,)]) == [(1,), (2,), (3,), (4,)]
+    assert cache.stats()['evictions'] == 1
+    cache.clear()
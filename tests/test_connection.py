@@ -0,0 +1,176 @@
+import logging
+import sqlite3
+import threading
+import time
+import pytest
+from lib.db.connection import (PROFILES, ConnectionPool, MemoryDatabase, configure_database, configure_pool,
+                               connect_readonly, get_connection, memory_database, resolve_profile,
+                               use_memory_database)
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+from scripts.setup_db import check_wal_mode
+
+def test_pool_reuses_connections():
+    """Test that a returned connection is handed out again."""
+    pool = ConnectionPool(size=2)
+    conn = pool.acquire()
+    raw = conn._conn
+    conn.close()
+    again = pool.acquire()
+    assert again._conn is raw
+    again.close()
+    pool.close()
+
+def test_pool_rolls_back_on_release():
+    """Test that an open transaction is rolled back when a connection is returned."""
+    pool = ConnectionPool(size=1)
+    conn = pool.acquire()
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS pool_probe (x INTEGER)")
+    conn.execute("INSERT INTO pool_probe VALUES (1)")
+    assert conn.in_transaction
+    conn.close()
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM pool_probe").fetchone()[0] == 0
+    conn.close()
+    pool.close()
+
+def test_pool_recycles_expired_connections():
+    """Test that connections older than max_lifetime are replaced."""
+    pool = ConnectionPool(size=1, max_lifetime=0.01)
+    conn = pool.acquire()
+    raw = conn._conn
+    time.sleep(0.02)
+    conn.close()
+    again = pool.acquire()
+    assert again._conn is not raw
+    again.close()
+    pool.close()
+
+def test_pool_thread_affinity():
+    """Test that each thread gets back the connection it used last."""
+    pool = ConnectionPool(size=4, thread_affinity=True)
+    seen = {}
+
+    def worker(name):
+        first = pool.acquire()
+        raw = first._conn
+        first.close()
+        second = pool.acquire()
+        seen[name] = second._conn is raw
+        second.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(seen.values())
+    pool.close()
+
+def test_pool_max_overflow_times_out():
+    """Test that borrowing past size + max_overflow waits and then fails."""
+    pool = ConnectionPool(size=1, max_overflow=0, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(Exception, match="Timed out"):
+        pool.acquire()
+    conn.close()
+    pool.close()
+
+def test_get_connection_context_manager():
+    """Test that pooled connections work with the `with conn:` transaction idiom."""
+    conn = get_connection()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 AS one")
+            assert cursor.fetchone()['one'] == 1
+    finally:
+        conn.close()
+
+def test_connection_profiles(on_disk):
+    """Test that PRAGMA profiles are applied to new connections."""
+    for name, pragmas in PROFILES.items():
+        conn = get_connection(profile=name)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == pragmas['cache_size']
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == pragmas['busy_timeout']
+        finally:
+            conn.close()
+
+def test_unknown_profile_rejected():
+    """Test that an unknown profile name raises ValueError."""
+    with pytest.raises(ValueError, match="turbo"):
+        resolve_profile("turbo")
+
+def test_setup_persists_wal_mode(on_disk):
+    """Test that the database file itself is in WAL mode."""
+    assert check_wal_mode() == 'wal'
+
+def test_memory_database_loads_and_writes_back(on_disk):
+    """Test that an in-memory copy of a file serves reads and writes changes back."""
+    memory = configure_database(on_disk, in_memory=True)
+    try:
+        assert memory_database() is memory
+        author = Author("Memory Author")
+        author.save()
+        disk = sqlite3.connect(on_disk)
+        assert disk.execute("SELECT COUNT(*) FROM authors WHERE name = 'Memory Author'").fetchone()[0] == 0
+        memory.write_back()
+        assert disk.execute("SELECT name FROM authors WHERE id = ?", (author.id,)).fetchone()[0] == "Memory Author"
+        assert disk.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        disk.close()
+    finally:
+        configure_database(on_disk)
+        memory.close()
+
+def test_memory_database_clone_is_independent(database):
+    """Test that changes to a clone do not reach the original."""
+    clone = database.clone()
+    try:
+        use_memory_database(clone)
+        Author("Clone Only Author").save()
+        assert Author.find_by_name("Clone Only Author") is not None
+        use_memory_database(database)
+        assert Author.find_by_name("Clone Only Author") is None
+    finally:
+        clone.close()
+
+def test_readonly_connection_opens_rollback_journal_database(database, tmp_path):
+    """Test that a read-only connection can open a database that is not in WAL mode."""
+    path = str(tmp_path / "journal.db")
+    database.write_back(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = DELETE").fetchall()
+    conn.close()
+    readonly = connect_readonly('read-heavy', path)
+    try:
+        assert readonly.execute("SELECT COUNT(*) FROM authors").fetchone()[0] > 0
+        assert readonly.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+        assert readonly.execute("PRAGMA cache_size").fetchone()[0] == PROFILES['read-heavy']['cache_size']
+    finally:
+        readonly.close()
+
+def test_add_article_fits_in_single_connection_pool():
+    """Test that add_article needs only one pooled connection at a time."""
+    configure_pool(size=1, max_overflow=0, timeout=1.0)
+    try:
+        author = Author.find_by_name("John Doe")
+        article = author.add_article(Magazine.find_by_id(1), "Single Connection Article")
+        assert article.id is not None
+    finally:
+        configure_pool()
+
+def test_failed_scheduled_write_back_is_logged(on_disk, tmp_path, caplog):
+    """Test that a failing periodic write-back is logged and the schedule keeps running."""
+    memory = MemoryDatabase(on_disk, writeback_interval=0.01)
+    memory.source = str(tmp_path / "missing" / "dir" / "code_challenge.db")
+    try:
+        with caplog.at_level(logging.ERROR, logger='lib.db.connection'):
+            time.sleep(0.1)
+        failures = [r for r in caplog.records if "Write-back of the in-memory database" in r.getMessage()]
+        assert len(failures) >= 2 and failures[0].exc_info is not None
+    finally:
+        memory.source = on_disk
+        memory.close()
@@ -0,0 +1,106 @@
+import threading
+import time
+import pytest
+from lib.db import deadline
+from lib.db.connection import get_connection
+from lib.db.deadline import CancellationToken, Deadline, QueryCancelled, QueryTimeout
+from lib.db.writer import configure_write_behind, disable_write_behind
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+ENDLESS = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+
+def _run(sql):
+    conn = get_connection()
+    try:
+        return conn.execute(sql).fetchone()
+    finally:
+        conn.close()
+
+def test_deadline_interrupts_running_statement():
+    """Test that a statement still running at the deadline is aborted with QueryTimeout."""
+    with pytest.raises(QueryTimeout, match="0.05s"):
+        with Deadline(timeout=0.05):
+            _run(ENDLESS)
+    assert _run("SELECT 1")[0] == 1
+
+def test_cancel_from_another_thread():
+    """Test that cancelling a token from another thread aborts the statement with QueryCancelled."""
+    token = CancellationToken()
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+    try:
+        with pytest.raises(QueryCancelled):
+            with Deadline(cancel=token):
+                _run(ENDLESS)
+    finally:
+        timer.cancel()
+
+def test_cancelled_token_stops_before_running():
+    """Test that a call given an already cancelled token does not run at all."""
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(QueryCancelled):
+        Magazine.magazines_with_multiple_authors(cached=False, cancel=token)
+
+def test_model_timeout_passes_through_error_wrapping(monkeypatch):
+    """Test that model methods raise QueryTimeout rather than their generic failure."""
+    monkeypatch.setattr(deadline, 'PROGRESS_INTERVAL', 1)
+    expected = Magazine.magazines_with_multiple_authors(cached=False)
+    with pytest.raises(QueryTimeout):
+        Magazine.magazines_with_multiple_authors(cached=False, timeout=0)
+    with pytest.raises(QueryTimeout):
+        list(Article.iter_by_author(1, timeout=0))
+    assert [m.id for m in Magazine.magazines_with_multiple_authors(cached=False)] == [m.id for m in expected]
+    assert len(Magazine.magazines_with_multiple_authors(cached=False, timeout=30)) == len(expected)
+
+def test_interrupted_write_is_rolled_back(monkeypatch):
+    """Test that a write aborted by its deadline leaves nothing behind and the connection reusable."""
+    monkeypatch.setattr(deadline, 'PROGRESS_INTERVAL', 1)
+    with pytest.raises(QueryTimeout):
+        Author(name="Late Author").save(timeout=0)
+    assert Author.find_by_name("Late Author") is None
+    conn = get_connection()
+    try:
+        assert not conn.in_transaction
+    finally:
+        conn.close()
+    author = Author(name="Late Author")
+    author.save()
+    assert Author.find_by_name("Late Author").id == author.id
+
+def test_expired_deadline_stops_short_queries():
+    """Test that a short query does not run once its deadline has passed."""
+    with pytest.raises(QueryTimeout):
+        Magazine.find_by_id(1, timeout=0)
+    expired = Deadline(timeout=0.001)
+    time.sleep(0.01)
+    with pytest.raises(QueryTimeout):
+        with expired:
+            pass
+    with pytest.raises(QueryTimeout):
+        with Deadline(timeout=0.01):
+            time.sleep(0.02)
+            _run("SELECT 1")
+    with pytest.raises(QueryTimeout):
+        with Deadline(timeout=0.01):
+            time.sleep(0.02)
+            Magazine.find_by_category("Technology")
+    assert Magazine.find_by_id(1).id == 1
+
+def test_write_behind_save_honours_deadline():
+    """Test that save() stops waiting for the background writer when its timeout or token runs out."""
+    configure_write_behind(window_ms=1000)
+    try:
+        started = time.monotonic()
+        with pytest.raises(QueryTimeout):
+            Author("Queued Late Author").save(timeout=0.05)
+        token = CancellationToken()
+        timer = threading.Timer(0.05, token.cancel)
+        timer.start()
+        with pytest.raises(QueryCancelled):
+            Author("Queued Cancelled Author").save(cancel=token)
+        assert time.monotonic() - started < 0.9
+    finally:
+        disable_write_behind()
@@ -0,0 +1,44 @@
+from lib.controllers.graph import AuthorMagazineGraph, reachable_authors_query
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def _graph():
+    graph = AuthorMagazineGraph()
+    graph.refresh()
+    return graph
+
+def test_graph_matches_relationship_queries():
+    """Test that the adjacency index agrees with Author.magazines and Magazine.contributors."""
+    graph = _graph()
+    author = Article.most_prolific_author(cached=False)
+    assert graph.magazines_of(author.id) == sorted(m.id for m in author.magazines())
+    magazine = Magazine.top_publisher(cached=False)
+    assert graph.authors_of(magazine.id) == sorted(a.id for a in magazine.contributors())
+
+def test_related_authors_and_similar_magazines():
+    """Test top-k co-contributors ranked by shared magazines."""
+    magazines = [Magazine(f"Graph Magazine {i}", "Science") for i in range(3)]
+    Magazine.bulk_save(magazines)
+    authors = [Author(f"Graph Author {i}") for i in range(3)]
+    Author.bulk_save(authors)
+    links = [(0, 0), (0, 1), (1, 0), (1, 1), (2, 1), (2, 2)]
+    Article.bulk_save([Article(f"Graph Article {a}-{m}", authors[a].id, magazines[m].id) for a, m in links])
+    graph = _graph()
+    assert graph.related_authors(authors[0].id, k=2) == [(authors[1].id, 2), (authors[2].id, 1)]
+    assert graph.similar_magazines(magazines[1].id, k=2) == [(magazines[0].id, 2), (magazines[2].id, 1)]
+    assert graph.reachable_authors(authors[0].id, max_hops=1) == {authors[1].id: 1, authors[2].id: 1}
+    assert reachable_authors_query(authors[0].id, max_hops=1) == {authors[1].id: 1, authors[2].id: 1}
+
+def test_graph_incremental_refresh():
+    """Test that refresh() only adds links from new articles."""
+    graph = _graph()
+    author = Author("Graph Newcomer")
+    author.save()
+    magazine = Magazine("Graph Newcomer Weekly", "Travel")
+    magazine.save()
+    Article("Graph Newcomer Article", author.id, magazine.id).save()
+    Article("Graph Newcomer Article 2", author.id, magazine.id).save()
+    assert graph.refresh() == 1
+    assert graph.magazines_of(author.id) == [magazine.id]
+    assert graph.refresh() == 0
@@ -0,0 +1,70 @@
+import logging
+from lib.db.cache import entity_cache
+from lib.db.connection import get_connection
+from lib.db.instrumentation import MAX_OPEN_RECORDS, _state, metrics
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def _traced(slow_query_ms=100.0):
+    metrics.reset()
+    metrics.enable(slow_query_ms=slow_query_ms)
+    entity_cache.clear()
+
+def test_metrics_record_methods_and_statements():
+    """Test that traced model calls record latency, statements and rows."""
+    _traced()
+    try:
+        author = Author("Traced Author")
+        author.save()
+        assert Author.find_by_id(author.id).name == "Traced Author"
+        stats = metrics.method_stats()['Author.find_by_id']
+        assert stats['calls'] == 1
+        assert stats['statements'] >= 1
+        assert stats['rows'] >= 1
+        assert any("FROM authors WHERE id" in r['sql'] for r in metrics.statements)
+        assert "Author.find_by_id" in metrics.summary()
+    finally:
+        metrics.disable()
+
+def test_metrics_count_streamed_rows():
+    """Test that rows yielded by streaming methods are attributed to them."""
+    _traced()
+    try:
+        magazines = list(Magazine.iter_article_counts())
+        assert metrics.method_stats()['Magazine.iter_article_counts']['rows'] >= len(magazines)
+    finally:
+        metrics.disable()
+
+def test_slow_query_log(caplog):
+    """Test that statements over the threshold are logged."""
+    _traced(slow_query_ms=0)
+    try:
+        with caplog.at_level(logging.WARNING, logger='lib.db.slow_queries'):
+            Magazine.top_publisher()
+        assert any("Magazine.top_publisher" in r.getMessage() for r in caplog.records)
+    finally:
+        metrics.disable()
+        metrics.slow_query_ms = 100.0
+
+def test_metrics_disabled_by_default():
+    """Test that nothing is recorded while tracing is off."""
+    metrics.reset()
+    Author.find_by_name("Traced Author")
+    assert metrics.method_stats() == {}
+
+def test_statements_outside_methods_are_finished(caplog):
+    """Test that raw statements are finished and logged without piling up as open records."""
+    _traced(slow_query_ms=0)
+    try:
+        with caplog.at_level(logging.WARNING, logger='lib.db.slow_queries'):
+            conn = get_connection()
+            try:
+                for i in range(2000):
+                    conn.execute("SELECT ? + 1", (i,)).fetchone()
+            finally:
+                conn.close()
+            Author.find_by_id(1)
+        assert len(_state().open) <= MAX_OPEN_RECORDS
+        assert sum(r.getMessage().endswith(" + 1") for r in caplog.records) == 2000
+    finally:
+        metrics.disable()
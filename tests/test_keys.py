@@ -0,0 +1,33 @@
+import pytest
+from lib.db.connection import get_connection
+from lib.db.keys import disable_unique_keys, duplicate_keys, enable_unique_keys, unique_keys_enabled
+from lib.models.author import Author
+
+def test_enable_and_disable_unique_keys():
+    """Test that unique keys replace the lookup indexes and can be removed again."""
+    assert not any(unique_keys_enabled().values())
+    enable_unique_keys()
+    assert all(unique_keys_enabled().values())
+    with pytest.raises(Exception, match="Failed to save author"):
+        Author(name="John Doe").save()
+    disable_unique_keys()
+    assert not any(unique_keys_enabled().values())
+    Author(name="John Doe").save()
+
+def test_enable_unique_keys_refuses_duplicates():
+    """Test that existing duplicates are reported instead of failing halfway."""
+    Author(name="John Doe").save()
+    assert duplicate_keys() == {'authors': 1}
+    with pytest.raises(Exception, match="authors"):
+        enable_unique_keys()
+    assert not any(unique_keys_enabled().values())
+
+def test_upsert_without_unique_keys_fails():
+    """Test that upsert needs the unique key on its conflict column."""
+    with pytest.raises(Exception, match="Failed to upsert author"):
+        Author.upsert("John Doe")
+    conn = get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM authors WHERE name = 'John Doe'").fetchone()[0] == 1
+    finally:
+        conn.close()
@@ -1,6 +1,9 @@
+import pytest
 from lib.models.magazine import Magazine
 from lib.models.author import Author
 from lib.db.connection import get_connection
+from lib.db.counters import verify_counters
+from lib.db.keys import enable_unique_keys
 
 def test_magazine_save():
     """Test saving a magazine."""
@@ -44,4 +47,81 @@ def test_magazine_contributing_authors():
     authors = magazine.contributing_authors()
     # May be empty unless seed data has >2 articles per author
     if authors:
-        assert all(a.name for a in authors)
\ No newline at end of file
+        assert all(a.name for a in authors)
+
+def test_magazine_bulk_save():
+    """Test inserting new and updating existing magazines in one call."""
+    existing = Magazine(name="Bulk Existing", category="Test")
+    existing.save()
+    existing.category = "Bulk"
+    new = [Magazine(name=f"Bulk Mag {i}", category="Bulk") for i in range(3)]
+    Magazine.bulk_save([existing] + new)
+    assert all(m.id is not None for m in new)
+    assert Magazine.find_by_id(existing.id).category == "Bulk"
+    assert Magazine.find_by_id(new[2].id).name == "Bulk Mag 2"
+
+def test_magazine_prefetch():
+    """Test that prefetched relationships match the per-magazine queries."""
+    magazines = Magazine.find_by_category("Technology", prefetch=["articles", "contributors"])
+    tech = next(m for m in magazines if m.name == "Tech Weekly")
+    fresh = Magazine.find_by_id(tech.id)
+    assert sorted(a.id for a in tech.articles()) == sorted(a.id for a in fresh.articles())
+    assert sorted(c.id for c in tech.contributors()) == sorted(c.id for c in fresh.contributors())
+    assert sorted(tech.article_titles()) == sorted(fresh.article_titles())
+
+def test_magazine_prefetch_rejects_unknown_relation():
+    """Test that prefetching an unknown relationship raises ValueError."""
+    with pytest.raises(ValueError, match="readers"):
+        Magazine.find_by_category("Technology", prefetch=["readers"])
+
+def test_magazine_iter_article_counts():
+    """Test that streamed article counts match article_counts()."""
+    streamed = {m.id: count for m, count in Magazine.iter_article_counts(chunk_size=2)}
+    assert streamed == {m.id: count for m, count in Magazine.article_counts()}
+    assert any(m.name == "Tech Weekly" for m in Magazine.iter_by_category("Technology"))
+
+def test_magazine_counter_queries_match():
+    """Test that the counter-table variants agree with the aggregations."""
+    counted = {m.id: n for m, n in Magazine.article_counts(use_counters=True)}
+    assert counted == {m.id: n for m, n in Magazine.article_counts()}
+    assert sorted(m.id for m in Magazine.magazines_with_multiple_authors(use_counters=True)) == \
+        sorted(m.id for m in Magazine.magazines_with_multiple_authors())
+    top = Magazine.top_publisher(use_counters=True)
+    assert counted[top.id] == max(counted.values())
+
+def test_magazine_delete_cascades_to_articles():
+    """Test that deleting a magazine deletes its articles."""
+    magazine = Magazine.find_by_name("Tech Weekly")
+    assert magazine.articles()
+    magazine_id = magazine.id
+    assert magazine.delete() is True
+    assert magazine.delete() is False
+    assert Magazine.find_by_id(magazine_id) is None
+    conn = get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM articles WHERE magazine_id = ?", (magazine_id,)).fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert verify_counters() == {}
+
+def test_magazine_upsert_and_find_or_create():
+    """Test that upsert updates the category and find_or_create keeps it."""
+    enable_unique_keys()
+    existing = Magazine.find_by_name("Tech Weekly")
+    kept = Magazine.find_or_create("Tech Weekly", "Food")
+    assert (kept.id, kept.category) == (existing.id, "Technology")
+    updated = Magazine.upsert("Tech Weekly", "Food")
+    assert (updated.id, updated.category) == (existing.id, "Food")
+    assert Magazine.find_by_id(existing.id).category == "Food"
+    magazines = Magazine.bulk_find_or_create([Magazine("Tech Weekly", "News"), Magazine("Brand New", "News")])
+    assert [m.category for m in magazines] == ["Food", "News"]
+    assert Magazine.find_by_name("Brand New").id == magazines[1].id
+
+def test_magazine_prefetch_duplicate_instances():
+    """Test that every instance sharing an id gets the prefetched relationships."""
+    first = Magazine.find_by_id(1)
+    second = Magazine._from_db(first.id, first.name, first.category)
+    Magazine.prefetch([first, second], ["articles", "contributors"])
+    assert set(first._prefetched) == set(second._prefetched) == {"articles", "contributors"}
+    assert sorted(a.id for a in second.articles()) == sorted(a.id for a in first.articles())
+    assert sorted(c.id for c in second.contributors()) == sorted(c.id for c in first.contributors())
@@ -0,0 +1,33 @@
+import sqlite3
+import pytest
+from lib.db.migrate import load_migrations, migrate, schema_version
+
+def test_migrate_fresh_database(tmp_path):
+    """Test that migrating an empty database reaches the latest version."""
+    conn = sqlite3.connect(tmp_path / "fresh.db")
+    applied = migrate(conn=conn)
+    assert len(applied) == len(load_migrations())
+    assert schema_version(conn) == len(applied)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_articles_magazine_author', 'idx_articles_author_magazine'} <= indexes
+    assert 'idx_articles_author_id' not in indexes
+    assert migrate(conn=conn) == []
+    conn.close()
+
+def test_migrate_rolls_back_failed_migration(tmp_path):
+    """Test that a failing migration leaves the previous version in place."""
+    (tmp_path / "0001_create.sql").write_text("CREATE TABLE t (x INTEGER);")
+    (tmp_path / "0002_broken.sql").write_text("CREATE TABLE u (x INTEGER);\nINSERT INTO missing VALUES (1);")
+    conn = sqlite3.connect(tmp_path / "broken.db")
+    with pytest.raises(Exception, match="0002_broken"):
+        migrate(path=str(tmp_path), conn=conn)
+    assert schema_version(conn) == 1
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'u'").fetchone()[0] == 0
+    conn.close()
+
+def test_load_migrations_rejects_gaps(tmp_path):
+    """Test that migration versions must be contiguous."""
+    (tmp_path / "0001_a.sql").write_text("SELECT 1;")
+    (tmp_path / "0003_c.sql").write_text("SELECT 1;")
+    with pytest.raises(ValueError):
+        load_migrations(str(tmp_path))
@@ -0,0 +1,41 @@
+import pickle
+import pytest
+from lib.db.parallel import PackedModel, ParallelExecutor, pack, unpack
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def test_pack_roundtrip():
+    """Test that packed results rebuild the same models and pickle smaller."""
+    magazines = Magazine.find_by_category("Technology")
+    packed = pack([(magazine, 1) for magazine in magazines])
+    assert isinstance(packed[0][0], PackedModel)
+    rebuilt = unpack(pickle.loads(pickle.dumps(packed)))
+    assert [(m.id, m.name, m.category, n) for m, n in rebuilt] == [(m.id, m.name, m.category, 1) for m in magazines]
+    assert len(pickle.dumps(packed)) < len(pickle.dumps([(magazine, 1) for magazine in magazines]))
+
+def test_parallel_executor_matches_sequential_calls(on_disk):
+    """Test that finder batches run in worker processes return the same models."""
+    ids = [1, 2, 3, 1, 999999]
+    categories = ["Technology", "Science", "Fashion"]
+    with ParallelExecutor(processes=2) as executor:
+        authors = executor.map(Author.find_by_id, ids, chunksize=2)
+        by_category = executor.map(Magazine.find_by_category, categories)
+    assert [a.name if a else None for a in authors] == [
+        a.name if a else None for a in (Author.find_by_id(id) for id in ids)]
+    assert [[m.id for m in ms] for ms in by_category] == [
+        [m.id for m in Magazine.find_by_category(c)] for c in categories]
+
+def test_parallel_workers_are_read_only(on_disk):
+    """Test that worker connections refuse writes."""
+    with ParallelExecutor(processes=1) as executor:
+        with pytest.raises(Exception, match="readonly"):
+            executor.map(Magazine.save, [Magazine("Parallel Write", "News")])
+
+def test_parallel_workers_see_parent_writes(on_disk):
+    """Test that a reused worker returns rows changed by the parent since its last call."""
+    with ParallelExecutor(processes=1) as executor:
+        assert executor.map(Author.find_by_id, [1])[0].name == "John Doe"
+        author = Author.find_by_id(1)
+        author.name = "John Renamed"
+        author.save()
+        assert executor.map(Author.find_by_id, [1])[0].name == "John Renamed"
@@ -0,0 +1,30 @@
+import pytest
+from lib.db.connection import get_connection
+from lib.db.plans import explain, format_plans, plan_problems
+from scripts.query_plans import FULL_SCAN_METHODS, PLANS_FILE, capture_case_plans, diff_plans
+
+@pytest.fixture(scope='module')
+def plans(tmp_path_factory):
+    """Plans of every benchmark case, captured once on the generated plan dataset."""
+    return capture_case_plans(str(tmp_path_factory.mktemp("plans") / "plans.db"))
+
+def test_query_plans_match_reviewed_plans(plans):
+    """Test that no model query plan changed from tests/query_plans.txt."""
+    with open(PLANS_FILE) as f:
+        diff = diff_plans(f.read(), format_plans(plans))
+    assert not diff, f"Query plans changed; if intended, run `python -m scripts.query_plans --update`:\n{diff}"
+
+def test_query_plans_use_indexes(plans):
+    """Test that model queries avoid full table scans and temp B-tree sorts."""
+    assert plan_problems(plans, FULL_SCAN_METHODS) == []
+
+def test_plan_problems_flag_scans_and_sorts():
+    """Test that an unindexed filter and sort are reported."""
+    conn = get_connection()
+    try:
+        plan = explain(conn, "SELECT id FROM articles WHERE title LIKE ? ORDER BY title DESC, id")
+    finally:
+        conn.close()
+    problems = plan_problems({'Example.method': {'statement': plan}})
+    assert any("SCAN articles" in problem for problem in problems)
+    assert any("TEMP B-TREE FOR" in problem for problem in problems)
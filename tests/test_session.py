@@ -0,0 +1,88 @@
+import pytest
+from lib.db.instrumentation import metrics
+from lib.db.session import Session, dirty_columns
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def _statements(text):
+    return [r['sql'] for r in metrics.statements if text in r['sql']]
+
+def test_save_skips_unchanged_and_updates_changed_columns():
+    """Test that save() is a no-op when clean and only writes changed columns."""
+    magazine = Magazine("Dirty Tracking Weekly", "Science")
+    magazine.save()
+    metrics.reset()
+    metrics.enable()
+    try:
+        magazine.save()
+        assert _statements("UPDATE magazines") == []
+        magazine.category = "Technology"
+        assert dirty_columns(magazine) == ['category']
+        magazine.save()
+        updates = _statements("UPDATE magazines")
+        assert len(updates) == 1
+        assert "SET category = 'Technology' WHERE" in updates[0]
+    finally:
+        metrics.disable()
+    assert Magazine.find_by_id(magazine.id).category == "Technology"
+
+def test_session_flushes_new_graph_in_one_transaction():
+    """Test that a new author, magazine and articles flush together with resolved ids."""
+    with Session() as session:
+        author = session.add(Author("Session Author"))
+        magazine = session.add(Magazine("Session Monthly", "Culture"))
+        articles = [session.add(Article(f"Session Article {i}", author, magazine)) for i in range(3)]
+        assert len(session.new) == 5
+    assert all(article.author_id == author.id and article.magazine_id == magazine.id for article in articles)
+    assert [a.title for a in Article.find_by_author(author.id)] == [f"Session Article {i}" for i in range(3)]
+    assert session.new == [] and session.dirty == []
+
+def test_session_updates_only_dirty_instances():
+    """Test that flush() writes changed instances and skips clean ones."""
+    authors = [Author(f"Session Dirty {i}") for i in range(3)]
+    Author.bulk_save(authors)
+    session = Session()
+    session.add_all(authors)
+    assert session.dirty == []
+    authors[1].name = "Session Dirty Renamed"
+    assert session.dirty == [authors[1]]
+    assert session.flush() == 1
+    assert Author.find_by_id(authors[1].id).name == "Session Dirty Renamed"
+    assert session.flush() == 0
+
+def test_session_rolls_back_on_failure():
+    """Test that a failed flush writes nothing and resets new ids."""
+    session = Session()
+    author = session.add(Author("Session Rollback Author"))
+    magazine = session.add(Magazine("Session Rollback", "News"))
+    magazine._name = None  # violates NOT NULL
+    with pytest.raises(Exception, match="Failed to flush session"):
+        session.flush()
+    assert author.id is None
+    assert Author.find_by_name("Session Rollback Author") is None
+
+def test_session_restores_parent_references_on_failure():
+    """Test that a failed flush puts the parent models back into the foreign key columns."""
+    session = Session()
+    author = session.add(Author("Session Restore Author"))
+    magazine = session.add(Magazine("Session Restore", "News"))
+    article = session.add(Article("Session Restore Article", author, magazine))
+    article._title = None  # violates NOT NULL, after the parents were inserted
+    with pytest.raises(Exception, match="Failed to flush session"):
+        session.flush()
+    assert article.author_id is author and article.magazine_id is magazine
+    assert author.id is None and magazine.id is None
+    article.title = "Session Restore Article"
+    session.flush()
+    assert article.author_id == author.id and article.magazine_id == magazine.id
+    assert Article.find_by_id(article.id).author_id == Author.find_by_name("Session Restore Author").id
+
+def test_session_refuses_untracked_unsaved_parent():
+    """Test that an article referring to an unsaved parent outside the session is not written."""
+    session = Session()
+    magazine = Magazine.find_by_name("Tech Weekly")
+    session.add(Article("Session Orphan Article", Author("Untracked Author"), magazine))
+    with pytest.raises(Exception, match="unsaved Author that is not in the session"):
+        session.flush()
+    assert Article.find_by_title("Session Orphan Article") is None
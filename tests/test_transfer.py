@@ -0,0 +1,68 @@
+import json
+import pytest
+from lib.db.counters import verify_counters
+from lib.db.transfer import export_article_counts, export_table, import_file, read_records
+from lib.models.article import Article
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def test_import_articles_resolves_names(tmp_path):
+    """Test a JSONL article import that references authors and magazines by name."""
+    path = tmp_path / "articles.jsonl"
+    with open(path, "w") as f:
+        for i in range(25):
+            f.write(json.dumps({"title": f"Imported Article {i}", "author": "John Doe",
+                                "magazine": "Imported Quarterly", "category": "Imports"}) + "\n")
+    stats = import_file("articles", str(path), batch_size=10, create_missing=True, progress=False)
+    assert stats["rows"] == 25
+    article = Article.find_by_title("Imported Article 7")
+    assert article.author_id == Author.find_by_name("John Doe").id
+    assert Magazine.find_by_id(article.magazine_id).category == "Imports"
+    assert verify_counters() == {}
+    assert any(a.id == article.id for a in Article.search("imported"))
+
+def test_import_jsonl_null_ids_fall_back_to_names(tmp_path):
+    """Test that a JSONL record with a null author_id or magazine_id is resolved by name."""
+    path = tmp_path / "articles.jsonl"
+    path.write_text(json.dumps({"title": "Null Id Article", "author_id": None, "author": "John Doe",
+                                "magazine_id": None, "magazine": "Tech Weekly"}) + "\n")
+    assert import_file("articles", str(path), progress=False)["rows"] == 1
+    article = Article.find_by_title("Null Id Article")
+    assert article.author_id == Author.find_by_name("John Doe").id
+    assert article.magazine_id == Magazine.find_by_name("Tech Weekly").id
+
+def test_import_rejects_unknown_names(tmp_path):
+    """Test that unknown names fail the import unless create_missing is set."""
+    path = tmp_path / "articles.csv"
+    path.write_text("title,author,magazine_id\nOrphan Article,Nobody Known Here,1\n")
+    with pytest.raises(Exception, match="Nobody Known Here"):
+        import_file("articles", str(path), progress=False)
+    assert Article.find_by_title("Orphan Article") is None
+    assert Article.find_by_id(1) is not None
+
+def test_failed_import_rebuilds_committed_batches(tmp_path):
+    """Test that rows committed before an import failed still reach the counters and search index."""
+    path = tmp_path / "articles.jsonl"
+    with open(path, "w") as f:
+        for i in range(12):
+            author = "John Doe" if i < 10 else "Nobody Known Here"
+            f.write(json.dumps({"title": f"Partial Import {i}", "author": author, "magazine_id": 1}) + "\n")
+    with pytest.raises(Exception, match="Nobody Known Here"):
+        import_file("articles", str(path), batch_size=5, commit_every=5, progress=False)
+    assert Article.find_by_title("Partial Import 9") is not None
+    assert Article.find_by_title("Partial Import 10") is None
+    assert verify_counters() == {}
+    assert len(Article.search("partial import", limit=50)) == 10
+
+def test_export_round_trip(tmp_path):
+    """Test exporting a table and a query result as CSV and JSONL."""
+    path = str(tmp_path / "magazines.csv")
+    rows = export_table("magazines", path, progress=False)
+    records = list(read_records(path))
+    assert len(records) == rows
+    assert any(r["name"] == "Tech Weekly" for r in records)
+
+    counts_path = str(tmp_path / "counts.jsonl")
+    export_article_counts(counts_path, progress=False)
+    counts = {r["id"]: r["article_count"] for r in read_records(counts_path)}
+    assert counts == {m.id: n for m, n in Magazine.article_counts()}
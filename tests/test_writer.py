@@ -0,0 +1,140 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from lib.db import connection
+from lib.db.cache import entity_cache
+from lib.db.connection import ConnectionPool, configure_database, get_connection
+from lib.db.session import Session
+from lib.db.writer import WriteBehindQueue, configure_write_behind, disable_write_behind
+from lib.models.author import Author
+from lib.models.magazine import Magazine
+
+def test_write_behind_groups_concurrent_saves():
+    """Test that concurrent saves are committed in shared groups and get ids."""
+    writer = configure_write_behind(max_batch=64, window_ms=20)
+    try:
+        authors = [Author(f"Write Behind {i}") for i in range(40)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda author: author.save(), authors))
+        assert all(author.id is not None for author in authors)
+        assert len({author.id for author in authors}) == 40
+        stats = writer.stats()
+        assert stats['writes'] == 40
+        assert stats['groups'] < 40
+        assert Author.find_by_id(authors[0].id).name == "Write Behind 0"
+    finally:
+        disable_write_behind()
+
+def test_write_behind_future_resolves_with_id():
+    """Test that save(wait=False) returns a future for the assigned id."""
+    configure_write_behind(window_ms=1)
+    try:
+        author = Author("Future Author")
+        future = author.save(wait=False)
+        assert future.result(timeout=5) == author.id
+        author.name = "Future Author Renamed"
+        assert author.save(wait=False).result(timeout=5) == author.id
+    finally:
+        disable_write_behind()
+    assert Author.find_by_id(author.id).name == "Future Author Renamed"
+
+def test_write_behind_isolates_failed_writes():
+    """Test that a failing write only fails its own future."""
+    writer = WriteBehindQueue(window_ms=50)
+    try:
+        good = writer.submit("INSERT INTO authors (name) VALUES (?)", ("Isolated Author",))
+        bad = writer.submit("INSERT INTO missing_table VALUES (?)", (1,), error="Failed to save thing")
+        with pytest.raises(Exception, match="Failed to save thing"):
+            bad.result(timeout=5)
+        assert Author.find_by_id(good.result(timeout=5)).name == "Isolated Author"
+    finally:
+        writer.close()
+
+def test_save_without_write_behind_can_return_future():
+    """Test that save(wait=False) resolves immediately when saves are synchronous."""
+    author = Author("Sync Future Author")
+    assert author.save(wait=False).result() == author.id
+
+def test_write_behind_follows_database_target(database, tmp_path):
+    """Test that saves queued after configure_database() go to the new target."""
+    previous = connection.DATABASE
+    first, second = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+    database.write_back(first)
+    database.write_back(second)
+    configure_database(first)
+    configure_write_behind(window_ms=1)
+    try:
+        Author("Target A Author").save()
+        configure_database(second)
+        Author("Target B Author").save()
+    finally:
+        disable_write_behind()
+        configure_database(previous)
+    for path, present, absent in ((first, "Target A Author", "Target B Author"),
+                                  (second, "Target B Author", "Target A Author")):
+        conn = sqlite3.connect(path)
+        try:
+            names = {row[0] for row in conn.execute("SELECT name FROM authors")}
+        finally:
+            conn.close()
+        assert present in names and absent not in names
+
+def test_write_behind_survives_connection_errors():
+    """Test that a group which cannot get a connection fails its futures and the writer keeps going."""
+    def refuse(profile):
+        raise sqlite3.OperationalError("unable to open database file")
+
+    writer = WriteBehindQueue(window_ms=1)
+    working_pool, writer._pool = writer._pool, ConnectionPool(size=1, connect=refuse)
+    try:
+        future = writer.submit("INSERT INTO authors (name) VALUES (?)", ("Unwritten Author",),
+                               error="Failed to save author")
+        with pytest.raises(Exception, match="Failed to save author: unable to open"):
+            future.result(timeout=5)
+        writer._pool = working_pool
+        id = writer.submit("INSERT INTO authors (name) VALUES (?)", ("Written Author",)).result(timeout=5)
+        assert Author.find_by_id(id).name == "Written Author"
+    finally:
+        writer.close()
+
+def test_write_behind_repeated_save_inserts_once():
+    """Test that saving a new instance again before its insert commits updates the same row."""
+    configure_write_behind(window_ms=50)
+    try:
+        author = Author("Pending Author")
+        first = author.save(wait=False)
+        author.name = "Pending Author Renamed"
+        second = author.save(wait=False)
+        assert first.result(timeout=5) == second.result(timeout=5) == author.id
+        assert Author.find_by_name("Pending Author") is None
+        assert Author.find_by_name("Pending Author Renamed").id == author.id
+        third = author.save(wait=False)
+        assert third.result(timeout=5) == author.id
+    finally:
+        disable_write_behind()
+    conn = get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM authors WHERE name LIKE 'Pending Author%'").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+def test_bulk_and_session_writes_land_after_queued_saves():
+    """Test that bulk and session writes commit the queued saves first, so the later write wins."""
+    configure_write_behind(window_ms=200)
+    try:
+        author = Author.find_by_id(1)
+        author.name = "Queued Name"
+        queued = author.save(wait=False)
+        Author.bulk_update([Author("Bulk Name", id=1)])
+        assert queued.done()
+        magazine = Magazine.find_by_id(1)
+        magazine.name = "Queued Magazine"
+        queued = magazine.save(wait=False)
+        with Session() as session:
+            session.add(Magazine("Session Magazine", magazine.category, id=1))
+        assert queued.done()
+    finally:
+        disable_write_behind()
+    entity_cache.clear()
+    assert Author.find_by_id(1).name == "Bulk Name"
+    assert Magazine.find_by_id(1).name == "Session Magazine"